@@ -1,71 +1,235 @@
-import subprocess
 import os
 import json
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from app_store import AppStore, JSONAppStore, SQLiteAppStore, write_json_atomic
+from auth import require_role
 
 class AppManager:
-    def __init__(self):
+    # Config fields that get a secondary index for ``query``
+    INDEXED_CONFIG_KEYS = ('connection_id', 'stream_key')
+    
+    def __init__(self, store: Optional[AppStore] = None, autoload: bool = True):
         self.apps: Dict[str, dict] = {}
-        self.load_apps()
+        # Indexes map a value to an insertion-ordered set (dict keys) of app names.
+        # Go through add/remove/set_app_status so they stay in sync with self.apps.
+        self.by_type: Dict[str, Dict[str, None]] = {}
+        self.by_status: Dict[str, Dict[str, None]] = {}
+        self.by_config: Dict[str, Dict[Any, Dict[str, None]]] = {key: {} for key in self.INDEXED_CONFIG_KEYS}
+        # Called with (changed, removed) app names after every change
+        self.listeners: List[Callable[[List[str], List[str]], None]] = []
+        # Token claims of the user signed in to this overlay. Adding and
+        # removing apps is checked against them, or against the claims a
+        # caller passes for someone else (a remote peer); unchecked if neither.
+        self.session: Optional[Dict[str, Any]] = None
+        self.store = store or self.default_store()
+        # Without autoload the saved apps arrive later (load_apps or
+        # merge_loaded). Changes made before then are written only after,
+        # so a store that rewrites the whole catalog (JSONAppStore) cannot
+        # overwrite saved apps that were not read yet.
+        self._deferred: Optional[Tuple[Dict[str, None], Dict[str, None]]] = None
+        if autoload:
+            self.load_apps()
+        else:
+            self._deferred = ({}, {})
+    
+    @staticmethod
+    def default_store() -> AppStore:
+        """SQLite store, seeded once from a legacy apps_config.json if present"""
+        store = SQLiteAppStore('apps.db')
+        if store.is_empty() and os.path.exists('apps_config.json'):
+            apps = JSONAppStore('apps_config.json').load()
+            store.commit(apps, apps.keys(), ())
+        return store
     
+    def add_listener(self, listener: Callable[[List[str], List[str]], None]):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[List[str], List[str]], None]):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
     def load_apps(self):
-        """Load saved apps from configuration file"""
-        try:
-            with open('apps_config.json', 'r') as f:
-                self.apps = json.load(f)
-        except FileNotFoundError:
-            self.apps = {}
+        """Load saved apps from the storage backend"""
+        if self._deferred is not None:
+            self.merge_loaded(self.store.load())
+            return
+        previous = list(self.apps)
+        self.apps = self.store.load()
+        self.by_type.clear()
+        self.by_status.clear()
+        for index in self.by_config.values():
+            index.clear()
+        for app_name in self.apps:
+            self._index(app_name)
+        self._notify(list(self.apps), [app_name for app_name in previous if app_name not in self.apps])
+    
+    def merge_loaded(self, loaded: Dict[str, dict]) -> List[str]:
+        """Fold in apps read from the store elsewhere (``store.load()`` on a
+        worker thread), returning the names that were new
+
+        Apps added or changed since the read started keep their in-memory
+        record; the saved ones come first, in store order.
+        """
+        added = [app_name for app_name in loaded if app_name not in self.apps]
+        if added:
+            current = self.apps
+            self.apps = {app_name: loaded[app_name] for app_name in added}
+            self.apps.update(current)
+            for app_name in added:
+                self._index(app_name)
+        deferred, self._deferred = self._deferred, None
+        if deferred and (deferred[0] or deferred[1]):
+            changed, removed = deferred
+            self.store.commit(self.apps, [app_name for app_name in changed if app_name in self.apps], list(removed))
+        if added:
+            self._notify(added, [])
+        return added
     
     def save_apps(self):
-        """Save apps configuration to file"""
-        with open('apps_config.json', 'w') as f:
-            json.dump(self.apps, f, indent=4)
+        """Save the whole apps configuration to the storage backend"""
+        self.store.commit(self.apps, self.apps.keys(), ())
     
-    def add_app(self, app_name: str, app_type: str, config: dict) -> bool:
+    def add_app(self, app_name: str, app_type: str, config: dict, claims: Optional[Dict[str, Any]] = None) -> bool:
         """Add a new app to the manager"""
-        if app_name in self.apps:
-            return False
-        
-        self.apps[app_name] = {
-            'type': app_type,
-            'config': config,
-            'status': 'inactive'
-        }
-        self.save_apps()
-        return True
+        return bool(self.add_apps([(app_name, app_type, config)], claims))
+    
+    def add_apps(self, entries: Iterable[Tuple[str, str, dict]], claims: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Add several apps in one atomic write, returning the names that were added"""
+        self._authorize('add', claims)
+        added = []
+        for app_name, app_type, config in entries:
+            if app_name in self.apps:
+                continue
+            self.apps[app_name] = {
+                'type': app_type,
+                'config': config,
+                'status': 'inactive'
+            }
+            self._index(app_name)
+            added.append(app_name)
+        if added:
+            self._commit(added, ())
+        return added
     
-    def remove_app(self, app_name: str) -> bool:
+    def remove_app(self, app_name: str, claims: Optional[Dict[str, Any]] = None) -> bool:
         """Remove an app from the manager"""
-        if app_name not in self.apps:
+        return bool(self.remove_apps([app_name], claims))
+    
+    def remove_apps(self, app_names: Iterable[str], claims: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Remove several apps in one atomic write, returning the names that were removed"""
+        self._authorize('remove', claims)
+        removed = []
+        for app_name in app_names:
+            if app_name in self.apps:
+                self._unindex(app_name)
+                del self.apps[app_name]
+                removed.append(app_name)
+        if removed:
+            self._commit((), removed)
+        return removed
+    
+    def set_app_status(self, app_name: str, status: str) -> bool:
+        """Change an app's status, moving it between status index buckets in place"""
+        app = self.apps.get(app_name)
+        if not app:
             return False
-        
-        del self.apps[app_name]
-        self.save_apps()
+        if app['status'] == status:
+            return True
+        self._remove_from(self.by_status, app['status'], app_name)
+        app['status'] = status
+        self.by_status.setdefault(status, {})[app_name] = None
+        self._commit([app_name], ())
         return True
     
-    def launch_teamviewer(self, connection_id: str) -> bool:
-        """Launch TeamViewer with specific connection ID"""
-        try:
-            if os.name == 'nt':  # Windows
-                subprocess.Popen(['teamviewer.exe', '-i', connection_id])
-            else:  # Linux/MacOS
-                subprocess.Popen(['teamviewer', '-i', connection_id])
-            return True
-        except Exception as e:
-            print(f"Error launching TeamViewer: {e}")
-            return False
+    def query(self, app_type: Optional[str] = None, status: Optional[str] = None, **config) -> List[str]:
+        """Return app names matching every given field, e.g. ``query('TeamViewer', 'active')``
+        
+        Keyword arguments match config fields; fields listed in
+        INDEXED_CONFIG_KEYS are looked up directly, others are filtered.
+        """
+        candidates = []
+        if app_type is not None:
+            candidates.append(self.by_type.get(app_type, {}))
+        if status is not None:
+            candidates.append(self.by_status.get(status, {}))
+        for key, value in config.items():
+            if key in self.by_config:
+                candidates.append(self.by_config[key].get(value, {}))
+        if not candidates:
+            candidates.append(self.apps)
+        # Walk the smallest bucket and check the remaining criteria per app
+        smallest = min(candidates, key=len)
+        result = []
+        for app_name in smallest:
+            app = self.apps[app_name]
+            if app_type is not None and app['type'] != app_type:
+                continue
+            if status is not None and app['status'] != status:
+                continue
+            if any(app['config'].get(key) != value for key, value in config.items()):
+                continue
+            result.append(app_name)
+        return result
     
-    def launch_obs(self, stream_key: str) -> bool:
-        """Launch OBS Studio with streaming configuration"""
-        try:
-            if os.name == 'nt':  # Windows
-                subprocess.Popen(['obs64.exe', '--stream', stream_key])
-            else:  # Linux/MacOS
-                subprocess.Popen(['obs', '--stream', stream_key])
-            return True
-        except Exception as e:
-            print(f"Error launching OBS: {e}")
-            return False
+    def _authorize(self, action: str, claims: Optional[Dict[str, Any]]):
+        """Raise auth.PermissionDenied if the acting user may not ``action``"""
+        claims = claims if claims is not None else self.session
+        if claims is not None:
+            require_role(claims, action)
+
+    def _index(self, app_name: str):
+        app = self.apps[app_name]
+        self.by_type.setdefault(app['type'], {})[app_name] = None
+        self.by_status.setdefault(app['status'], {})[app_name] = None
+        for key, index in self.by_config.items():
+            value = app['config'].get(key)
+            if value is not None:
+                index.setdefault(value, {})[app_name] = None
+    
+    def _unindex(self, app_name: str):
+        app = self.apps[app_name]
+        self._remove_from(self.by_type, app['type'], app_name)
+        self._remove_from(self.by_status, app['status'], app_name)
+        for key, index in self.by_config.items():
+            value = app['config'].get(key)
+            if value is not None:
+                self._remove_from(index, value, app_name)
+    
+    @staticmethod
+    def _remove_from(index: Dict[Any, Dict[str, None]], value, app_name: str):
+        bucket = index.get(value)
+        if bucket is not None:
+            bucket.pop(app_name, None)
+            if not bucket:
+                del index[value]
+    
+    def _commit(self, changed: Iterable[str], removed: Iterable[str]):
+        changed, removed = list(changed), list(removed)
+        if self._deferred is None:
+            self.store.commit(self.apps, changed, removed)
+        else:
+            self._deferred[0].update(dict.fromkeys(changed))
+            self._deferred[1].update(dict.fromkeys(removed))
+        self._notify(changed, removed)
+
+    def _notify(self, changed: List[str], removed: List[str]):
+        for listener in list(self.listeners):
+            try:
+                listener(changed, removed)
+            except Exception as e:
+                print(f"Error in app listener: {e}")
+    
+    def import_json(self, path: str, claims: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Add apps from a file in the apps_config.json format"""
+        with open(path, 'r') as f:
+            apps = json.load(f)
+        return self.add_apps(
+            ((app_name, app['type'], app.get('config', {})) for app_name, app in apps.items()), claims
+        )
+    
+    def export_json(self, path: str):
+        """Write all apps to a file in the apps_config.json format"""
+        write_json_atomic(path, self.apps)
     
     def get_app_list(self) -> List[str]:
         """Get list of all managed apps"""
@@ -0,0 +1,91 @@
+import abc
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, Iterable
+
+class AppStore(abc.ABC):
+    """Persistence backend for AppManager
+
+    ``commit`` receives the full in-memory catalog together with the names
+    that changed or were removed, so each backend can write only what it
+    needs. A commit is all-or-nothing.
+    """
+
+    @abc.abstractmethod
+    def load(self) -> Dict[str, dict]:
+        ...
+
+    @abc.abstractmethod
+    def commit(self, apps: Dict[str, dict], changed: Iterable[str], removed: Iterable[str]):
+        ...
+
+    def close(self):
+        pass
+
+class JSONAppStore(AppStore):
+    """The original ``apps_config.json`` format, written atomically"""
+
+    def __init__(self, path: str = 'apps_config.json'):
+        self.path = path
+
+    def load(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def commit(self, apps: Dict[str, dict], changed: Iterable[str], removed: Iterable[str]):
+        write_json_atomic(self.path, apps)
+
+class SQLiteAppStore(AppStore):
+    """One row per app, so a mutation only writes the rows it touches"""
+
+    def __init__(self, path: str = 'apps.db'):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS apps (name TEXT PRIMARY KEY, data TEXT NOT NULL)')
+        self.conn.commit()
+
+    def load(self) -> Dict[str, dict]:
+        with self._lock:
+            rows = self.conn.execute('SELECT name, data FROM apps ORDER BY rowid').fetchall()
+        return {name: json.loads(data) for name, data in rows}
+
+    def commit(self, apps: Dict[str, dict], changed: Iterable[str], removed: Iterable[str]):
+        with self._lock, self.conn:
+            self.conn.executemany('DELETE FROM apps WHERE name = ?', ((name,) for name in removed))
+            # An upsert keeps the row, and so the app's place in load()'s order;
+            # INSERT OR REPLACE would delete it and append a new one
+            self.conn.executemany(
+                'INSERT INTO apps (name, data) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET data = excluded.data',
+                ((name, json.dumps(apps[name], separators=(',', ':'))) for name in changed)
+            )
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self.conn.execute('SELECT 1 FROM apps LIMIT 1').fetchone() is None
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+def write_json_atomic(path: str, apps: Dict[str, dict]):
+    """Write ``apps`` in the ``apps_config.json`` format without ever leaving a torn file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.apps_config.', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(apps, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
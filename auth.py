@@ -0,0 +1,230 @@
+import argparse
+import base64
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+
+ROLE_ADMIN = 'admin'
+ROLE_USER = 'user'
+# A role may do everything the roles ranked below it may
+ROLE_RANKS = {ROLE_USER: 0, ROLE_ADMIN: 1}
+
+# Lowest role allowed each action, locally, over the control plane or on a stream
+ACTION_ROLES = {
+    'list': ROLE_USER,
+    'status': ROLE_USER,
+    'launch': ROLE_USER,
+    'watch': ROLE_USER,
+    'add': ROLE_ADMIN,
+    'remove': ROLE_ADMIN
+}
+
+SECRET_PATH = 'auth.key'
+# Lifetime of the token issued at sign-in
+SESSION_TTL = 12 * 3600
+
+_HEADER = base64.urlsafe_b64encode(json.dumps({'alg': 'HS256', 'typ': 'JWT'}, separators=(',', ':')).encode()).rstrip(b'=')
+
+class AuthError(Exception):
+    """A token that is malformed, forged or expired"""
+
+class PermissionDenied(AuthError):
+    """A valid token whose role does not allow the action"""
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+def load_secret(path: str = SECRET_PATH) -> bytes:
+    """The signing key in ``path``, created readable by this user only on first use"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    secret = secrets.token_bytes(32)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another instance created it first
+        with open(path, 'rb') as f:
+            return f.read()
+    with os.fdopen(fd, 'wb') as f:
+        f.write(secret)
+    return secret
+
+def require_role(claims: Dict[str, Any], action: str):
+    """Raise PermissionDenied unless ``claims`` may perform ``action``"""
+    needed = ACTION_ROLES[action]
+    if ROLE_RANKS.get(claims.get('role'), -1) < ROLE_RANKS[needed]:
+        raise PermissionDenied(f"{action} needs the {needed} role, {claims.get('sub')} is {claims.get('role')}")
+
+def bearer_check(tokens: 'TokenService', action: str):
+    """A websockets ``process_request`` hook admitting only tokens from ``tokens`` that allow ``action``
+
+    The token is read from ``Authorization: Bearer <token>``. Anything
+    else is answered 401 (no or invalid token) or 403 (role too low)
+    before the WebSocket handshake.
+    """
+    async def check(path, headers):
+        token = headers.get('Authorization', '').removeprefix('Bearer ')
+        try:
+            require_role(tokens.verify(token), action)
+        except PermissionDenied as e:
+            return HTTPStatus.FORBIDDEN, [], f"{e}\n".encode()
+        except AuthError as e:
+            return HTTPStatus.UNAUTHORIZED, [], f"{e}\n".encode()
+        return None
+    return check
+
+def bearer_headers(token: Optional[str]) -> Optional[Dict[str, str]]:
+    """Request headers presenting ``token`` to a server using bearer_check"""
+    return {'Authorization': f'Bearer {token}'} if token else None
+
+class TokenService:
+    """Issues and verifies HMAC-SHA256 signed tokens (JWT, HS256)
+
+    Verified claims are cached by token until the token expires or
+    ``cache_ttl`` passes, whichever is first, so checking a token on every
+    message is a dict lookup after the first time. Tokens that fail are
+    never cached. Reaching ``max_cached`` entries drops the expired ones,
+    then the oldest until a quarter of the room is free. The key is read
+    from SECRET_PATH on first use unless given; peers verifying each
+    other's tokens need the same key.
+    """
+
+    def __init__(self, secret: Optional[bytes] = None, cache_ttl: float = 300.0, max_cached: int = 4096):
+        self.cache_ttl = cache_ttl
+        self.max_cached = max_cached
+        # Token of the user signed in to this overlay, presented to peers by default
+        self.session: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self._secret = secret
+        self._cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def secret(self) -> bytes:
+        if self._secret is None:
+            self._secret = load_secret()
+        return self._secret
+
+    def issue(self, username: str, role: str, ttl: float = SESSION_TTL) -> str:
+        if role not in ROLE_RANKS:
+            raise ValueError(f"unknown role {role!r}")
+        now = int(time.time())
+        claims = {'sub': username, 'role': role, 'iat': now, 'exp': now + int(ttl)}
+        signing_input = _HEADER + b'.' + _b64encode(json.dumps(claims, separators=(',', ':')).encode())
+        signature = hmac.new(self.secret, signing_input, hashlib.sha256).digest()
+        return (signing_input + b'.' + _b64encode(signature)).decode()
+
+    def sign_in(self, username: str, role: str) -> Dict[str, Any]:
+        """Issue this overlay's session token and return its claims"""
+        self.session = self.issue(username, role)
+        return self.verify(self.session)
+
+    def session_claims(self) -> Optional[Dict[str, Any]]:
+        if self.session is None:
+            return None
+        try:
+            return self.verify(self.session)
+        except AuthError:
+            return None
+
+    def verify(self, token: Optional[str]) -> Dict[str, Any]:
+        """The claims of ``token``; raises AuthError if it is not valid now"""
+        if token is None or token == '':
+            raise AuthError("no token")
+        # Tokens come straight off the wire: anything but a string is refused
+        # here, before it reaches the cache or the signature check
+        if not isinstance(token, str):
+            raise AuthError("malformed token")
+        now = time.time()
+        entry = self._cache.get(token)
+        if entry is not None:
+            if now < entry[1]:
+                self.hits += 1
+                return entry[0]
+            self._cache.pop(token, None)
+        self.misses += 1
+        claims = self.verify_signature(token, now)
+        with self._lock:
+            if len(self._cache) >= self.max_cached:
+                self._evict(now)
+            self._cache[token] = (claims, min(claims['exp'], now + self.cache_ttl))
+        return claims
+
+    def verify_signature(self, token: str, now: Optional[float] = None) -> Dict[str, Any]:
+        """Full check of ``token`` without the cache"""
+        if not isinstance(token, str):
+            raise AuthError("malformed token")
+        try:
+            signing_input, signature = token.encode('ascii').rsplit(b'.', 1)
+            header, payload = signing_input.split(b'.')
+        except (UnicodeEncodeError, ValueError):
+            raise AuthError("malformed token")
+        if header != _HEADER:
+            raise AuthError("unsupported token header")
+        expected = _b64encode(hmac.new(self.secret, signing_input, hashlib.sha256).digest())
+        if not hmac.compare_digest(expected, signature):
+            raise AuthError("bad token signature")
+        try:
+            claims = json.loads(_b64decode(payload.decode()))
+        except ValueError:
+            raise AuthError("malformed token claims")
+        if not isinstance(claims, dict) or claims.get('role') not in ROLE_RANKS or not isinstance(claims.get('exp'), int):
+            raise AuthError("malformed token claims")
+        if (now if now is not None else time.time()) >= claims['exp']:
+            raise AuthError("token expired")
+        return claims
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _evict(self, now: float):
+        for token, (_, expires) in list(self._cache.items()):
+            if expires <= now:
+                del self._cache[token]
+        # Still over three quarters full: drop the oldest entries (dicts keep
+        # insertion order), so the next sweep is max_cached / 4 misses away
+        excess = len(self._cache) - self.max_cached * 3 // 4
+        for token in list(itertools.islice(self._cache, max(excess, 0))):
+            del self._cache[token]
+
+# Shared by the sign-in dialog, the control service and stream senders
+tokens = TokenService()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Issue access tokens for this overlay's control service and streams")
+    commands = parser.add_subparsers(dest='command', required=True)
+    issue = commands.add_parser('issue', help="print a token signed with this machine's key")
+    issue.add_argument('username')
+    issue.add_argument('--role', choices=sorted(ROLE_RANKS), default=ROLE_USER)
+    issue.add_argument('--ttl', type=float, default=SESSION_TTL, help="lifetime in seconds")
+    verify = commands.add_parser('verify', help="print a token's claims")
+    verify.add_argument('token')
+    args = parser.parse_args(argv)
+    if args.command == 'issue':
+        print(tokens.issue(args.username, args.role, args.ttl))
+        return 0
+    try:
+        print(json.dumps(tokens.verify_signature(args.token)))
+    except AuthError as e:
+        print(f"Invalid token: {e}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
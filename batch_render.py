@@ -0,0 +1,202 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+import image_editor
+from edit_graph import OPERATIONS
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+# Pixels a step reads beyond each output pixel. Steps listed here can run
+# tile by tile; the others change geometry and run on the whole image.
+TILE_HALO = {
+    'brightness_contrast': lambda params: 0,
+    'levels': lambda params: 0,
+    'invert': lambda params: 0,
+    'swap_rb': lambda params: 0,
+    'convert': lambda params: 0,
+    'blur': lambda params: max(params.get('radius', 2), 0),
+    'sharpen': lambda params: max(params.get('radius', 1), 1)
+}
+
+Step = Dict[str, object]
+
+# Per-process tile pool, created by _init_worker
+_tile_pool: Optional[ThreadPoolExecutor] = None
+
+def load_recipe(path: str) -> List[Step]:
+    with open(path, 'r') as f:
+        recipe = json.load(f)
+    for step in recipe:
+        if step.get('op') not in OPERATIONS or step['op'] == 'blend':
+            raise ValueError(f"Unsupported recipe step: {step}")
+    return recipe
+
+def split_recipe(recipe: List[Step]) -> List[Tuple[bool, List[Step]]]:
+    """Group consecutive steps into (tileable, steps) runs"""
+    runs = []
+    for step in recipe:
+        tileable = step['op'] in TILE_HALO
+        if runs and runs[-1][0] == tileable:
+            runs[-1][1].append(step)
+        else:
+            runs.append((tileable, [step]))
+    return runs
+
+def run_steps(image: np.ndarray, steps: List[Step]) -> np.ndarray:
+    for step in steps:
+        params = dict(step)
+        function, _ = OPERATIONS[params.pop('op')]
+        image = function(image, **params)
+    return image
+
+def render_tiled(image: np.ndarray, steps: List[Step], tile: int, pool: Optional[ThreadPoolExecutor]) -> np.ndarray:
+    """Run tileable ``steps`` over ``tile``-sized blocks, each padded by the steps' halo
+
+    Padding makes every tile's centre identical to processing the image
+    whole. OpenCV releases the GIL, so tiles on a thread pool use all cores.
+    """
+    h, w = image.shape[:2]
+    if pool is None or not tile or h * w <= tile * tile:
+        # Tiling only pays off when tiles run in parallel
+        return run_steps(image, steps)
+    halo = sum(TILE_HALO[step['op']]({k: v for k, v in step.items() if k != 'op'}) for step in steps)
+
+    def render(origin):
+        y, x = origin
+        y0, x0 = max(y - halo, 0), max(x - halo, 0)
+        y1, x1 = min(y + tile + halo, h), min(x + tile + halo, w)
+        result = run_steps(image[y0:y1, x0:x1], steps)
+        return y, x, result[y - y0:y - y0 + min(tile, h - y), x - x0:x - x0 + min(tile, w - x)]
+
+    origins = [(y, x) for y in range(0, h, tile) for x in range(0, w, tile)]
+    output = None
+    for y, x, block in pool.map(render, origins):
+        if output is None:
+            # Allocated from the first tile, which knows the output channels
+            output = np.empty((h, w) + block.shape[2:], dtype=block.dtype)
+        output[y:y + block.shape[0], x:x + block.shape[1]] = block
+    return output
+
+def render_image(image: np.ndarray, recipe: List[Step], tile: int = 1024,
+                 pool: Optional[ThreadPoolExecutor] = None) -> np.ndarray:
+    for tileable, steps in split_recipe(recipe):
+        image = render_tiled(image, steps, tile, pool) if tileable else run_steps(image, steps)
+    return image
+
+def _init_worker(threads: int):
+    global _tile_pool
+    # Parallelism comes from our tiles and processes, not OpenCV's own pool
+    cv2.setNumThreads(1)
+    if _tile_pool:
+        _tile_pool.shutdown()
+    _tile_pool = ThreadPoolExecutor(threads) if threads > 1 else None
+
+def render_file(recipe: List[Step], source: str, target: str, tile: int) -> Tuple[str, int, Optional[str]]:
+    """Render one file to disk; returns (source, pixels, error)"""
+    try:
+        image = image_editor.read_image(source)
+        output = render_image(image, recipe, tile, _tile_pool)
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        if not cv2.imwrite(target, output):
+            return source, 0, f"could not write {target}"
+        return source, image.shape[0] * image.shape[1], None
+    except (ValueError, cv2.error) as e:
+        return source, 0, str(e)
+
+def collect_jobs(inputs: List[str], output_dir: str, ext: Optional[str]) -> List[Tuple[str, str]]:
+    """(source, target) pairs; directories are walked and mirrored under ``output_dir``"""
+    jobs = []
+    def target_for(path, relative):
+        if ext:
+            relative = os.path.splitext(relative)[0] + ext
+        return path, os.path.join(output_dir, relative)
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                for name in sorted(files):
+                    if name.lower().endswith(IMAGE_EXTENSIONS):
+                        path = os.path.join(root, name)
+                        jobs.append(target_for(path, os.path.relpath(path, item)))
+        elif os.path.isfile(item):
+            jobs.append(target_for(item, os.path.basename(item)))
+        else:
+            print(f"Skipping missing input: {item}")
+    return jobs
+
+def run_batch(recipe: List[Step], jobs: List[Tuple[str, str]], workers: int, threads: int, tile: int) -> Dict[str, float]:
+    """Render every job, keeping at most two images per worker in memory"""
+    done = failed = pixels = 0
+    start = time.perf_counter()
+
+    def finish(result):
+        nonlocal done, failed, pixels
+        source, count, error = result
+        if error:
+            failed += 1
+            print(f"Error rendering {source}: {error}")
+        else:
+            done += 1
+            pixels += count
+
+    if workers <= 1:
+        _init_worker(threads)
+        for source, target in jobs:
+            finish(render_file(recipe, source, target, tile))
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(threads,)) as pool:
+            pending = set()
+            for source, target in jobs:
+                if len(pending) >= 2 * workers:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        finish(future.result())
+                pending.add(pool.submit(render_file, recipe, source, target, tile))
+            for future in wait(pending)[0]:
+                finish(future.result())
+    elapsed = time.perf_counter() - start
+    return {
+        'images': done,
+        'failed': failed,
+        'seconds': elapsed,
+        'images_per_second': done / elapsed if elapsed else 0.0,
+        'megapixels_per_second': pixels / 1e6 / elapsed if elapsed else 0.0
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Apply an image editor recipe to many images without the UI")
+    parser.add_argument('recipe', help="recipe JSON saved from the image editor")
+    parser.add_argument('inputs', nargs='+', help="image files or directories")
+    parser.add_argument('-o', '--output', required=True, help="output directory")
+    parser.add_argument('--workers', type=int, default=0, help="processes (default: one per core)")
+    parser.add_argument('--threads', type=int, default=0, help="tile threads per process (default: spare cores)")
+    parser.add_argument('--tile', type=int, default=1024, help="tile size in pixels, 0 to disable tiling")
+    parser.add_argument('--ext', help="output extension, e.g. .png (default: keep the input's)")
+    args = parser.parse_args(argv)
+
+    try:
+        recipe = load_recipe(args.recipe)
+    except (OSError, ValueError) as e:
+        print(f"Error loading recipe: {e}")
+        return 1
+    jobs = collect_jobs(args.inputs, args.output, args.ext)
+    if not jobs:
+        print("No images to render")
+        return 1
+    cores = os.cpu_count() or 1
+    workers = args.workers or min(cores, len(jobs))
+    # With fewer images than cores, the remaining cores render tiles
+    threads = args.threads or max(cores // workers, 1)
+    stats = run_batch(recipe, jobs, workers, threads, args.tile)
+    print(f"Rendered {stats['images']} images ({stats['failed']} failed) in {stats['seconds']:.2f} s: "
+          f"{stats['images_per_second']:.2f} images/s, {stats['megapixels_per_second']:.1f} MP/s "
+          f"({workers} processes x {threads} threads)")
+    return 1 if stats['failed'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""Compare AppManager storage backends when provisioning many apps
+
+Run from the repository root: ``python benchmarks/bench_app_store.py``
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app_manager import AppManager
+from app_store import JSONAppStore, SQLiteAppStore
+
+APPS = 10000
+# One-by-one JSON rewrites are quadratic; keep that case small and extrapolate
+LEGACY_APPS = 1000
+
+def entries(count):
+    return [(f'TeamViewer_{i}', 'TeamViewer', {'connection_id': str(i)}) for i in range(count)]
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def bench(name, make_store, count, batched):
+    with tempfile.TemporaryDirectory() as directory:
+        manager = AppManager(make_store(directory))
+        if batched:
+            elapsed = timed(lambda: manager.add_apps(entries(count)))
+        else:
+            elapsed = timed(lambda: [manager.add_app(*entry) for entry in entries(count)])
+        load = timed(lambda: AppManager(make_store(directory)))
+        remove = timed(lambda: manager.remove_apps(list(manager.apps)[:count // 10]))
+        manager.store.close()
+    mode = 'add_apps' if batched else 'add_app x N'
+    print(f"{name:>7} {mode:>12} {count:6d} apps: add {elapsed * 1000:9.1f} ms  "
+          f"load {load * 1000:7.1f} ms  remove 10% {remove * 1000:7.1f} ms")
+
+def main():
+    json_store = lambda directory: JSONAppStore(os.path.join(directory, 'apps_config.json'))
+    sqlite_store = lambda directory: SQLiteAppStore(os.path.join(directory, 'apps.db'))
+    bench('json', json_store, LEGACY_APPS, batched=False)
+    bench('sqlite', sqlite_store, APPS, batched=False)
+    bench('json', json_store, APPS, batched=True)
+    bench('sqlite', sqlite_store, APPS, batched=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Token verifications per second with and without the claims cache
+
+First in a tight loop: a few live sessions presenting their tokens over
+and over, as the control plane sees them, and a spread of 10000 distinct
+tokens that overflows the cache. Then end to end: multiplexed ``status``
+calls on an RPCServer checking every request's token through the cache,
+with a full signature check per request, and with no auth at all.
+
+Run from the repository root: ``python benchmarks/bench_auth.py``
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth import ROLE_ADMIN, ROLE_USER, TokenService
+from control_plane import RPCClient, RPCServer
+
+LOOPS = 200000
+SESSIONS = 4
+SPREAD = 10000
+CALLS = 5000
+
+def rate(verify, tokens, loops):
+    start = time.perf_counter()
+    for i in range(loops):
+        verify(tokens[i % len(tokens)])
+    return loops / (time.perf_counter() - start)
+
+def bench_loop(service):
+    sessions = [service.issue(f'user{i}', ROLE_USER if i else ROLE_ADMIN) for i in range(SESSIONS)]
+    spread = [service.issue(f'user{i}', ROLE_USER) for i in range(SPREAD)]
+    print(f"verify() in a loop, {LOOPS} checks")
+    for label, tokens in ((f'{SESSIONS} sessions', sessions), (f'{SPREAD} distinct tokens', spread)):
+        service.clear_cache()
+        service.hits = service.misses = 0
+        uncached = rate(service.verify_signature, tokens, LOOPS)
+        cached = rate(service.verify, tokens, LOOPS)
+        hit_rate = service.hits / (service.hits + service.misses)
+        print(f"  {label:20s} signature {uncached:10.0f}/s   cached {cached:10.0f}/s "
+              f"({cached / uncached:5.1f}x, {hit_rate:.0%} hits)")
+
+async def bench_server(service):
+    print(f"RPCServer, {CALLS} multiplexed status calls with a token each")
+
+    async def status(name, claims=None):
+        return 'active'
+
+    token = service.issue('bench', ROLE_USER)
+    for label, verify in (('no auth', None), ('signature per request', service.verify_signature),
+                          ('cached per request', service.verify)):
+        server = RPCServer({'status': status}, port=0, verify=verify)
+        await server.start()
+        client = RPCClient(f'ws://localhost:{server.port}', token=token)
+        task = asyncio.create_task(client.run())
+        await client.wait_connected(5)
+        await client.call('status', name='warmup')
+        start = time.perf_counter()
+        await asyncio.gather(*(client.call('status', name='app') for _ in range(CALLS)))
+        elapsed = time.perf_counter() - start
+        print(f"  {label:22s} {elapsed * 1000:8.1f} ms  {CALLS / elapsed:8.0f} calls/s")
+        await client.stop()
+        await task
+        await server.stop()
+
+def main():
+    service = TokenService(os.urandom(32))
+    bench_loop(service)
+    asyncio.run(bench_server(service))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Throughput of batch_render over a folder of synthetic 4K captures
+
+Compares one process rendering whole images, one process with tile threads,
+and one process per core. Speedups need more than one core.
+
+Run from the repository root: ``python benchmarks/bench_batch_render.py``
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+from batch_render import collect_jobs, run_batch
+
+IMAGES = 8
+WIDTH, HEIGHT = 3840, 2160
+RECIPE = [
+    {'op': 'levels', 'black': 8, 'white': 248, 'gamma': 1.1},
+    {'op': 'blur', 'radius': 2},
+    {'op': 'sharpen', 'amount': 0.6},
+    {'op': 'brightness_contrast', 'brightness': 5, 'contrast': 1.1}
+]
+
+def main():
+    cores = os.cpu_count() or 1
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        source_dir = os.path.join(directory, 'in')
+        os.makedirs(source_dir)
+        for i in range(IMAGES):
+            image = rng.integers(0, 256, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+            # BMP keeps encode/decode cost out of the comparison
+            cv2.imwrite(os.path.join(source_dir, f'capture_{i}.bmp'), image)
+        configs = [
+            ('1 process, whole images', 1, 1, 0),
+            (f'1 process, {cores} tile threads', 1, cores, 1024),
+            (f'{cores} processes', cores, 1, 1024)
+        ]
+        print(f"{IMAGES} images {WIDTH}x{HEIGHT}, {cores} cores")
+        for name, workers, threads, tile in configs:
+            jobs = collect_jobs([source_dir], os.path.join(directory, 'out'), None)
+            stats = run_batch(RECIPE, jobs, workers, threads, tile)
+            print(f"  {name:28s} {stats['images_per_second']:6.2f} images/s  "
+                  f"{stats['megapixels_per_second']:6.1f} MP/s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Two overlay instances on localhost: one serves its AppManager, the other mirrors it
+
+Measures 1000 ``status`` calls made one after another and multiplexed on
+the one connection, then how a live mirror keeps up with 500 status
+changes on the serving side: time until the mirror shows the last one
+and bytes on the wire compared with refetching the full list after each
+change. Also compares msgpack and JSON sizes of a full snapshot.
+
+Run from the repository root: ``python benchmarks/bench_control_plane.py``
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QCoreApplication
+from app_manager import AppManager
+from app_store import SQLiteAppStore
+from auth import ROLE_ADMIN, TokenService
+from control_plane import ControlService, RemoteControl, pack, public_app
+
+APPS = 200
+CALLS = 1000
+CHANGES = 500
+
+def pump(app, until, timeout=30):
+    end = time.perf_counter() + timeout
+    while not until() and time.perf_counter() < end:
+        app.processEvents()
+    return until()
+
+def main():
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    directory = tempfile.mkdtemp()
+    manager = AppManager(SQLiteAppStore(os.path.join(directory, 'apps.db')))
+    manager.add_apps((f'TeamViewer_{i}', 'TeamViewer', {'connection_id': str(100000 + i)}) for i in range(APPS))
+    tokens = TokenService(os.urandom(32))
+    service = ControlService(manager, lambda name: manager.set_app_status(name, 'active'), port=0, tokens=tokens)
+    service.start()
+    remote = RemoteControl(f'ws://localhost:{service.server.port}', token=tokens.issue('bench', ROLE_ADMIN))
+    pump(app, lambda: remote.version is not None)
+    print(f"{APPS} apps served on localhost, mirror synced with {remote.snapshots} snapshot")
+
+    completed = 0
+    start = time.perf_counter()
+
+    def next_call(future=None):
+        nonlocal completed
+        if future is not None:
+            completed += 1
+        if completed < CALLS:
+            remote.call('status', callback=next_call, name=f'TeamViewer_{completed % APPS}')
+    next_call()
+    pump(app, lambda: completed >= CALLS)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    futures = [remote.call('status', name=f'TeamViewer_{i % APPS}') for i in range(CALLS)]
+    pump(app, lambda: all(future.done() for future in futures))
+    multiplexed = time.perf_counter() - start
+    print(f"  {CALLS} status calls: sequential {sequential * 1000:7.1f} ms ({CALLS / sequential:6.0f}/s), "
+          f"multiplexed {multiplexed * 1000:7.1f} ms ({CALLS / multiplexed:6.0f}/s)")
+
+    event_bytes = []
+    remote._loop.loop.call_soon_threadsafe(remote.pool.subscribe, remote.url,
+                                           lambda event, data: event_bytes.append(len(pack(['', event, data]))),
+                                           None, remote.token)
+    start = time.perf_counter()
+    for i in range(CHANGES):
+        manager.set_app_status(f'TeamViewer_{i % APPS}', 'active' if (i // APPS) % 2 == 0 else 'inactive')
+    last = f'TeamViewer_{(CHANGES - 1) % APPS}'
+    expected = manager.apps[last]['status']
+    pump(app, lambda: remote.apps.get(last, {}).get('status') == expected and remote.version == service.version)
+    elapsed = time.perf_counter() - start
+    snapshot = {'version': service.version, 'apps': {name: public_app(a) for name, a in manager.apps.items()}}
+    snapshot_bytes = len(pack(snapshot))
+    consistent = remote.apps == snapshot['apps']
+    print(f"  {CHANGES} changes mirrored in {elapsed * 1000:.1f} ms, {remote.snapshots} snapshot(s) in total, "
+          f"mirror consistent: {consistent}")
+    print(f"  wire: incremental {sum(event_bytes) / 1024:7.1f} KiB vs refetch per change "
+          f"{snapshot_bytes * CHANGES / 1024:7.1f} KiB")
+    print(f"  snapshot of {APPS} apps: msgpack {snapshot_bytes} bytes, JSON {len(json.dumps(snapshot))} bytes")
+    remote.stop()
+    service.stop()
+
+if __name__ == '__main__':
+    main()
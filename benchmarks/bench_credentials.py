@@ -0,0 +1,106 @@
+"""Password checks: KDF cost, event loop stalls and brute-force throttling
+
+Times one hash per cost setting, then the longest gap between 5 ms timer
+ticks on the Qt thread while five sign-ins are checked inline (as a
+naive ``try_login`` would) and through Authenticator's worker. Last, a
+burst of 40 wrong passwords for one name with and without the
+per-username RateLimiter: how many hashes ran and the CPU they took.
+
+Run from the repository root: ``python benchmarks/bench_credentials.py``
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QCoreApplication, QTimer
+from credentials import Authenticator, CredentialStore, RateLimiter, check_password, hash_password
+
+SIGN_INS = 5
+BURST = 40
+COSTS = [('scrypt', {'n': 2 ** 14}), ('scrypt', {}), ('scrypt', {'n': 2 ** 16}),
+         ('pbkdf2_sha256', {'iterations': 210000}), ('pbkdf2_sha256', {})]
+
+def pump(app, until, timeout=60):
+    end = time.perf_counter() + timeout
+    while not until() and time.perf_counter() < end:
+        app.processEvents()
+
+class TickMonitor:
+    """Longest gap between ticks of a 5 ms timer, i.e. how long the event loop was blocked"""
+
+    def __init__(self):
+        self.last = time.perf_counter()
+        self.max_gap = 0.0
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.tick)
+        self.timer.start(5)
+
+    def tick(self):
+        now = time.perf_counter()
+        self.max_gap = max(self.max_gap, now - self.last)
+        self.last = now
+
+def main():
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    print("one password hash")
+    for scheme, cost in COSTS:
+        encoded = hash_password('secret', scheme, **cost)
+        start = time.perf_counter()
+        check_password('secret', encoded)
+        print(f"  {encoded.rsplit('$', 2)[0]:24s} {(time.perf_counter() - start) * 1000:7.1f} ms")
+
+    store = CredentialStore(os.path.join(tempfile.mkdtemp(), 'credentials.json'))
+    store.set_user('alice', 'secret', 'user')
+    print(f"{SIGN_INS} sign-ins, longest event loop stall")
+    monitor = TickMonitor()
+    done = []
+
+    def inline(i=0):
+        if i < SIGN_INS:
+            done.append(store.verify('alice', 'secret'))
+            QTimer.singleShot(50, lambda: inline(i + 1))
+    inline()
+    pump(app, lambda: len(done) >= SIGN_INS)
+    print(f"  inline in try_login   {monitor.max_gap * 1000:7.1f} ms")
+
+    authenticator = Authenticator(store)
+    done.clear()
+    monitor.max_gap, monitor.last = 0.0, time.perf_counter()
+
+    def on_worker(role, error, i):
+        done.append(role)
+        if i + 1 < SIGN_INS:
+            QTimer.singleShot(50, lambda: authenticator.authenticate('alice', 'secret',
+                                                                     lambda r, e: on_worker(r, e, i + 1)))
+    authenticator.authenticate('alice', 'secret', lambda role, error: on_worker(role, error, 0))
+    pump(app, lambda: len(done) >= SIGN_INS)
+    print(f"  Authenticator worker  {monitor.max_gap * 1000:7.1f} ms")
+    authenticator.close()
+
+    print(f"{BURST} wrong passwords for one name, as fast as answers come back")
+    for label, limiter in (('no limit', RateLimiter(free_attempts=BURST + 1)), ('RateLimiter', RateLimiter())):
+        authenticator = Authenticator(store, limiter)
+        refused = []
+        answered = 0
+        cpu = time.process_time()
+        start = time.perf_counter()
+
+        def attempt(role=None, error=None):
+            nonlocal answered
+            answered += 1
+            if error and error.startswith('Too many'):
+                refused.append(error)
+            if answered < BURST:
+                authenticator.authenticate('alice', f'guess{answered}', attempt)
+        authenticator.authenticate('alice', 'guess0', attempt)
+        pump(app, lambda: answered >= BURST)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:12s} {authenticator.checked:4d} hashed, {len(refused):4d} refused in {elapsed:5.1f} s, "
+              f"CPU {time.process_time() - cpu:5.2f} s")
+        authenticator.close()
+
+if __name__ == '__main__':
+    main()
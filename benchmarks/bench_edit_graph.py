@@ -0,0 +1,70 @@
+"""Slider drags on an edit chain: replaying every edit versus EditGraph
+
+A chain of five edits sits on a 4K frame, with a brightness adjustment in
+the middle. Each slider step changes its parameter. "Replay" re-applies the
+whole chain from the original at full size for every step, as a destructive
+editor would. The graph re-renders only the nodes after the adjustment, at
+proxy size.
+
+Run from the repository root: ``python benchmarks/bench_edit_graph.py``
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import image_editor
+from edit_graph import EditGraph
+
+WIDTH, HEIGHT = 3840, 2160
+STEPS = 20
+
+def replay(source, brightness):
+    image = image_editor.crop(source, 64, 64, WIDTH - 128, HEIGHT - 128)
+    image = image_editor.levels(image, 8, 248, 1.1)
+    image = image_editor.blur(image, 3)
+    image = image_editor.brightness_contrast(image, brightness, 1.1)
+    return image_editor.sharpen(image, 0.6)
+
+def main():
+    rng = np.random.default_rng(0)
+    source = rng.integers(0, 256, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+    values = [int(v) for v in np.linspace(-50, 50, STEPS)]
+
+    start = time.perf_counter()
+    for value in values:
+        replay(source, value)
+    full = (time.perf_counter() - start) / STEPS
+
+    graph = EditGraph(source)
+    graph.add('crop', x=64, y=64, w=WIDTH - 128, h=HEIGHT - 128)
+    graph.add('levels', black=8, white=248, gamma=1.1)
+    graph.add('blur', radius=3)
+    adjust = graph.add('brightness_contrast', brightness=0, contrast=1.1)
+    graph.add('sharpen', amount=0.6)
+    graph.render()
+    start = time.perf_counter()
+    for value in values:
+        graph.set_params(adjust, brightness=value)
+        graph.render()
+    proxy = (time.perf_counter() - start) / STEPS
+    # Dragging back over visited values is served from the cache
+    start = time.perf_counter()
+    for value in reversed(values):
+        graph.set_params(adjust, brightness=value)
+        graph.render()
+    revisit = (time.perf_counter() - start) / STEPS
+    start = time.perf_counter()
+    graph.export()
+    export = time.perf_counter() - start
+
+    print(f"replay at full size   {full * 1000:8.1f} ms/step")
+    print(f"graph proxy render    {proxy * 1000:8.1f} ms/step")
+    print(f"graph, cached values  {revisit * 1000:8.1f} ms/step")
+    print(f"full-size export      {export * 1000:8.1f} ms once")
+    print(f"cache {graph.stats()}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Loopback harness for FrameSender/FrameReceiver: glass-to-glass latency and bandwidth
+
+A synthetic 720p30 stream is sent to a receiver in the same process, once
+directly and once through a link emulator: a TCP proxy that forwards the
+sender's bytes at LINK_MBPS with LINK_DELAY_MS of one-way delay. Over the
+slow link, fixed quality with a deep window and no stale-frame dropping
+is compared with fixed quality on the default 2-frame window and with
+the adaptive sender.
+
+Glass-to-glass latency runs from capture to the decoded frame reaching
+``on_frame``; both ends share the monotonic clock here.
+
+Run from the repository root: ``python benchmarks/bench_frame_stream.py``
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth import ROLE_USER, TokenService
+from frame_stream import FrameReceiver, FrameSender
+from video_manager import SyntheticCapture, VideoManager
+
+SECONDS = 6
+SIZE = (1280, 720)
+LINK_MBPS = 5
+LINK_DELAY_MS = 20
+
+class LinkEmulator:
+    """TCP proxy limiting the downstream direction to ``mbps`` with ``delay_ms`` latency"""
+
+    def __init__(self, target_port: int, mbps: float, delay_ms: float):
+        self.target_port = target_port
+        self.rate = mbps * 1e6 / 8
+        self.delay = delay_ms / 1000
+        self.port = 0
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, 'localhost', 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+
+    async def _handle(self, client_reader, client_writer):
+        server_reader, server_writer = await asyncio.open_connection('localhost', self.target_port)
+        await asyncio.gather(
+            self._pipe(client_reader, server_writer, shaped=False),
+            self._pipe(server_reader, client_writer, shaped=True),
+            return_exceptions=True
+        )
+
+    async def _pipe(self, reader, writer, shaped):
+        loop = asyncio.get_running_loop()
+        free_at = loop.time()
+        try:
+            while True:
+                data = await reader.read(16384)
+                if not data:
+                    break
+                if shaped:
+                    # Serialisation at the link rate, then propagation delay
+                    free_at = max(free_at, loop.time()) + len(data) / self.rate
+                    await asyncio.sleep(max(free_at - loop.time(), 0))
+                    loop.call_later(self.delay, writer.write, data)
+                else:
+                    writer.write(data)
+        finally:
+            writer.close()
+
+async def run(label, link, **options):
+    manager = VideoManager()
+    manager.open_stream('camera', SyntheticCapture(*SIZE, 30))
+    tokens = TokenService(os.urandom(32))
+    sender = FrameSender(manager, 'camera', port=0, tokens=tokens, **options)
+    await sender.start()
+    port = sender.port
+    emulator = None
+    if link:
+        emulator = LinkEmulator(port, LINK_MBPS, LINK_DELAY_MS)
+        await emulator.start()
+        port = emulator.port
+    latencies = []
+
+    def on_frame(sequence, image, captured_ns):
+        latencies.append((time.monotonic_ns() - captured_ns) / 1e6)
+
+    receiver = FrameReceiver(f'ws://localhost:{port}', on_frame, tokens.issue('bench', ROLE_USER))
+    task = asyncio.create_task(receiver.run())
+    await asyncio.sleep(1)
+    # Measure the steady state only
+    latencies.clear()
+    start_bytes = receiver.bytes
+    await asyncio.sleep(SECONDS)
+    received_bytes = receiver.bytes - start_bytes
+    stats = sender.get_stats()[0]
+    await receiver.close()
+    await asyncio.gather(task, return_exceptions=True)
+    await sender.stop()
+    if emulator:
+        await emulator.stop()
+    manager.close_all()
+    latencies.sort()
+    print(f"  {label:34s} {len(latencies) / SECONDS:5.1f} fps  glass-to-glass avg {sum(latencies) / len(latencies):6.1f} "
+          f"p95 {latencies[int(len(latencies) * 0.95)]:6.1f} ms  {received_bytes * 8 / SECONDS / 1e6:5.1f} Mbit/s  "
+          f"stale {stats['stale']:3d}  quality {stats['quality']} scale {stats['scale']}")
+
+async def main():
+    print(f"{SIZE[0]}x{SIZE[1]}@30 synthetic stream, {SECONDS} s per run, {os.cpu_count()} cores")
+    await run('loopback, JPEG adaptive', False)
+    await run('loopback, PNG', False, codec='png', max_age_ms=1000)
+    print(f" {LINK_MBPS} Mbit/s link, {LINK_DELAY_MS} ms delay")
+    await run('JPEG q90 fixed, 30-frame window', True, quality=90, adaptive=False, window=30, max_age_ms=1e9)
+    await run('JPEG q90 fixed, 2-frame window', True, quality=90, adaptive=False)
+    await run('JPEG adaptive, 2-frame window', True, quality=90)
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+"""Per-keystroke cost of the global hotkey handlers while the overlay is idle
+
+Replays ordinary typing (no hotkey pressed) through the old inline pynput
+handlers and through PynputBackend, the only backend that sees every key.
+The X11 backend grabs just the bound chords, so the X server never wakes it
+for ordinary keys; its cost per keystroke is zero.
+
+Run from the repository root: ``python benchmarks/bench_hotkeys.py``
+"""
+import enum
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hotkeys import PynputBackend, parse_chord
+
+KEYSTROKES = 200000
+
+# Stand-ins shaped like pynput's Key enum and KeyCode, which need a display to import
+class Key(enum.Enum):
+    space = 'space'
+    shift = 'shift'
+    shift_r = 'shift_r'
+    cmd = 'cmd'
+    enter = 'enter'
+    backspace = 'backspace'
+
+class KeyCode:
+    def __init__(self, char):
+        self.char = char
+
+    def __eq__(self, other):
+        return isinstance(other, KeyCode) and other.char == self.char
+
+    def __hash__(self):
+        return hash(self.char)
+
+def typing_stream(count):
+    text = [KeyCode(c) for c in 'the quick brown fox jumps over the lazy dog']
+    text += [Key.space, Key.shift, KeyCode('T'), Key.shift, Key.enter, Key.backspace]
+    return [text[i % len(text)] for i in range(count)]
+
+def legacy_handlers(toggle):
+    # The listener main.py used to install, minus the thread
+    mods = {'cmd': False, 'shift': False}
+    def on_press(key):
+        try:
+            if key == Key.space and mods['cmd'] and mods['shift']:
+                toggle()
+        except Exception:
+            pass
+    def on_release(key):
+        if key == Key.cmd:
+            mods['cmd'] = False
+        if key == Key.shift:
+            mods['shift'] = False
+    def on_mod(key, pressed):
+        if key == Key.cmd:
+            mods['cmd'] = pressed
+        if key == Key.shift:
+            mods['shift'] = pressed
+    return (lambda key: (on_mod(key, True), on_press(key)),
+            lambda key: (on_mod(key, False), on_release(key)))
+
+def replay(press, release, keys):
+    start = time.perf_counter()
+    for key in keys:
+        press(key)
+        release(key)
+    return time.perf_counter() - start
+
+def main():
+    keys = typing_stream(KEYSTROKES)
+    fired = []
+    press, release = legacy_handlers(lambda: fired.append(1))
+    legacy = replay(press, release, keys)
+    backend = PynputBackend(fired.append)
+    backend.grab(parse_chord('cmd+shift+space'))
+    current = replay(backend.on_press, backend.on_release, keys)
+    assert not fired
+    for name, elapsed in (('inline pynput handlers', legacy), ('PynputBackend', current)):
+        print(f"{name:24s} {elapsed / KEYSTROKES * 1e9:7.0f} ns/keystroke (press + release)")
+    print(f"{'X11Backend':24s} {0:7.0f} ns/keystroke (only grabbed chords are delivered)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Time ImageEditor operations and undo history size on 4K and 8K images
+
+Run from the repository root: ``python benchmarks/bench_image_editor.py``
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from image_editor import ImageEditor
+
+SIZES = {'4K': (3840, 2160), '8K': (7680, 4320)}
+REPEATS = 3
+
+OPERATIONS = [
+    ('brightness/contrast', lambda e: e.brightness_contrast(10, 1.1)),
+    ('levels', lambda e: e.levels(8, 248, 1.1)),
+    ('levels 512px region', lambda e: e.levels(8, 248, 1.1, region=(256, 256, 512, 512))),
+    ('blur r=2', lambda e: e.blur(2)),
+    ('sharpen', lambda e: e.sharpen(0.8)),
+    ('invert', lambda e: e.invert()),
+    ('rgb swap', lambda e: e.convert('rgb')),
+    ('rotate 90', lambda e: e.rotate(90)),
+    ('rotate 15', lambda e: e.rotate(15)),
+    ('resize 50%', lambda e: e.resize(e.size[0] // 2, e.size[1] // 2)),
+    ('crop', lambda e: e.crop(100, 100, e.size[0] // 2, e.size[1] // 2)),
+    ('gray', lambda e: e.convert('gray'))
+]
+
+def make_image(width, height):
+    # Gradient plus noise, so tiles differ and edits change real pixels
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    base = (x + y) / 2
+    image = np.stack([base, base[::-1], 255 - base], axis=2)
+    image += rng.normal(0, 8, image.shape).astype(np.float32)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+def main():
+    for label, (width, height) in SIZES.items():
+        image = make_image(width, height)
+        print(f"{label} ({width}x{height}, {image.nbytes / 1e6:.0f} MB)")
+        for name, operation in OPERATIONS:
+            best = float('inf')
+            for _ in range(REPEATS):
+                editor = ImageEditor(image.copy())
+                start = time.perf_counter()
+                operation(editor)
+                best = min(best, time.perf_counter() - start)
+            entry = editor.history.undo_stack[-1]
+            start = time.perf_counter()
+            editor.undo()
+            undo = time.perf_counter() - start
+            print(f"  {name:22s} {best * 1000:8.1f} ms  undo {undo * 1000:6.1f} ms  "
+                  f"history {entry.nbytes / 1e6:7.1f} MB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Time per nav-list mutation: full rebuild versus keyed AppNavList updates
+
+Run from the repository root: ``python benchmarks/bench_nav_list.py``
+(set ``QT_QPA_PLATFORM=offscreen`` on a headless machine).
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+from components.app_nav_button import AppNavButton
+from components.app_nav_list import AppNavList
+from components.theme import ThemeManager
+
+SIZES = [10, 100, 1000]
+MUTATIONS = 5
+
+def make_button(app_name):
+    return AppNavButton(app_name)
+
+def settle(app):
+    app.processEvents()
+
+def rebuild(nav_list, names):
+    # What refresh_navbar used to do: drop every row and create them again
+    while nav_list.layout.count():
+        widget = nav_list.layout.takeAt(0).widget()
+        if widget:
+            widget.hide()
+            widget.deleteLater()
+    nav_list.buttons.clear()
+    for app_name in names:
+        nav_list.add(app_name)
+
+def bench(app, count, incremental):
+    names = [f'TeamViewer_{i}' for i in range(count)]
+    nav_list = AppNavList(make_button)
+    nav_list.sync(names)
+    nav_list.show()
+    settle(app)
+    start = time.perf_counter()
+    for i in range(MUTATIONS):
+        # Delete one app, then add it back
+        victim = names.pop(i % len(names))
+        if incremental:
+            nav_list.remove(victim)
+        else:
+            rebuild(nav_list, names)
+        settle(app)
+        names.append(victim)
+        if incremental:
+            nav_list.add(victim)
+        else:
+            rebuild(nav_list, names)
+        settle(app)
+    elapsed = (time.perf_counter() - start) / (MUTATIONS * 2)
+    nav_list.close()
+    nav_list.deleteLater()
+    settle(app)
+    return elapsed
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    ThemeManager(app).apply('dark')
+    for count in SIZES:
+        full = bench(app, count, incremental=False)
+        keyed = bench(app, count, incremental=True)
+        print(f"{count:5d} apps: rebuild {full * 1000:9.3f} ms/mutation  "
+              f"keyed {keyed * 1000:7.3f} ms/mutation")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""OBSClient against the mock OBS server with a simulated 5 ms round trip
+
+Compares issuing N scene changes one connection per action (what a
+spawn-per-action design amounts to), one at a time on a persistent
+connection, pipelined on it, and as a single RequestBatch. Then checks
+events arrive without polling and that a request made while OBS restarts
+waits for the reconnect instead of failing.
+
+Run from the repository root: ``python benchmarks/bench_obs_client.py``
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_obs import MockOBSServer
+from obs_client import OBSClient, RequestBatch
+
+REQUESTS = 200
+LATENCY_MS = 5
+PASSWORD = 'secret'
+
+def scene(i):
+    return {'sceneName': ('Scene', 'Camera', 'Screen')[i % 3]}
+
+async def connected_client(url):
+    client = OBSClient(url, PASSWORD, reconnect_delay=0.05)
+    task = asyncio.create_task(client.run())
+    await client.wait_connected(5)
+    return client, task
+
+async def bench(label, run):
+    start = time.perf_counter()
+    count = await run()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:34s} {elapsed * 1000:8.1f} ms  {count / elapsed:8.0f} requests/s")
+
+async def main():
+    server = MockOBSServer(password=PASSWORD, latency_ms=LATENCY_MS)
+    await server.start()
+    url = f'ws://localhost:{server.port}'
+    print(f"{REQUESTS} SetCurrentProgramScene requests, {LATENCY_MS} ms simulated round trip")
+
+    async def per_connection():
+        for i in range(REQUESTS // 10):
+            client, task = await connected_client(url)
+            await client.request('SetCurrentProgramScene', scene(i))
+            await client.stop()
+            await task
+        return REQUESTS // 10
+
+    client, task = await connected_client(url)
+
+    async def sequential():
+        for i in range(REQUESTS):
+            await client.request('SetCurrentProgramScene', scene(i))
+        return REQUESTS
+
+    async def pipelined():
+        await asyncio.gather(*(client.request('SetCurrentProgramScene', scene(i)) for i in range(REQUESTS)))
+        return REQUESTS
+
+    async def batched():
+        batch = RequestBatch()
+        for i in range(REQUESTS):
+            batch.add('SetCurrentProgramScene', scene(i))
+        results = await client.batch(batch)
+        assert all(result['ok'] for result in results)
+        return REQUESTS
+
+    await bench(f'connection per request ({REQUESTS // 10})', per_connection)
+    await bench('persistent, sequential', sequential)
+    await bench('persistent, pipelined', pipelined)
+    await bench('persistent, RequestBatch', batched)
+
+    events = []
+    client.on('CurrentProgramSceneChanged', lambda event_type, data: events.append(data['sceneName']))
+    await client.request('SetCurrentProgramScene', {'sceneName': 'Screen'})
+    await asyncio.sleep(0.05)
+    print(f"  events: CurrentProgramSceneChanged -> {events}")
+
+    # OBS restarts on the same port while a request is outstanding
+    port = server.port
+    await server.stop()
+    restarted = MockOBSServer(port=port, password=PASSWORD, latency_ms=LATENCY_MS)
+    start = time.perf_counter()
+    request = asyncio.create_task(client.request('GetVersion', timeout=10))
+    await asyncio.sleep(0.3)
+    await restarted.start()
+    version = await request
+    print(f"  reconnect: request made during restart answered after {(time.perf_counter() - start) * 1000:.0f} ms "
+          f"(OBS down 300 ms) by {version['obsWebSocketVersion']}, reconnects {client.reconnects}")
+    await client.stop()
+    await task
+    await restarted.stop()
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,151 @@
+"""1000 sequential remote ``launch``/``status`` calls, pooled vs a connection per call
+
+The peer sits behind a proxy adding ``--delay`` ms each way, so each round
+trip costs what it would on a LAN. Connecting per call pays the TCP and
+WebSocket handshakes (plus TLS over wss) on every action; the PeerPool
+pays them once. Runs over ws:// and, when ``openssl`` is available to
+make a throwaway certificate, wss://. Finishes with the pool's per-peer
+figures as RemoteMenu shows them.
+
+Run from the repository root: ``python benchmarks/bench_peer_pool.py [--delay 1]``
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from control_plane import PeerPool, RPCClient, RPCServer
+
+CALLS = 1000
+
+class DelayProxy:
+    """TCP proxy delaying both directions by ``delay_ms``"""
+
+    def __init__(self, target_port: int, delay_ms: float):
+        self.target_port = target_port
+        self.delay = delay_ms / 1000
+        self.port = 0
+        self._server = None
+        self._tasks = set()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._accept, 'localhost', 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+
+    def _accept(self, client_reader, client_writer):
+        task = asyncio.ensure_future(self._handle(client_reader, client_writer))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _handle(self, client_reader, client_writer):
+        server_reader, server_writer = await asyncio.open_connection('localhost', self.target_port)
+        await asyncio.gather(self._pipe(client_reader, server_writer), self._pipe(server_reader, client_writer),
+                             return_exceptions=True)
+
+    async def _pipe(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                loop.call_later(self.delay, writer.write, data)
+        finally:
+            loop.call_later(self.delay, writer.close)
+
+def make_tls(directory):
+    """Server and client contexts for a self-signed localhost certificate, None without openssl"""
+    if not shutil.which('openssl'):
+        return None
+    cert, key = os.path.join(directory, 'cert.pem'), os.path.join(directory, 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1', '-subj', '/CN=localhost',
+                    '-addext', 'subjectAltName=DNS:localhost', '-keyout', key, '-out', cert],
+                   check=True, capture_output=True)
+    server = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server.load_cert_chain(cert, key)
+    client = ssl.create_default_context(cafile=cert)
+    return server, client
+
+def method(i):
+    return ('launch', 'status')[i % 2]
+
+async def per_call(url, client_ssl):
+    latencies = []
+    for i in range(CALLS):
+        start = time.perf_counter()
+        client = RPCClient(url, ssl=client_ssl)
+        task = asyncio.create_task(client.run())
+        await client.call(method(i), name=f'app_{i % 10}')
+        await client.stop()
+        await task
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+async def pooled(pool, url):
+    latencies = []
+    for i in range(CALLS):
+        start = time.perf_counter()
+        await pool.call(url, method(i), name=f'app_{i % 10}')
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def report(label, latencies):
+    total = sum(latencies)
+    ordered = sorted(latencies)
+    print(f"  {label:28s} {total:8.0f} ms total  mean {statistics.mean(latencies):6.2f} ms  "
+          f"p50 {ordered[len(ordered) // 2]:6.2f} ms  p99 {ordered[int(len(ordered) * 0.99)]:6.2f} ms")
+    return total
+
+async def run(scheme, delay_ms, tls):
+    statuses = {}
+
+    async def launch(name):
+        statuses[name] = 'active'
+        return statuses[name]
+
+    async def status(name):
+        return statuses.get(name, 'inactive')
+
+    server = RPCServer({'launch': launch, 'status': status}, port=0, ssl=tls[0] if tls else None)
+    await server.start()
+    proxy = DelayProxy(server.port, delay_ms)
+    await proxy.start()
+    url = f'{scheme}://localhost:{proxy.port}'
+    client_ssl = tls[1] if tls else None
+    print(f"{scheme}:// with {delay_ms:g} ms each way, {CALLS} calls alternating launch/status")
+    naive = report('connection per call', await per_call(url, client_ssl))
+    pool = PeerPool(ssl=client_ssl)
+    await pool.call(url, 'status', name='warmup')
+    fast = report('pooled', await pooled(pool, url))
+    print(f"  pooled is {naive / fast:.1f}x faster; pool figures: {pool.stats(url)}")
+    await pool.close()
+    await proxy.stop()
+    await server.stop()
+
+async def main(args):
+    await run('ws', args.delay, None)
+    directory = tempfile.mkdtemp()
+    try:
+        tls = make_tls(directory)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    if tls:
+        await run('wss', args.delay, tls)
+    else:
+        print("openssl not found, skipping wss://")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--delay', type=float, default=1.0, help="one-way delay in ms")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,105 @@
+"""Recording a 720p30 stream to disk, with a fast and a slow disk
+
+"direct" writes each frame from the capture thread, as a naive recorder
+would; a slow disk then stalls capture itself. StreamRecorder writes on its
+own thread behind a bounded queue, so capture keeps its frame rate and the
+surplus frames are skipped or dropped instead. The slow disk is simulated
+by sleeping after every real MJPG write. The last run triggers recording
+after 3 s with a 2 s pre-roll and checks the pre-roll frames were written.
+
+Run from the repository root: ``python benchmarks/bench_recorder.py``
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+from recorder import StreamRecorder
+from video_manager import SyntheticCapture, VideoManager
+
+SECONDS = 5
+SIZE = (1280, 720)
+SLOW_WRITE = 0.06
+
+class SlowWriter:
+    """cv2.VideoWriter on a disk that needs SLOW_WRITE seconds per frame"""
+
+    def __init__(self, *args):
+        self.writer = cv2.VideoWriter(*args)
+
+    def isOpened(self):
+        return self.writer.isOpened()
+
+    def write(self, image):
+        self.writer.write(image)
+        time.sleep(SLOW_WRITE)
+
+    def release(self):
+        self.writer.release()
+
+def run(mode, writer_factory, directory):
+    manager = VideoManager()
+    manager.open_stream('camera', SyntheticCapture(*SIZE, 30))
+    time.sleep(0.2)
+    if mode == 'direct':
+        writer = writer_factory(os.path.join(directory, 'direct.avi'), cv2.VideoWriter_fourcc(*'MJPG'), 30, SIZE)
+        written = 0
+
+        def sink(frame):
+            nonlocal written
+            writer.write(frame.image)
+            written += 1
+        manager.add_sink('camera', sink)
+        start = manager.get_stats('camera')['captured']
+        time.sleep(SECONDS)
+        captured = manager.get_stats('camera')['captured'] - start
+        manager.close_all()
+        writer.release()
+        stats = {'written': written, 'degraded': 0, 'dropped': 0, 'max_depth': 0, 'segments': 1}
+    else:
+        recorder = StreamRecorder('camera', directory, segment_seconds=2, writer_factory=writer_factory)
+        manager.add_sink('camera', recorder.feed)
+        start = manager.get_stats('camera')['captured']
+        recorder.start()
+        time.sleep(SECONDS)
+        captured = manager.get_stats('camera')['captured'] - start
+        manager.close_all()
+        recorder.close(timeout=30)
+        stats = recorder.get_stats()
+    print(f"  {mode:9s} capture {captured / SECONDS:5.1f} fps  written {stats['written']:4d}  "
+          f"degraded {stats['degraded']:4d}  dropped {stats['dropped']:4d}  "
+          f"queue high-water {stats['max_depth']:3d}  segments {stats['segments']}")
+
+def run_preroll(directory):
+    manager = VideoManager()
+    manager.open_stream('camera', SyntheticCapture(*SIZE, 30))
+    recorder = StreamRecorder('camera', directory, preroll_seconds=2)
+    manager.add_sink('camera', recorder.feed)
+    time.sleep(3)
+    preroll = recorder.get_stats()['preroll_frames']
+    recorder.start()
+    time.sleep(1)
+    recorder.stop()
+    manager.close_all()
+    recorder.close(timeout=30)
+    stats = recorder.get_stats()
+    capture = cv2.VideoCapture(recorder.segments[0])
+    frames = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    capture.release()
+    print(f"  pre-roll  held {preroll} frames at trigger, file has {frames} frames "
+          f"({stats['written']} written, {stats['dropped'] + stats['degraded']} skipped)")
+
+def main():
+    print(f"{SIZE[0]}x{SIZE[1]}@30 synthetic stream, MJPG, {SECONDS} s, {os.cpu_count()} cores")
+    with tempfile.TemporaryDirectory() as directory:
+        for disk, factory in (('fast disk', cv2.VideoWriter), (f'slow disk ({SLOW_WRITE * 1000:.0f} ms/frame)', SlowWriter)):
+            print(f" {disk}")
+            for mode in ('direct', 'recorder'):
+                run(mode, factory, directory)
+        run_preroll(directory)
+
+if __name__ == '__main__':
+    main()
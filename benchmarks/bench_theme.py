@@ -0,0 +1,78 @@
+"""Widget creation time for N nav buttons: inline stylesheets versus the shared theme
+
+Also times a theme switch, both by setting a new application stylesheet
+(which re-parses the sheet and re-polishes every widget) and through
+ThemeManager, which flips the windows' ``theme`` property and re-polishes
+only the widgets a theme colours.
+
+Run from the repository root: ``python benchmarks/bench_theme.py``
+(set ``QT_QPA_PLATFORM=offscreen`` on a headless machine).
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout
+from components.app_nav_button import AppNavButton
+from components.theme import STYLESHEET, THEMES, ThemeManager
+
+SIZES = [100, 300, 1000]
+
+# The per-widget strings every nav button used to set on itself
+INLINE_LABEL_STYLE = 'font-size: 13px; padding: 6px;'
+INLINE_DELETE_STYLE = '''
+    QPushButton { background: transparent; border: none; color: #e74c3c; }
+    QPushButton:hover { background: #2c3e50; }
+'''
+
+def build(app, count, inline):
+    container = QWidget()
+    layout = QVBoxLayout(container)
+    start = time.perf_counter()
+    for i in range(count):
+        button = AppNavButton(f'TeamViewer_{i}')
+        if inline:
+            button.label.setStyleSheet(INLINE_LABEL_STYLE)
+            button.delete_btn.setStyleSheet(INLINE_DELETE_STYLE)
+        layout.addWidget(button)
+    container.show()
+    app.processEvents()
+    return container, time.perf_counter() - start
+
+def close(app, container):
+    container.close()
+    container.deleteLater()
+    app.processEvents()
+
+def timed(app, switch):
+    start = time.perf_counter()
+    switch()
+    app.processEvents()
+    return time.perf_counter() - start
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    theme = ThemeManager(app)
+    sheets = {name: STYLESHEET.substitute(colours) for name, colours in THEMES.items()}
+    for count in SIZES:
+        app.setStyleSheet('')
+        theme.current = None
+        container, inline = build(app, count, inline=True)
+        close(app, container)
+        theme.apply('dark')
+        container, themed = build(app, count, inline=False)
+        switch = timed(app, lambda: theme.apply('light'))
+        close(app, container)
+        # The previous switch: one stylesheet per theme, set on the application
+        app.setStyleSheet(sheets['dark'])
+        theme.current = None
+        container, _ = build(app, count, inline=False)
+        resheet = timed(app, lambda: app.setStyleSheet(sheets['light']))
+        close(app, container)
+        print(f"{count:5d} nav buttons: inline {inline * 1000:8.1f} ms  theme {themed * 1000:8.1f} ms  "
+              f"switch: setStyleSheet {resheet * 1000:7.1f} ms  theme property {switch * 1000:7.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Loopback benchmark for the USB-over-WebSocket bridge
+
+Streams fake devices through USBBridgeServer to a USBBridgeClient on the same
+host and reports end-to-end latency and throughput for several coalescing
+settings.
+
+Run from the repository root: ``python benchmarks/bench_usb_bridge.py``
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth import ROLE_USER, TokenService
+from usb_manager import USBManager
+from usb_bridge import USBBridgeClient, USBBridgeServer
+from fake_usb import FakeDevice
+
+DURATION = 2.0
+DEVICES = 4
+RATE = 4000
+PACKET_SIZE = 512
+SETTINGS = [(0, 0), (4096, 500), (65536, 5000)]
+
+async def run(max_bytes: int, max_delay_us: int):
+    manager = USBManager()
+    for device_id in range(DEVICES):
+        manager.devices[device_id] = FakeDevice(packets_per_second=RATE, max_packet_size=PACKET_SIZE)
+    tokens = TokenService(os.urandom(32))
+    server = USBBridgeServer(manager, port=0, max_bytes=max_bytes, max_delay_us=max_delay_us, tokens=tokens)
+    await server.start()
+
+    latencies = []
+    received = [0]
+
+    def on_packet(device_id, endpoint, sequence, timestamp, payload):
+        latencies.append(time.time_ns() - timestamp)
+        received[0] += len(payload)
+
+    client = USBBridgeClient(f'ws://localhost:{server.port}', on_packet, tokens.issue('bench', ROLE_USER))
+    client_task = asyncio.create_task(client.run())
+    while not server.clients:
+        await asyncio.sleep(0.01)
+
+    for device_id in manager.devices:
+        await server.bridge_device(device_id)
+    await asyncio.sleep(DURATION)
+    await server.stop()
+    await client_task
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return quantiles[49] / 1e3, quantiles[98] / 1e3, received[0] / DURATION / 1e6, client.lost
+
+async def main():
+    print(f"{DEVICES} fake devices x {RATE} packets/s x {PACKET_SIZE} B over loopback")
+    for max_bytes, max_delay_us in SETTINGS:
+        p50, p99, mbps, lost = await run(max_bytes, max_delay_us)
+        print(f"coalesce {max_bytes:6d} B / {max_delay_us:5d} us: p50 {p50:8.0f} us  "
+              f"p99 {p99:8.0f} us  {mbps:7.2f} MB/s  {lost} lost")
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+"""Compare the per-packet callback path with the ring-buffer path of USBManager
+
+Also streams from many fake devices at once to show that the shared worker
+keeps up without a thread per device.
+
+Run from the repository root: ``python benchmarks/bench_usb_streaming.py``
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from usb_manager import USBManager
+from fake_usb import FakeDevice
+
+DURATION = 2.0
+RATE = 8000
+MANY_DEVICES = 30
+MANY_RATE = 500
+
+async def run(buffered: bool, device_count: int, rate: int):
+    manager = USBManager()
+    devices = [FakeDevice(packets_per_second=rate) for _ in range(device_count)]
+    for device_id, device in enumerate(devices):
+        manager.devices[device_id] = device
+    received = [0, 0]
+
+    def on_packet(data):
+        received[0] += 1
+        received[1] += len(data)
+
+    def on_batch(batch, timestamps):
+        received[0] += len(batch)
+        received[1] += sum(len(view) for view in batch)
+
+    for device_id in manager.devices:
+        if buffered:
+            await manager.start_buffered_streaming(device_id, on_batch)
+        else:
+            await manager.start_streaming(device_id, on_packet)
+    await asyncio.sleep(DURATION)
+    threads = threading.active_count()
+    for device_id in manager.devices:
+        await manager.stop_streaming(device_id)
+    dropped = sum(device.dropped for device in devices)
+    return received[0] / DURATION, received[1] / DURATION, dropped, threads
+
+def report(name, result):
+    packets, nbytes, dropped, threads = result
+    print(f"{name:>12}: {packets:10.0f} packets/s {nbytes / 1e6:8.3f} MB/s "
+          f"{dropped:8d} dropped {threads:3d} threads")
+
+async def main():
+    print(f"1 fake device producing {RATE} packets/s for {DURATION:.0f}s")
+    for name, buffered in (('callback', False), ('ring buffer', True)):
+        report(name, await run(buffered, 1, RATE))
+    print(f"{MANY_DEVICES} fake devices producing {MANY_RATE} packets/s each")
+    for name, buffered in (('callback', False), ('ring buffer', True)):
+        report(name, await run(buffered, MANY_DEVICES, MANY_RATE))
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+"""Latest-frame slots versus a frame queue with a consumer slower than the cameras
+
+Four synthetic 1080p30 streams are consumed by a display loop running at
+about 20 fps. With VideoManager the consumer always gets the newest frame,
+so latency stays flat and the surplus frames are counted as dropped. With
+an unbounded FIFO per stream, as a naive capture loop would use, the
+backlog and latency grow for as long as the run lasts.
+
+Run from the repository root: ``python benchmarks/bench_video_manager.py``
+"""
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_manager import SyntheticCapture, VideoManager
+
+STREAMS = 4
+SECONDS = 5
+DISPLAY_INTERVAL = 0.05
+
+def consume(read, names):
+    # The display loop: pick up one frame per stream, then "paint" for a while
+    latencies = []
+    end = time.monotonic() + SECONDS
+    while time.monotonic() < end:
+        for name in names:
+            captured_ns = read(name)
+            if captured_ns is not None:
+                latencies.append((time.monotonic_ns() - captured_ns) / 1e6)
+        time.sleep(DISPLAY_INTERVAL)
+    return latencies
+
+def bench_slots():
+    manager = VideoManager()
+    names = [f'camera_{i}' for i in range(STREAMS)]
+    for name in names:
+        manager.open_stream(name, SyntheticCapture(1920, 1080, 30))
+    last = dict.fromkeys(names, 0)
+
+    def read(name):
+        frame = manager.latest_frame(name, last[name])
+        if frame is None:
+            return None
+        last[name] = frame.seq
+        manager.mark_displayed(name, frame)
+        return frame.captured_ns
+
+    latencies = consume(read, names)
+    stats = manager.all_stats()
+    manager.close_all()
+    return latencies, sum(s['dropped'] for s in stats.values()), 0, stats
+
+def bench_queue():
+    names = [f'camera_{i}' for i in range(STREAMS)]
+    queues = {name: queue.Queue() for name in names}
+    running = True
+
+    def capture(name):
+        source = SyntheticCapture(1920, 1080, 30)
+        while running:
+            ok, image = source.read()
+            queues[name].put((image, time.monotonic_ns()))
+
+    threads = [threading.Thread(target=capture, args=(name,), daemon=True) for name in names]
+    for thread in threads:
+        thread.start()
+
+    def read(name):
+        try:
+            return queues[name].get_nowait()[1]
+        except queue.Empty:
+            return None
+
+    latencies = consume(read, names)
+    running = False
+    backlog = sum(q.qsize() for q in queues.values())
+    return latencies, 0, backlog, None
+
+def main():
+    print(f"{STREAMS} x 1080p30 synthetic streams, display loop every {DISPLAY_INTERVAL * 1000:.0f} ms, {SECONDS} s")
+    for name, bench in (('latest-frame slots', bench_slots), ('FIFO queues', bench_queue)):
+        latencies, dropped, backlog, stats = bench()
+        tail = latencies[-STREAMS * 5:]
+        print(f"  {name:20s} displayed {len(latencies):4d}  dropped {dropped:4d}  backlog {backlog:4d} frames "
+              f"({backlog * 1920 * 1080 * 3 / 1e6:6.0f} MB)  latency at end {sum(tail) / len(tail):7.1f} ms")
+        if stats:
+            for stream, values in stats.items():
+                print(f"    {stream}: {values}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Nine 1080p30 sources shown as 320x180 tiles: VideoRenderer versus QPixmap per frame
+
+"naive" converts every new full-size frame to a QImage, then a QPixmap,
+then scales it, all on the UI thread. VideoRenderer scales on workers into
+reused buffers, wraps them as QImage views and repaints once per refresh.
+A third run puts the grid in a scroll area showing only its first row.
+
+UI lag is how late a 5 ms probe timer fires, i.e. how long the UI thread
+stays busy between events.
+
+Run from the repository root: ``python benchmarks/bench_video_tiles.py``
+(set ``QT_QPA_PLATFORM=offscreen`` on a headless machine).
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QTimer, Qt
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtWidgets import QApplication, QLabel, QScrollArea
+from components.tile_grid import TileGrid
+from components.video_tile import VideoRenderer, VideoTile
+from video_manager import SyntheticCapture, VideoManager
+
+SOURCES = 9
+SECONDS = 5
+TILE_SIZE = (320, 180)
+
+class LagProbe:
+    def __init__(self, interval_ms=5):
+        self.interval = interval_ms / 1000
+        self.samples = []
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.sample)
+        self.last = time.perf_counter()
+        self.timer.start(interval_ms)
+
+    def sample(self):
+        now = time.perf_counter()
+        self.samples.append(max(now - self.last - self.interval, 0) * 1000)
+        self.last = now
+
+def run(app, mode):
+    manager = VideoManager()
+    names = [f'camera_{i}' for i in range(SOURCES)]
+    for name in names:
+        manager.open_stream(name, SyntheticCapture(1920, 1080, 30))
+    grid = TileGrid(columns=3)
+    grid.resize(TILE_SIZE[0] * 3 + 40, TILE_SIZE[1] * 3 + 40)
+    timers = []
+    renderer = None
+    if mode == 'naive':
+        last = dict.fromkeys(names, 0)
+        labels = {}
+        for name in names:
+            label = QLabel()
+            label.setFixedSize(*TILE_SIZE)
+            labels[name] = label
+            grid.add_tile(name, label)
+
+        def tick():
+            for name, label in labels.items():
+                frame = manager.latest_frame(name, last[name])
+                if frame is None:
+                    continue
+                last[name] = frame.seq
+                image = frame.image
+                qimage = QImage(image.data, image.shape[1], image.shape[0], image.strides[0], QImage.Format_BGR888)
+                label.setPixmap(QPixmap.fromImage(qimage).scaled(label.size(), Qt.KeepAspectRatio))
+                manager.mark_displayed(name, frame)
+        timer = QTimer()
+        timer.timeout.connect(tick)
+        timer.start(16)
+        timers.append(timer)
+    else:
+        renderer = VideoRenderer(manager, workers=2)
+        for i, name in enumerate(names):
+            tile = VideoTile(name)
+            tile.setFixedSize(*TILE_SIZE)
+            grid.add_tile(name, tile)
+            renderer.add_tile(tile)
+    window = grid
+    if mode == 'renderer, 6 scrolled':
+        window = QScrollArea()
+        window.setWidget(grid)
+        window.resize(grid.width() + 20, TILE_SIZE[1] + 20)
+    window.show()
+    probe = LagProbe()
+    cpu_start = time.process_time()
+    end = time.perf_counter() + SECONDS
+    while time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.001)
+    cpu = (time.process_time() - cpu_start) / SECONDS * 100
+    probe.timer.stop()
+    for timer in timers:
+        timer.stop()
+    stats = manager.all_stats()
+    if renderer:
+        renderer.stop()
+    manager.close_all()
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    shown = [s for s in stats.values() if s['displayed']]
+    fps = sum(s['displayed'] for s in shown) / SECONDS / max(len(shown), 1)
+    latency = sum(s['latency_ms'] for s in shown) / max(len(shown), 1)
+    samples = sorted(probe.samples)
+    p99 = samples[int(len(samples) * 0.99)] if samples else 0
+    print(f"  {mode:20s} {len(shown)} tiles at {fps:5.1f} fps  latency {latency:6.1f} ms  "
+          f"UI lag avg {sum(samples) / max(len(samples), 1):5.1f} ms p99 {p99:5.1f} ms  CPU {cpu:5.0f}%")
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"{SOURCES} x 1080p30 synthetic sources, {TILE_SIZE[0]}x{TILE_SIZE[1]} tiles, {SECONDS} s, "
+          f"{os.cpu_count()} cores")
+    for mode in ('naive', 'renderer', 'renderer, 6 scrolled'):
+        run(app, mode)
+
+if __name__ == '__main__':
+    main()
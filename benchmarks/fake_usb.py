@@ -0,0 +1,66 @@
+import array
+import errno
+import time
+
+import usb.core
+
+class FakeEndpoint:
+    def __init__(self, address=0x81, max_packet_size=64):
+        self.bEndpointAddress = address
+        self.wMaxPacketSize = max_packet_size
+
+class _Descriptor:
+    def __init__(self, children):
+        self.children = children
+
+    def __getitem__(self, index):
+        return self.children[0]
+
+class FakeDevice:
+    """Stand-in for ``usb.core.Device`` that produces packets at a fixed rate
+
+    Packets that are not read before the device FIFO fills up are dropped,
+    which is how a real HID/bulk endpoint overflows when the host falls behind.
+    """
+
+    def __init__(self, packets_per_second=8000, max_packet_size=64, fifo_depth=16):
+        self.idVendor = 0x1234
+        self.idProduct = 0x5678
+        self.iManufacturer = 0  # no string descriptors
+        self.iProduct = 0
+        self.bus = 1
+        self.address = 1
+        self.endpoint = FakeEndpoint(max_packet_size=max_packet_size)
+        self.interval = 1.0 / packets_per_second
+        self.fifo_depth = fifo_depth
+        self.payload = bytes(range(max_packet_size % 256)) + bytes(max(0, max_packet_size - 256))
+        self.started = None
+        self.consumed = 0
+        self.dropped = 0
+
+    def set_configuration(self):
+        self.started = time.perf_counter()
+
+    def __getitem__(self, index):
+        # device[0] -> configuration, [(0, 0)] -> interface, [0] -> endpoint
+        return _Descriptor([_Descriptor([self.endpoint])])
+
+    def read(self, endpoint, size_or_buffer, timeout=None):
+        produced = int((time.perf_counter() - self.started) / self.interval)
+        backlog = produced - self.consumed - self.dropped
+        if backlog > self.fifo_depth:
+            self.dropped += backlog - self.fifo_depth
+        elif backlog <= 0:
+            due = self.started + (self.consumed + self.dropped + 1) * self.interval
+            delay = due - time.perf_counter()
+            if timeout and delay > timeout / 1000:
+                time.sleep(timeout / 1000)
+                raise usb.core.USBTimeoutError('Operation timed out', errno=errno.ETIMEDOUT)
+            if delay > 0:
+                time.sleep(delay)
+        self.consumed += 1
+        if isinstance(size_or_buffer, array.array):
+            length = len(self.payload)
+            size_or_buffer[:length] = array.array('B', self.payload)
+            return length
+        return array.array('B', self.payload)
@@ -0,0 +1,163 @@
+"""Minimal OBS WebSocket v5 server for exercising obs_client without OBS
+
+Implements Hello/Identify (with optional password), single requests,
+RequestBatch and the events for the state it models: scenes, input mute
+and the stream output. ``latency_ms`` delays every response as a network
+round trip would, without serialising requests, so pipelining shows up.
+
+Run on its own to point the overlay at it:
+``python benchmarks/mock_obs.py --port 4455 [--password secret]``
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import websockets
+from obs_client import (OP_EVENT, OP_HELLO, OP_IDENTIFIED, OP_IDENTIFY, OP_REQUEST, OP_REQUEST_BATCH,
+                        OP_REQUEST_BATCH_RESPONSE, OP_REQUEST_RESPONSE, RPC_VERSION, STATUS_OUTPUT_RUNNING,
+                        STATUS_SUCCESS, auth_response)
+
+# OBS status codes used below
+STATUS_UNKNOWN_REQUEST = 204
+STATUS_OUTPUT_NOT_RUNNING = 501
+STATUS_RESOURCE_NOT_FOUND = 600
+CLOSE_AUTH_FAILED = 4009
+
+class MockOBSServer:
+    def __init__(self, host='localhost', port=0, password=None, latency_ms=0.0, scenes=('Scene', 'Camera', 'Screen')):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.latency = latency_ms / 1000
+        self.scenes = list(scenes)
+        self.current_scene = self.scenes[0]
+        self.muted = {'Mic/Aux': False, 'Desktop Audio': False}
+        self.streaming = False
+        self.requests = 0
+        self.clients = set()
+        self._server = None
+
+    async def start(self):
+        self._server = await websockets.serve(self._handle, self.host, self.port,
+                                              subprotocols=['obswebsocket.json'], compression=None)
+        self.port = next(iter(self._server.sockets)).getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, websocket):
+        salt, challenge = 'mocksalt', base64.b64encode(os.urandom(16)).decode()
+        hello = {'obsWebSocketVersion': '5.0.0-mock', 'rpcVersion': RPC_VERSION}
+        if self.password:
+            hello['authentication'] = {'salt': salt, 'challenge': challenge}
+        await websocket.send(json.dumps({'op': OP_HELLO, 'd': hello}))
+        identify = json.loads(await websocket.recv())
+        if identify['op'] != OP_IDENTIFY:
+            return
+        if self.password and identify['d'].get('authentication') != auth_response(self.password, salt, challenge):
+            await websocket.close(CLOSE_AUTH_FAILED, 'Authentication failed.')
+            return
+        await websocket.send(json.dumps({'op': OP_IDENTIFIED, 'd': {'negotiatedRpcVersion': RPC_VERSION}}))
+        self.clients.add(websocket)
+        try:
+            async for message in websocket:
+                message = json.loads(message)
+                asyncio.get_running_loop().call_later(self.latency, self._respond, websocket, message)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.clients.discard(websocket)
+
+    def _respond(self, websocket, message):
+        op, data = message['op'], message['d']
+        if op == OP_REQUEST:
+            response = {'requestId': data['requestId'], **self._execute(data)}
+            reply = {'op': OP_REQUEST_RESPONSE, 'd': response}
+        elif op == OP_REQUEST_BATCH:
+            results = []
+            for request in data['requests']:
+                result = self._execute(request)
+                results.append(result)
+                if data.get('haltOnFailure') and not result['requestStatus']['result']:
+                    break
+            reply = {'op': OP_REQUEST_BATCH_RESPONSE, 'd': {'requestId': data['requestId'], 'results': results}}
+        else:
+            return
+        asyncio.ensure_future(self._send(websocket, reply))
+
+    async def _send(self, websocket, message):
+        try:
+            await websocket.send(json.dumps(message))
+        except websockets.ConnectionClosed:
+            pass
+
+    def _execute(self, request):
+        self.requests += 1
+        request_type = request['requestType']
+        params = request.get('requestData') or {}
+        code, data = STATUS_SUCCESS, None
+        if request_type == 'GetVersion':
+            data = {'obsVersion': '30.0.0', 'obsWebSocketVersion': '5.0.0-mock', 'rpcVersion': RPC_VERSION}
+        elif request_type == 'GetSceneList':
+            data = {'currentProgramSceneName': self.current_scene,
+                    'scenes': [{'sceneName': name, 'sceneIndex': i} for i, name in enumerate(self.scenes)]}
+        elif request_type == 'SetCurrentProgramScene':
+            if params.get('sceneName') not in self.scenes:
+                code = STATUS_RESOURCE_NOT_FOUND
+            else:
+                self.current_scene = params['sceneName']
+                self.emit('CurrentProgramSceneChanged', {'sceneName': self.current_scene})
+        elif request_type in ('GetInputMute', 'SetInputMute', 'ToggleInputMute'):
+            name = params.get('inputName')
+            if name not in self.muted:
+                code = STATUS_RESOURCE_NOT_FOUND
+            else:
+                if request_type != 'GetInputMute':
+                    self.muted[name] = params['inputMuted'] if request_type == 'SetInputMute' else not self.muted[name]
+                    self.emit('InputMuteStateChanged', {'inputName': name, 'inputMuted': self.muted[name]})
+                data = {'inputMuted': self.muted[name]}
+        elif request_type in ('StartStream', 'StopStream'):
+            starting = request_type == 'StartStream'
+            if self.streaming == starting:
+                code = STATUS_OUTPUT_RUNNING if starting else STATUS_OUTPUT_NOT_RUNNING
+            else:
+                self.streaming = starting
+                self.emit('StreamStateChanged', {
+                    'outputActive': starting,
+                    'outputState': 'OBS_WEBSOCKET_OUTPUT_STARTED' if starting else 'OBS_WEBSOCKET_OUTPUT_STOPPED'
+                })
+        elif request_type == 'GetStreamStatus':
+            data = {'outputActive': self.streaming}
+        else:
+            code = STATUS_UNKNOWN_REQUEST
+        result = {'requestType': request_type, 'requestStatus': {'result': code == STATUS_SUCCESS, 'code': code}}
+        if data is not None:
+            result['responseData'] = data
+        return result
+
+    def emit(self, event_type, data):
+        message = json.dumps({'op': OP_EVENT, 'd': {'eventType': event_type, 'eventIntent': 1, 'eventData': data}})
+        websockets.broadcast(self.clients, message)
+
+async def serve(args):
+    server = MockOBSServer(args.host, args.port, args.password, args.latency)
+    await server.start()
+    print(f"Mock OBS listening on ws://{args.host}:{server.port}")
+    await asyncio.Future()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Mock OBS WebSocket v5 server")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=4455)
+    parser.add_argument('--password')
+    parser.add_argument('--latency', type=float, default=0.0, help="response delay in ms")
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
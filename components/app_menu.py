@@ -6,25 +6,13 @@ class AppMenu(QWidget):
         super().__init__(parent)
         layout = QVBoxLayout(self)
         self.add_app_button = QPushButton("+ Add App")
-        self.add_app_button.setStyleSheet('''
-            QPushButton {
-                background-color: #23272e;
-                color: #67c1f5;
-                border: none;
-                font-size: 13px;
-                padding: 8px 0;
-                border-radius: 0 8px 8px 0;
-            }
-            QPushButton:hover {
-                background-color: #2c3e50;
-            }
-        ''')
+        self.add_app_button.setObjectName('addAppButton')
         self.add_app_button.setFixedHeight(36)
         self.add_app_button.clicked.connect(add_app_callback)
         layout.addWidget(self.add_app_button)
         sep = QFrame()
         sep.setFrameShape(QFrame.HLine)
-        sep.setStyleSheet('color: #23272e; background: #23272e; margin: 8px 0;')
+        sep.setObjectName('menuSeparator')
         layout.addWidget(sep)
         layout.addWidget(app_nav_container)
         layout.addStretch() 
\ No newline at end of file
@@ -2,6 +2,9 @@ from PySide6.QtWidgets import QWidget, QHBoxLayout, QPushButton, QLabel
 from PySide6.QtCore import Qt, Signal, QEvent
 from PySide6.QtGui import QIcon
 
+# Marks shown in front of an app's name in the nav list
+STATUS_PREFIXES = {'active': '▶ ', 'streaming': '● ', 'crashed': '⚠ '}
+
 class AppNavButton(QWidget):
     launchRequested = Signal(str)
     deleteRequested = Signal(str)
@@ -21,19 +24,21 @@ class AppNavButton(QWidget):
             self.label.setText(f' {app_name}')
         else:
             self.label.setText(app_name)
-        self.label.setStyleSheet('font-size: 13px; padding: 6px;')
+        # Styled by the application theme (components/theme.py)
+        self.label.setObjectName('navLabel')
         layout.addWidget(self.label)
         self.delete_btn = QPushButton('✕')
         self.delete_btn.setFixedSize(24, 24)
-        self.delete_btn.setStyleSheet('''
-            QPushButton { background: transparent; border: none; color: #e74c3c; }
-            QPushButton:hover { background: #2c3e50; }
-        ''')
+        self.delete_btn.setObjectName('navDeleteButton')
         self.delete_btn.clicked.connect(self.on_delete)
         layout.addWidget(self.delete_btn)
         self.setLayout(layout)
         self.setAttribute(Qt.WA_Hover)
         self.installEventFilter(self)
+    def set_status(self, status):
+        prefix = STATUS_PREFIXES.get(status, '')
+        self.label.setText(f'{prefix}{self.app_name}')
+        self.label.setToolTip(f'Status: {status}')
     def on_delete(self):
         if self.delete_callback:
             self.delete_callback(self.app_name)
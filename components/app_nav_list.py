@@ -0,0 +1,52 @@
+from typing import Callable, Dict, Iterable
+from PySide6.QtWidgets import QWidget, QVBoxLayout
+
+class AppNavList(QWidget):
+    """Nav rows keyed by app name, updated in place instead of rebuilt
+
+    ``make_button(app_name)`` creates the row widget for an app. Adding or
+    removing an app only touches that row.
+    """
+
+    def __init__(self, make_button: Callable[[str], QWidget], parent=None):
+        super().__init__(parent)
+        self.make_button = make_button
+        self.buttons: Dict[str, QWidget] = {}
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.layout.setSpacing(0)
+
+    def add(self, app_name: str) -> QWidget:
+        """Append a row for ``app_name`` unless it already has one"""
+        if app_name in self.buttons:
+            return self.buttons[app_name]
+        button = self.make_button(app_name)
+        self.layout.addWidget(button)
+        self.buttons[app_name] = button
+        return button
+
+    def remove(self, app_name: str) -> bool:
+        """Drop the row for ``app_name``"""
+        button = self.buttons.pop(app_name, None)
+        if not button:
+            return False
+        self.layout.removeWidget(button)
+        button.hide()
+        button.deleteLater()
+        return True
+
+    def sync(self, app_names: Iterable[str]):
+        """Bring the rows in line with ``app_names``, touching only the differences"""
+        app_names = list(app_names)
+        wanted = set(app_names)
+        self.setUpdatesEnabled(False)
+        try:
+            for app_name in [name for name in self.buttons if name not in wanted]:
+                self.remove(app_name)
+            for index, app_name in enumerate(app_names):
+                if app_name not in self.buttons:
+                    button = self.make_button(app_name)
+                    self.layout.insertWidget(index, button)
+                    self.buttons[app_name] = button
+        finally:
+            self.setUpdatesEnabled(True)
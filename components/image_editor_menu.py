@@ -0,0 +1,137 @@
+import json
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QGridLayout, QLabel,
+                               QPushButton, QFileDialog, QMessageBox, QSlider)
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QPixmap
+from edit_graph import EditGraph
+
+class ImageEditorMenu(QWidget):
+    """Sidebar page building an EditGraph
+
+    Buttons append nodes and Undo/Redo remove and re-add the last one. The
+    sliders drive a single adjustment node, so moving them only re-renders
+    the nodes after it, at proxy resolution. Save exports at full size.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.graph = None
+        self.adjust_node = None
+        self.redo_stack = []
+        layout = QVBoxLayout(self)
+        self.preview = QLabel("<b>Image Editor</b><br>Open an image to start")
+        self.preview.setAlignment(Qt.AlignCenter)
+        self.preview.setMinimumHeight(140)
+        layout.addWidget(self.preview)
+
+        self.brightness = self.add_slider(layout, "Brightness", -100, 100, 0)
+        self.contrast = self.add_slider(layout, "Contrast", 20, 300, 100)
+
+        actions = [
+            ("Open", self.open_image),
+            ("Save", self.save_image),
+            ("Rotate", lambda: self.add_edit('rotate', angle=90)),
+            ("Flip", lambda: self.add_edit('flip')),
+            ("Levels", lambda: self.add_edit('levels', black=16, white=240)),
+            ("Invert", lambda: self.add_edit('invert')),
+            ("Blur", lambda: self.add_edit('blur', radius=2)),
+            ("Sharpen", lambda: self.add_edit('sharpen', amount=0.8)),
+            ("Gray", lambda: self.add_edit('convert', mode='gray')),
+            ("Half size", lambda: self.add_edit('scale', factor=0.5)),
+            ("Undo", self.undo),
+            ("Redo", self.redo),
+            ("Save recipe", self.save_recipe)
+        ]
+        grid = QGridLayout()
+        for i, (text, handler) in enumerate(actions):
+            button = QPushButton(text)
+            button.clicked.connect(handler)
+            grid.addWidget(button, i // 2, i % 2)
+        layout.addLayout(grid)
+        layout.addStretch()
+
+    def add_slider(self, layout, text, minimum, maximum, value):
+        layout.addWidget(QLabel(text))
+        slider = QSlider(Qt.Horizontal)
+        slider.setRange(minimum, maximum)
+        slider.setValue(value)
+        slider.valueChanged.connect(self.adjust)
+        layout.addWidget(slider)
+        return slider
+
+    def open_image(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Image", "", "Images (*.png *.jpg *.jpeg *.bmp *.tif *.tiff)")
+        if not path:
+            return
+        try:
+            self.graph = EditGraph.open(path)
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", str(e))
+            return
+        self.adjust_node = None
+        self.redo_stack = []
+        self.update_preview()
+
+    def save_image(self):
+        if not self.graph:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Save Image", "", "Images (*.png *.jpg *.bmp *.tif)")
+        if path and not self.graph.save(path):
+            QMessageBox.warning(self, "Error", "Could not save the image")
+
+    def save_recipe(self):
+        # The edit chain as JSON, for batch_render.py
+        if not self.graph:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Save Recipe", "", "Recipes (*.json)")
+        if not path:
+            return
+        try:
+            with open(path, 'w') as f:
+                json.dump(self.graph.recipe(), f, indent=4)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Error", str(e))
+
+    def add_edit(self, op, **params):
+        if not self.graph:
+            return
+        self.graph.add(op, **params)
+        self.redo_stack = []
+        self.update_preview()
+
+    def adjust(self):
+        if not self.graph:
+            return
+        params = {'brightness': self.brightness.value(), 'contrast': self.contrast.value() / 100}
+        if self.adjust_node in self.graph.nodes:
+            self.graph.set_params(self.adjust_node, **params)
+        else:
+            self.adjust_node = self.graph.add('brightness_contrast', **params)
+        self.update_preview()
+
+    def undo(self):
+        if not self.graph:
+            return
+        node = self.graph.nodes[self.graph.tail]
+        if self.graph.remove(node.id):
+            self.redo_stack.append((node.op, node.params))
+            self.update_preview()
+
+    def redo(self):
+        if self.graph and self.redo_stack:
+            op, params = self.redo_stack.pop()
+            node_id = self.graph.add(op, **params)
+            if op == 'brightness_contrast':
+                self.adjust_node = node_id
+            self.update_preview()
+
+    def update_preview(self):
+        image = self.graph.render()
+        h, w = image.shape[:2]
+        fmt = QImage.Format_Grayscale8 if image.ndim == 2 else QImage.Format_BGR888
+        qimage = QImage(image.data, w, h, image.strides[0], fmt)
+        # fromImage copies, so the pixmap does not outlive the array's buffer
+        pixmap = QPixmap.fromImage(qimage).scaled(
+            self.preview.width(), self.preview.minimumHeight(), Qt.KeepAspectRatio, Qt.SmoothTransformation
+        )
+        self.preview.setPixmap(pixmap)
@@ -0,0 +1,25 @@
+from typing import Callable, Dict
+from PySide6.QtWidgets import QStackedWidget, QWidget
+
+class LazyStackedWidget(QStackedWidget):
+    """QStackedWidget whose pages can be built the first time they are shown"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._factories: Dict[QWidget, Callable[[], QWidget]] = {}
+
+    def add_lazy_page(self, factory: Callable[[], QWidget]) -> int:
+        """Reserve a page slot; ``factory`` runs on the first switch to it"""
+        placeholder = QWidget()
+        self._factories[placeholder] = factory
+        return self.addWidget(placeholder)
+
+    def setCurrentIndex(self, index: int):
+        placeholder = self.widget(index)
+        factory = self._factories.pop(placeholder, None)
+        if factory:
+            page = factory()
+            self.insertWidget(index, page)
+            self.removeWidget(placeholder)
+            placeholder.deleteLater()
+        super().setCurrentIndex(index)
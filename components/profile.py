@@ -1,6 +1,8 @@
+import time
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton
 from PySide6.QtCore import Qt, QSize
 from PySide6.QtGui import QIcon
+from auth import tokens
 
 class ProfileDialog(QDialog):
     def __init__(self, parent=None):
@@ -8,10 +10,11 @@ class ProfileDialog(QDialog):
         self.setWindowTitle("Profile Information")
         self.setFixedSize(250, 150)
         layout = QVBoxLayout(self)
-        # Mock data
-        layout.addWidget(QLabel("<b>Username:</b> johndoe"))
-        layout.addWidget(QLabel("<b>Email:</b> johndoe@example.com"))
-        layout.addWidget(QLabel("<b>Role:</b> Admin"))
+        claims = tokens.session_claims() or {}
+        expires = time.strftime('%H:%M', time.localtime(claims['exp'])) if claims else '-'
+        layout.addWidget(QLabel(f"<b>Username:</b> {claims.get('sub', '-')}"))
+        layout.addWidget(QLabel(f"<b>Role:</b> {claims.get('role', '-').capitalize()}"))
+        layout.addWidget(QLabel(f"<b>Session expires:</b> {expires}"))
         layout.addStretch()
         close_btn = QPushButton("Close")
         close_btn.clicked.connect(self.accept)
@@ -29,9 +32,6 @@ def create_profile_button(parent, on_click):
         btn.setIcon(QIcon.fromTheme('user-identity') or QIcon())
     btn.setIconSize(QSize(28, 28))
     btn.setFixedSize(36, 36)
-    btn.setStyleSheet('''
-        QPushButton { background: transparent; border: none; }
-        QPushButton:hover { background: #e0e0e0; }
-    ''')
+    btn.setObjectName('profileButton')
     btn.clicked.connect(on_click)
     return btn 
\ No newline at end of file
@@ -1,11 +1,115 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
+                               QListWidget, QListWidgetItem)
+from PySide6.QtCore import Qt, QTimer
+from components.app_nav_button import STATUS_PREFIXES
+
+DEFAULT_REMOTE_URL = 'ws://localhost:8780'
+STATS_INTERVAL_MS = 1000
 
 class RemoteMenu(QWidget):
+    """Apps of another overlay, mirrored live over its control channel
+
+    Rows are updated in place from the peer's change events; the list is
+    only rebuilt after a full resync. Below the status line the pooled
+    connection's RTT and in-flight calls refresh once a second.
+    """
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.remote = None
+        self.items = {}
         layout = QVBoxLayout(self)
-        label = QLabel("<b>Remote PC Menu (Mock)</b>")
-        label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(label)
-        layout.addStretch() 
\ No newline at end of file
+        connect_row = QHBoxLayout()
+        self.url_edit = QLineEdit(DEFAULT_REMOTE_URL)
+        self.url_edit.returnPressed.connect(self.connect_remote)
+        connect_btn = QPushButton("Connect")
+        connect_btn.clicked.connect(self.connect_remote)
+        connect_row.addWidget(self.url_edit)
+        connect_row.addWidget(connect_btn)
+        layout.addLayout(connect_row)
+        self.token_edit = QLineEdit()
+        self.token_edit.setPlaceholderText("Access token (default: this session)")
+        self.token_edit.setEchoMode(QLineEdit.Password)
+        self.token_edit.returnPressed.connect(self.connect_remote)
+        layout.addWidget(self.token_edit)
+        self.status_label = QLabel("Not connected")
+        self.status_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.status_label)
+        self.stats_label = QLabel("")
+        self.stats_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.stats_label)
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.update_stats)
+        self.app_list = QListWidget()
+        layout.addWidget(self.app_list)
+        actions = QHBoxLayout()
+        launch_btn = QPushButton("Launch")
+        launch_btn.clicked.connect(lambda: self.call_selected('launch'))
+        remove_btn = QPushButton("Remove")
+        remove_btn.clicked.connect(lambda: self.call_selected('remove'))
+        actions.addWidget(launch_btn)
+        actions.addWidget(remove_btn)
+        layout.addLayout(actions)
+
+    def connect_remote(self):
+        # The control modules (and msgpack) load on first use
+        from control_plane import RemoteControl
+        if self.remote:
+            self.remote.stop()
+            self.remote.deleteLater()
+        self.remote = RemoteControl(self.url_edit.text().strip(), self, token=self.token_edit.text().strip() or None)
+        self.remote.connectionChanged.connect(self.on_connection_changed)
+        self.remote.error.connect(self.status_label.setText)
+        self.remote.appsReset.connect(self.on_apps_reset)
+        self.remote.appChanged.connect(self.on_app_changed)
+        self.remote.appRemoved.connect(self.on_app_removed)
+        self.status_label.setText("Connecting...")
+        self.update_stats()
+        self.stats_timer.start(STATS_INTERVAL_MS)
+
+    def on_connection_changed(self, connected):
+        self.status_label.setText(f"Connected to {self.remote.url}" if connected else "Reconnecting...")
+
+    def update_stats(self):
+        stats = self.remote.stats() if self.remote else None
+        if not stats:
+            self.stats_label.setText("")
+            return
+        rtt = f"{stats['rtt_ms']:.1f} ms" if stats['rtt_ms'] is not None else "-"
+        self.stats_label.setText(
+            f"RTT {rtt} · {stats['in_flight']} in flight · "
+            f"{stats['connected']}/{stats['connections']} connections · {stats['reconnects']} reconnects"
+        )
+
+    def on_apps_reset(self):
+        self.app_list.clear()
+        self.items.clear()
+        for name, app in self.remote.apps.items():
+            self.on_app_changed(name, app)
+
+    def on_app_changed(self, name, app):
+        item = self.items.get(name)
+        if item is None:
+            item = QListWidgetItem()
+            item.setData(Qt.UserRole, name)
+            self.app_list.addItem(item)
+            self.items[name] = item
+        item.setText(f"{STATUS_PREFIXES.get(app['status'], '')}{name}")
+        item.setToolTip(f"{app['type']} - status: {app['status']}")
+
+    def on_app_removed(self, name):
+        item = self.items.pop(name, None)
+        if item is not None:
+            self.app_list.takeItem(self.app_list.row(item))
+
+    def call_selected(self, method):
+        item = self.app_list.currentItem()
+        if not self.remote or item is None:
+            return
+        name = item.data(Qt.UserRole)
+
+        def on_done(future):
+            error = future.exception()
+            if error:
+                self.status_label.setText(f"{method} {name} failed: {error}")
+        self.remote.call(method, callback=on_done, name=name)
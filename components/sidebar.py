@@ -1,8 +1,9 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QStackedWidget, QPushButton
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton
 from PySide6.QtCore import Qt, Signal
 from components.profile import create_profile_button, ProfileDialog
 from components.app_menu import AppMenu
 from components.remote_menu import RemoteMenu
+from components.lazy_stack import LazyStackedWidget
 
 class Sidebar(QWidget):
     add_app_requested = Signal()
@@ -32,22 +33,18 @@ class Sidebar(QWidget):
         layout.addLayout(toggle_row)
 
         # Stacked menus
-        self.stacked = QStackedWidget()
+        self.stacked = LazyStackedWidget()
         self.app_menu = AppMenu(self.add_app_requested.emit, app_nav_container, app_nav_layout)
-        self.remote_menu = RemoteMenu()
         self.stacked.addWidget(self.app_menu)
-        self.stacked.addWidget(self.remote_menu)
+        # The remote menu is built the first time it is opened
+        self.stacked.add_lazy_page(RemoteMenu)
         layout.addWidget(self.stacked)
         layout.addStretch()
 
     def _make_toggle_btn(self, text):
         btn = QPushButton(text)
         btn.setCheckable(True)
-        btn.setStyleSheet('''
-            QPushButton { background: #23272e; color: #67c1f5; border: none; font-size: 13px; padding: 8px 0; border-radius: 8px; }
-            QPushButton:checked { background: #67c1f5; color: #23272e; }
-            QPushButton:hover { background: #2c3e50; }
-        ''')
+        btn.setObjectName('menuToggle')
         btn.setFixedHeight(32)
         return btn
 
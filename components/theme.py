@@ -0,0 +1,200 @@
+import re
+from string import Template
+from typing import Dict, List, Optional, Set
+from PySide6.QtWidgets import QProxyStyle, QWidget
+
+# Colour tokens per theme; the stylesheet below only refers to these names
+THEMES: Dict[str, Dict[str, str]] = {
+    'dark': {
+        'panel': '#23272e',
+        'accent': '#67c1f5',
+        'hover': '#2c3e50',
+        'nav_text': '#d6d6d6',
+        'nav_text_active': '#fff',
+        'danger': '#e74c3c',
+        'danger_hover': '#c0392b',
+        'tile': 'white',
+        'tile_border': '#cccccc',
+        'tile_button': '#2c3e50',
+        'tile_button_hover': '#34495e',
+        'tile_button_text': 'white',
+        'muted': '#666',
+        'icon_hover': '#e0e0e0',
+        'error': 'red'
+    },
+    'light': {
+        'panel': '#eef1f5',
+        'accent': '#1a73e8',
+        'hover': '#dde3ec',
+        'nav_text': '#2c3e50',
+        'nav_text_active': '#000',
+        'danger': '#d93025',
+        'danger_hover': '#b3261e',
+        'tile': 'white',
+        'tile_border': '#d0d7de',
+        'tile_button': '#1a73e8',
+        'tile_button_hover': '#1765cc',
+        'tile_button_text': 'white',
+        'muted': '#5f6368',
+        'icon_hover': '#dde3ec',
+        'error': '#d93025'
+    }
+}
+
+# Every styled widget is matched by object name, so one sheet covers the app
+STYLESHEET = Template('''
+    QPushButton#profileButton { background: transparent; border: none; }
+    QPushButton#profileButton:hover { background: $icon_hover; }
+
+    QPushButton#menuToggle { background: $panel; color: $accent; border: none; font-size: 13px; padding: 8px 0; border-radius: 8px; }
+    QPushButton#menuToggle:checked { background: $accent; color: $panel; }
+    QPushButton#menuToggle:hover { background: $hover; }
+
+    QPushButton#recordButton:checked { background: $danger; color: white; }
+
+    QPushButton#addAppButton {
+        background-color: $panel;
+        color: $accent;
+        border: none;
+        font-size: 13px;
+        padding: 8px 0;
+        border-radius: 0 8px 8px 0;
+    }
+    QPushButton#addAppButton:hover { background-color: $hover; }
+    QFrame#menuSeparator { color: $panel; background: $panel; margin: 8px 0; }
+
+    QPushButton#navButton {
+        background-color: transparent;
+        color: $nav_text;
+        border: none;
+        text-align: left;
+        padding: 8px 12px;
+        font-size: 13px;
+        border-radius: 4px;
+    }
+    QPushButton#navButton:checked, QPushButton#navButton:hover {
+        background-color: $panel;
+        color: $nav_text_active;
+    }
+    QPushButton#navDeleteButton { background: transparent; border: none; color: $danger; }
+    QPushButton#navDeleteButton:hover { background: $hover; }
+    QLabel#navLabel { font-size: 13px; padding: 6px; }
+
+    QFrame#appWindow {
+        background-color: $tile;
+        border: 1px solid $tile_border;
+        border-radius: 5px;
+        margin: 2px;
+        padding: 5px;
+    }
+    QFrame#appWindow QPushButton {
+        background-color: $tile_button;
+        color: $tile_button_text;
+        border: none;
+        padding: 3px;
+        border-radius: 3px;
+        min-height: 20px;
+        max-height: 20px;
+    }
+    QFrame#appWindow QPushButton:hover { background-color: $tile_button_hover; }
+    QFrame#appWindow QPushButton#closeButton {
+        background-color: $danger;
+        min-width: 16px;
+        max-width: 16px;
+        min-height: 16px;
+        max-height: 16px;
+        border-radius: 8px;
+        font-size: 12px;
+    }
+    QFrame#appWindow QPushButton#closeButton:hover { background-color: $danger_hover; }
+    QFrame#appWindow QLabel { font-size: 11px; }
+    QLabel#appWindowTitle { font-weight: bold; }
+    QLabel#appWindowType { color: $muted; }
+
+    QLabel#errorLabel { color: $error; }
+''')
+
+# A rule is "selectors { declarations }"; the sheet has no nested blocks
+RULE = re.compile(r'([^{}]+)\{([^{}]*)\}')
+
+def scoped(sheet: str, name: str) -> str:
+    """``sheet`` with every selector limited to windows whose ``theme`` property is ``name``"""
+    rules = []
+    for selectors, declarations in RULE.findall(sheet):
+        scoped_selectors = ', '.join(f'*[theme="{name}"] {selector.strip()}' for selector in selectors.split(','))
+        rules.append(f'{scoped_selectors} {{{declarations}}}')
+    return '\n'.join(rules)
+
+def themed_names(template: Template) -> Set[str]:
+    """Object names in the selectors of rules that use a colour token"""
+    names = set()
+    for selectors, declarations in RULE.findall(template.template):
+        if '$' in declarations:
+            names.update(re.findall(r'#(\w+)', selectors))
+    return names
+
+class ThemeStyle(QProxyStyle):
+    """Tags each window with the current theme as it is first polished"""
+
+    def __init__(self, theme: str):
+        super().__init__()
+        self.theme = theme
+
+    def polish(self, target):
+        if isinstance(target, QWidget) and target.isWindow() and target.property('theme') != self.theme:
+            target.setProperty('theme', self.theme)
+        return super().polish(target)
+
+class ThemeManager:
+    """Applies one application-wide stylesheet holding every theme
+
+    Widgets only carry object names; how they look is kept here, filled in
+    from the THEMES colour tokens. The sheet is compiled and installed once,
+    each theme's rules scoped by a ``theme`` property on the window, so a
+    switch only flips that property and re-polishes the widgets whose
+    rules use a colour token rather than re-parsing the sheet for every
+    widget.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.current: Optional[str] = None
+        self.style: Optional[ThemeStyle] = None
+        self._compiled: Optional[str] = None
+        self._themed = themed_names(STYLESHEET)
+
+    def stylesheet(self) -> str:
+        if self._compiled is None:
+            self._compiled = '\n'.join(scoped(STYLESHEET.substitute(colours), name)
+                                       for name, colours in THEMES.items())
+        return self._compiled
+
+    def apply(self, name: str) -> bool:
+        """Switch the application to theme ``name``"""
+        if name not in THEMES:
+            return False
+        if name == self.current:
+            return True
+        self.current = name
+        if self.style is None or self.app.styleSheet() != self.stylesheet():
+            self.style = ThemeStyle(name)
+            self.app.setStyle(self.style)
+            self.app.setStyleSheet(self.stylesheet())
+            return True
+        self.style.theme = name
+        for window in self.app.topLevelWidgets():
+            window.setProperty('theme', name)
+            for widget in self.themed_widgets(window):
+                widget.style().unpolish(widget)
+                widget.style().polish(widget)
+        return True
+
+    def themed_widgets(self, window: QWidget) -> List[QWidget]:
+        """Widgets in ``window`` that a theme colours, with their descendants"""
+        found = {}
+        for name in self._themed:
+            for widget in window.findChildren(QWidget, name):
+                found[id(widget)] = widget
+                for child in widget.findChildren(QWidget):
+                    found[id(child)] = child
+        return list(found.values())
@@ -0,0 +1,106 @@
+from typing import Dict, List, Optional
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QWidget, QGridLayout
+
+class TileGrid(QWidget):
+    """Grid of keyed tiles that only moves the tiles it has to
+
+    Removing a tile shifts just the tiles after it, inside one
+    ``setUpdatesEnabled(False)`` block. Tiles outside the visible area
+    (e.g. scrolled away in a QScrollArea) are hidden while keeping their
+    cell, so they are neither painted nor updated until scrolled back in.
+    """
+
+    # Extra pixels above and below the viewport kept visible while scrolling
+    VISIBILITY_MARGIN = 200
+
+    def __init__(self, columns: int = 2, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.order: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.tiles: Dict[str, QWidget] = {}
+        self.layout = QGridLayout(self)
+        self.layout.setSpacing(5)
+        self.layout.setContentsMargins(5, 5, 5, 5)
+        self._visibility_pending = False
+
+    def add_tile(self, key: str, tile: QWidget) -> bool:
+        """Append ``tile`` after the existing ones"""
+        if key in self.tiles:
+            return False
+        policy = tile.sizePolicy()
+        policy.setRetainSizeWhenHidden(True)
+        tile.setSizePolicy(policy)
+        index = len(self.order)
+        self.order.append(key)
+        self.positions[key] = index
+        self.tiles[key] = tile
+        self.layout.addWidget(tile, index // self.columns, index % self.columns)
+        self.schedule_visibility_update()
+        return True
+
+    def remove_tile(self, key: str) -> Optional[QWidget]:
+        """Take a tile out of the grid and return it; the caller owns its disposal"""
+        tile = self.tiles.pop(key, None)
+        if tile is None:
+            return None
+        index = self.positions.pop(key)
+        del self.order[index]
+        self.setUpdatesEnabled(False)
+        try:
+            self.layout.removeWidget(tile)
+            self._place(index)
+        finally:
+            self.setUpdatesEnabled(True)
+        self.schedule_visibility_update()
+        return tile
+
+    def set_columns(self, columns: int):
+        """Reflow every tile into ``columns`` columns"""
+        if columns == self.columns:
+            return
+        self.columns = columns
+        self.setUpdatesEnabled(False)
+        try:
+            self._place(0)
+        finally:
+            self.setUpdatesEnabled(True)
+        self.schedule_visibility_update()
+
+    def _place(self, start: int):
+        # Re-seat tiles from ``start`` on; their parent never changes
+        for index in range(start, len(self.order)):
+            key = self.order[index]
+            tile = self.tiles[key]
+            self.positions[key] = index
+            self.layout.removeWidget(tile)
+            self.layout.addWidget(tile, index // self.columns, index % self.columns)
+
+    def schedule_visibility_update(self):
+        """Recompute which tiles are on screen once control returns to the event loop"""
+        if not self._visibility_pending:
+            self._visibility_pending = True
+            QTimer.singleShot(0, self._update_visibility)
+
+    def _update_visibility(self):
+        self._visibility_pending = False
+        visible = self.visibleRegion().boundingRect()
+        if visible.isEmpty():
+            return
+        visible.adjust(0, -self.VISIBILITY_MARGIN, 0, self.VISIBILITY_MARGIN)
+        for tile in self.tiles.values():
+            tile.setVisible(tile.geometry().intersects(visible))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_visibility_update()
+
+    def moveEvent(self, event):
+        # A QScrollArea scrolls by moving its widget
+        super().moveEvent(event)
+        self.schedule_visibility_update()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.schedule_visibility_update()
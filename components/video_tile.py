@@ -0,0 +1,166 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+import cv2
+import numpy as np
+from PySide6.QtCore import QObject, QPointF, QRectF, QSizeF, QTimer, Qt, Signal
+from PySide6.QtGui import QGuiApplication, QImage, QPainter
+from PySide6.QtWidgets import QWidget
+
+def scale_frame(frame, size: Tuple[int, int], spare: Optional[np.ndarray], interpolation: int = cv2.INTER_LINEAR):
+    """Fit ``frame.image`` into ``size`` (device pixels); runs on a worker thread
+
+    Frames already small enough are returned as-is. Otherwise the result
+    is written into ``spare`` when it has the right shape, so steady-state
+    playback allocates nothing.
+    """
+    image = frame.image
+    h, w = image.shape[:2]
+    scale = min(size[0] / w, size[1] / h, 1.0)
+    if scale >= 1.0:
+        # QImage needs one contiguous buffer to wrap
+        return frame, np.ascontiguousarray(image), False
+    out_w, out_h = max(int(w * scale), 1), max(int(h * scale), 1)
+    shape = (out_h, out_w) + image.shape[2:]
+    if spare is None or spare.shape != shape:
+        spare = np.empty(shape, dtype=np.uint8)
+    cv2.resize(image, (out_w, out_h), dst=spare, interpolation=interpolation)
+    return frame, spare, True
+
+class VideoTile(QWidget):
+    """Paints the latest frame of one VideoManager stream
+
+    The displayed QImage is a view over the NumPy buffer (no copy), which
+    the tile keeps alive for as long as the QImage is in use.
+    """
+
+    def __init__(self, stream_name: str, parent=None):
+        super().__init__(parent)
+        self.stream_name = stream_name
+        self.renderer: Optional['VideoRenderer'] = None
+        self.last_seq = 0
+        self.job: Optional[Future] = None
+        self._buffer: Optional[np.ndarray] = None
+        self._owned = False
+        self._spare: Optional[np.ndarray] = None
+        self._image: Optional[QImage] = None
+        self._frame = None
+        self._painted_seq = 0
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.setMinimumSize(160, 90)
+
+    def on_screen(self) -> bool:
+        """False while hidden, scrolled away, covered or in a minimized window"""
+        if not self.isVisible():
+            return False
+        window = self.window()
+        if window.isMinimized():
+            return False
+        return not self.visibleRegion().isEmpty()
+
+    def target_size(self) -> Tuple[int, int]:
+        ratio = self.devicePixelRatioF()
+        return max(int(self.width() * ratio), 1), max(int(self.height() * ratio), 1)
+
+    def spare_buffer(self) -> Optional[np.ndarray]:
+        spare, self._spare = self._spare, None
+        return spare
+
+    def show_frame(self, frame, buffer: np.ndarray, owned: bool):
+        """Swap in a scaled frame; the previous buffer becomes the next spare"""
+        if self._owned and self._buffer is not buffer:
+            self._spare = self._buffer
+        self._buffer = buffer
+        self._owned = owned
+        self._frame = frame
+        h, w = buffer.shape[:2]
+        fmt = QImage.Format_Grayscale8 if buffer.ndim == 2 else QImage.Format_BGR888
+        self._image = QImage(buffer.data, w, h, buffer.strides[0], fmt)
+        self._image.setDevicePixelRatio(self.devicePixelRatioF())
+        self.update()
+
+    def clear(self):
+        self._image = None
+        self._buffer = None
+        self._spare = None
+        self._frame = None
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.black)
+        if self._image is None:
+            return
+        # Fits the image into the tile; when the worker scaled it to the
+        # tile's size this is a 1:1 blit
+        target = self._image.deviceIndependentSize().scaled(QSizeF(self.size()), Qt.KeepAspectRatio)
+        origin = QPointF((self.width() - target.width()) / 2, (self.height() - target.height()) / 2)
+        painter.drawImage(QRectF(origin, target), self._image)
+        painter.end()
+        if self.renderer and self._frame is not None and self._frame.seq != self._painted_seq:
+            self._painted_seq = self._frame.seq
+            self.renderer.video_manager.mark_displayed(self.stream_name, self._frame)
+
+class VideoRenderer(QObject):
+    """Feeds VideoTiles from a VideoManager at most once per display refresh
+
+    Each refresh, every tile that is on screen and not already waiting on a
+    worker hands its stream's newest frame to a worker, which downscales it
+    to the tile's on-screen size. Finished frames are queued back to the UI
+    thread and swapped in. Off-screen tiles cost nothing.
+
+    ``interpolation`` trades quality for CPU: INTER_LINEAR takes about
+    0.25 ms per 1080p frame, INTER_AREA about 4 ms but without aliasing.
+    """
+
+    _finished = Signal(object, object)
+
+    def __init__(self, video_manager, workers: int = 2, interpolation: int = cv2.INTER_LINEAR, parent=None):
+        super().__init__(parent)
+        self.video_manager = video_manager
+        self.interpolation = interpolation
+        self.tiles: Dict[int, VideoTile] = {}
+        self.pool = ThreadPoolExecutor(workers)
+        self._finished.connect(self._on_finished, Qt.QueuedConnection)
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.tick)
+        screen = QGuiApplication.primaryScreen()
+        refresh = screen.refreshRate() if screen else 60
+        self.timer.setInterval(max(int(1000 / (refresh or 60)), 1))
+
+    def add_tile(self, tile: VideoTile):
+        tile.renderer = self
+        self.tiles[id(tile)] = tile
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def remove_tile(self, tile: VideoTile):
+        self.tiles.pop(id(tile), None)
+        tile.renderer = None
+        if not self.tiles:
+            self.timer.stop()
+
+    def stop(self):
+        self.timer.stop()
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def tick(self):
+        manager = self.video_manager
+        for tile in list(self.tiles.values()):
+            if tile.job is not None or not tile.on_screen():
+                continue
+            frame = manager.latest_frame(tile.stream_name, tile.last_seq)
+            if frame is None:
+                continue
+            tile.last_seq = frame.seq
+            tile.job = self.pool.submit(scale_frame, frame, tile.target_size(), tile.spare_buffer(), self.interpolation)
+            tile.job.add_done_callback(lambda job, tile=tile: self._finished.emit(tile, job))
+
+    def _on_finished(self, tile: VideoTile, job: Future):
+        if id(tile) not in self.tiles or tile.job is not job:
+            return
+        tile.job = None
+        try:
+            tile.show_frame(*job.result())
+        except Exception as e:
+            print(f"Error scaling frame for {tile.stream_name}: {e}")
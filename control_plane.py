@@ -0,0 +1,643 @@
+import asyncio
+import concurrent.futures
+import itertools
+import time
+from ssl import SSLContext
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import msgpack
+import websockets
+from PySide6.QtCore import QObject, Qt, Signal
+import auth
+from metrics import MovingAverage
+from persistent_client import EventHandler, LoopThread, PersistentClient
+
+# Every message is one msgpack array:
+#   [REQUEST, id, method, params, token]  [RESPONSE, id, error, result]  [EVENT, name, data]
+REQUEST = 0
+RESPONSE = 1
+EVENT = 2
+
+DEFAULT_PORT = 8780
+# Built-in method: the connection that sends it receives events from then on
+SUBSCRIBE = 'subscribe'
+# Config fields that never leave this machine
+PRIVATE_CONFIG_KEYS = ('obs_password', 'stream_key')
+
+Handler = Callable[..., Awaitable[Any]]
+# Returns the claims of a token or raises auth.AuthError
+Verifier = Callable[[Optional[str]], Dict[str, Any]]
+
+def pack(message: list) -> bytes:
+    return msgpack.packb(message, use_bin_type=True)
+
+def unpack(data: bytes) -> list:
+    return msgpack.unpackb(data, raw=False)
+
+class RemoteError(Exception):
+    """A remote call the peer answered with an error"""
+
+class RPCServer:
+    """Serves ``handlers`` over WebSocket and pushes events to subscribed clients
+
+    Each request runs in its own task, so one slow call (a launch, say)
+    never holds up the others on the same connection; responses go out in
+    completion order and are matched to requests by id. ``subscribe`` is
+    handled in line, so it takes effect before any request sent after it.
+    With ``verify`` set, every request's token is checked before it is
+    handled (see TokenService.verify) and handlers get its ``claims``.
+    """
+
+    def __init__(self, handlers: Dict[str, Handler], host: str = 'localhost', port: int = DEFAULT_PORT,
+                 ssl: Optional[SSLContext] = None, verify: Optional[Verifier] = None):
+        self.handlers = handlers
+        self.host = host
+        self.port = port
+        self.ssl = ssl
+        self.verify = verify
+        self.clients = set()
+        self.subscribers = set()
+        self._server = None
+
+    async def start(self):
+        self._server = await websockets.serve(self._handle_client, self.host, self.port,
+                                              compression=None, max_size=None, ssl=self.ssl)
+        if self.port == 0:
+            self.port = next(iter(self._server.sockets)).getsockname()[1]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def publish(self, event: str, data: Any):
+        """Send an event to every subscribed client, encoding it once"""
+        websockets.broadcast(self.subscribers, pack([EVENT, event, data]))
+
+    async def _handle_client(self, websocket):
+        self.clients.add(websocket)
+        tasks = set()
+        try:
+            async for message in websocket:
+                try:
+                    kind, request_id, method, params, *token = unpack(message)
+                except (ValueError, TypeError, msgpack.UnpackException):
+                    print("Ignoring malformed control message")
+                    continue
+                params = params or {}
+                if kind != REQUEST or not isinstance(params, dict):
+                    continue
+                if self.verify:
+                    try:
+                        params['claims'] = self.verify(token[0] if token else None)
+                    except auth.AuthError as e:
+                        await websocket.send(pack([RESPONSE, request_id, f"unauthorized: {e}", None]))
+                        continue
+                if method == SUBSCRIBE:
+                    self.subscribers.add(websocket)
+                    await websocket.send(pack([RESPONSE, request_id, None, True]))
+                    continue
+                task = asyncio.create_task(self._serve(websocket, request_id, method, params))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.clients.discard(websocket)
+            self.subscribers.discard(websocket)
+            for task in tasks:
+                task.cancel()
+
+    async def _serve(self, websocket, request_id: int, method: str, params: Dict[str, Any]):
+        error = result = None
+        handler = self.handlers.get(method)
+        if handler is None:
+            error = f"unknown method {method!r}"
+        else:
+            try:
+                result = await handler(**params)
+            except TypeError as e:
+                error = f"bad parameters for {method}: {e}"
+            except auth.AuthError as e:
+                error = f"unauthorized: {e}"
+            except Exception as e:
+                print(f"Error handling control request {method}: {e}")
+                error = str(e)
+        try:
+            await websocket.send(pack([RESPONSE, request_id, error, result]))
+        except websockets.ConnectionClosed:
+            pass
+
+class RPCClient(PersistentClient):
+    """Client for RPCServer over one persistent, auto-reconnecting connection
+
+    Calls are multiplexed: each is sent at once and matched to its response
+    by id. Calls made while disconnected wait for the connection up to
+    their timeout; calls in flight when it drops fail with ConnectionError.
+    With ``subscribe`` set the client asks for events on every connect,
+    before anything else is sent. ``on('*', handler)`` receives every event.
+    ``token`` goes with every request to a server that checks them.
+    """
+
+    KIND = 'Control'
+
+    def __init__(self, url: str, request_timeout: float = 10.0,
+                 reconnect_delay: float = 0.5, max_reconnect_delay: float = 10.0,
+                 subscribe: bool = False, ssl: Optional[SSLContext] = None, token: Optional[str] = None):
+        super().__init__(url, request_timeout, reconnect_delay, max_reconnect_delay)
+        self.token = token
+        self.subscribe = subscribe
+        self.ssl = ssl
+        self.last_used = time.monotonic()
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Calls not yet answered, including those waiting for the connection"""
+        return self._in_flight
+
+    async def call(self, method: str, timeout: Optional[float] = None, **params) -> Any:
+        self.last_used = time.monotonic()
+        self._in_flight += 1
+        try:
+            error, result = await self._call(
+                lambda request_id: pack([REQUEST, request_id, method, params, self.token]), timeout
+            )
+        finally:
+            self._in_flight -= 1
+            self.last_used = time.monotonic()
+        if error is not None:
+            raise RemoteError(error)
+        return result
+
+    def _connect(self):
+        return websockets.connect(self.url, compression=None, max_size=None, ssl=self.ssl)
+
+    async def _handshake(self, websocket):
+        if self.subscribe:
+            # Id 0 is never pending, so the reply is dropped
+            await websocket.send(pack([REQUEST, 0, SUBSCRIBE, {}, self.token]))
+
+    def _dispatch(self, data: bytes):
+        message = unpack(data)
+        if message[0] == RESPONSE:
+            self._resolve(message[1], (message[2], message[3]))
+        elif message[0] == EVENT:
+            self._emit(message[1], message[2])
+
+class PeerStats:
+    """Counters for one peer of a PeerPool
+
+    ``failures`` are calls that got no answer (connection lost or timed
+    out); errors the peer returned count as answered calls.
+    """
+
+    RTT_ALPHA = 0.2
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.opened = 0
+        self.evicted = 0
+        # WebSocket ping round trip in ms
+        self.rtt = MovingAverage(self.RTT_ALPHA)
+
+class _Peer:
+    def __init__(self, url: str, token: Optional[str]):
+        self.url = url
+        self.token = token
+        self.clients: List[RPCClient] = []
+        self.runners: Dict[RPCClient, asyncio.Task] = {}
+        # The one connection that receives this peer's events
+        self.primary: Optional[RPCClient] = None
+        self.subscribers: Dict[int, Tuple[EventHandler, Optional[Callable[[bool], None]]]] = {}
+        self.stats = PeerStats()
+
+class PeerPool:
+    """Bounded pools of persistent connections, one pool per peer URL and token
+
+    Every request carries its connection's token, so callers presenting
+    different tokens to one peer get separate connections, and a new
+    token never disturbs calls made with the old one: unused
+    connections simply idle out. A call goes to the least busy
+    connection of its peer. Another one is
+    opened only while every open connection has ``max_in_flight`` calls
+    outstanding, up to ``max_connections``; each reconnects on its own
+    with exponential backoff. Every ``keepalive_interval`` seconds all
+    connections are pinged, which keeps them open through NATs, measures
+    the peer's RTT and catches dead peers, and connections idle for
+    ``idle_timeout`` are closed unless they carry event subscriptions.
+
+    Everything runs on one asyncio loop; only ``stats`` and ``connected``
+    may be called from other threads.
+    """
+
+    def __init__(self, max_connections: int = 2, max_in_flight: int = 16, idle_timeout: float = 60.0,
+                 keepalive_interval: float = 5.0, ping_timeout: float = 5.0, **client_options):
+        self.max_connections = max_connections
+        self.max_in_flight = max_in_flight
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self.ping_timeout = ping_timeout
+        self.client_options = client_options
+        self.peers: Dict[Tuple[str, Optional[str]], _Peer] = {}
+        self._subscriptions: Dict[int, _Peer] = {}
+        self._subscription_ids = itertools.count(1)
+        self._keepalive: Optional[asyncio.Task] = None
+
+    async def call(self, url: str, method: str, timeout: Optional[float] = None, token: Optional[str] = None,
+                   **params) -> Any:
+        """Call ``method`` on ``url`` over a connection presenting ``token``"""
+        peer = self._peer(url, token)
+        client = self._acquire(peer)
+        peer.stats.calls += 1
+        try:
+            return await client.call(method, timeout, **params)
+        except (ConnectionError, asyncio.TimeoutError):
+            peer.stats.failures += 1
+            raise
+
+    def subscribe(self, url: str, on_event: EventHandler,
+                  on_connection: Optional[Callable[[bool], None]] = None, token: Optional[str] = None) -> int:
+        """Receive every event from ``url``; returns an id for ``unsubscribe``
+
+        ``on_connection`` is called with True whenever the event connection
+        (re)connects, at once if it already is, and False when it drops.
+        """
+        peer = self._peer(url, token)
+        subscription_id = next(self._subscription_ids)
+        peer.subscribers[subscription_id] = (on_event, on_connection)
+        self._subscriptions[subscription_id] = peer
+        if peer.primary is None:
+            peer.primary = self._open(peer, subscribe=True)
+        elif peer.primary.connected and on_connection:
+            on_connection(True)
+        return subscription_id
+
+    def unsubscribe(self, subscription_id: int):
+        """Stop delivering events; the connection is left to idle out"""
+        peer = self._subscriptions.pop(subscription_id, None)
+        if peer:
+            peer.subscribers.pop(subscription_id, None)
+
+    def connected(self, url: str, token: Optional[str] = None) -> bool:
+        peer = self.peers.get((url, token))
+        return bool(peer) and any(client.connected for client in list(peer.clients))
+
+    def stats(self, url: str, token: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Connection, in-flight and RTT figures for ``url`` and ``token``, None if not in use"""
+        peer = self.peers.get((url, token))
+        if peer is None:
+            return None
+        clients = list(peer.clients)
+        stats = peer.stats
+        return {
+            'connections': len(clients),
+            'connected': sum(client.connected for client in clients),
+            'in_flight': sum(client.in_flight for client in clients),
+            'reconnects': sum(client.reconnects for client in clients),
+            'calls': stats.calls,
+            'failures': stats.failures,
+            'opened': stats.opened,
+            'evicted': stats.evicted,
+            # None until the first ping is answered
+            'rtt_ms': stats.rtt.value if stats.rtt.count else None,
+            'max_rtt_ms': stats.rtt.peak
+        }
+
+    async def close(self):
+        if self._keepalive:
+            self._keepalive.cancel()
+            self._keepalive = None
+        for peer in list(self.peers.values()):
+            for client in list(peer.clients):
+                await self._evict(peer, client)
+        self.peers.clear()
+        self._subscriptions.clear()
+
+    def _peer(self, url: str, token: Optional[str]) -> _Peer:
+        peer = self.peers.get((url, token))
+        if peer is None:
+            peer = self.peers[url, token] = _Peer(url, token)
+        return peer
+
+    def _acquire(self, peer: _Peer) -> RPCClient:
+        client = min(peer.clients, key=lambda client: (not client.connected, client.in_flight), default=None)
+        if client is None or (client.in_flight >= self.max_in_flight and len(peer.clients) < self.max_connections):
+            client = self._open(peer)
+        return client
+
+    def _open(self, peer: _Peer, subscribe: bool = False) -> RPCClient:
+        client = RPCClient(peer.url, subscribe=subscribe, token=peer.token, **self.client_options)
+        client.on_connection = lambda connected: self._on_connection(peer, client, connected)
+        if subscribe:
+            client.on('*', lambda event, data: self._on_event(peer, event, data))
+        peer.clients.append(client)
+        peer.runners[client] = asyncio.create_task(client.run())
+        peer.stats.opened += 1
+        if self._keepalive is None:
+            self._keepalive = asyncio.create_task(self._keep_alive())
+        return client
+
+    async def _evict(self, peer: _Peer, client: RPCClient):
+        peer.clients.remove(client)
+        if peer.primary is client:
+            peer.primary = None
+        peer.stats.evicted += 1
+        await client.stop()
+        runner = peer.runners.pop(client)
+        try:
+            await asyncio.wait_for(runner, self.ping_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            pass
+
+    def _on_connection(self, peer: _Peer, client: RPCClient, connected: bool):
+        if connected:
+            # Seed the RTT figure without waiting for the first keepalive
+            asyncio.ensure_future(self._ping(peer, client))
+        if client is not peer.primary:
+            return
+        for _, on_connection in list(peer.subscribers.values()):
+            if on_connection:
+                try:
+                    on_connection(connected)
+                except Exception as e:
+                    print(f"Error in connection handler for {peer.url}: {e}")
+
+    def _on_event(self, peer: _Peer, event: str, data: Any):
+        for on_event, _ in list(peer.subscribers.values()):
+            try:
+                on_event(event, data)
+            except Exception as e:
+                print(f"Error in control event handler for {event}: {e}")
+
+    async def _ping(self, peer: _Peer, client: RPCClient):
+        rtt_ms = await client.ping(self.ping_timeout)
+        if rtt_ms is not None:
+            peer.stats.rtt.add(rtt_ms)
+
+    def _is_idle(self, peer: _Peer, client: RPCClient, now: float) -> bool:
+        if client.in_flight or now - client.last_used < self.idle_timeout:
+            return False
+        return not (client is peer.primary and peer.subscribers)
+
+    async def _keep_alive(self):
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            now = time.monotonic()
+            pings = []
+            for key, peer in list(self.peers.items()):
+                for client in list(peer.clients):
+                    if self._is_idle(peer, client, now):
+                        await self._evict(peer, client)
+                    elif client.connected:
+                        pings.append(self._ping(peer, client))
+                if not peer.clients and not peer.subscribers and self.peers.get(key) is peer:
+                    # Also forgets tokens nobody presents any more
+                    del self.peers[key]
+            await asyncio.gather(*pings)
+
+_shared_pool: Optional[Tuple[LoopThread, PeerPool]] = None
+
+def shared_pool() -> Tuple[LoopThread, PeerPool]:
+    """The process-wide PeerPool and the loop thread it runs on"""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = (LoopThread(), PeerPool())
+    return _shared_pool
+
+def public_app(app: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of an app record safe to send to a peer"""
+    config = {key: value for key, value in app['config'].items() if key not in PRIVATE_CONFIG_KEYS}
+    return {'type': app['type'], 'config': config, 'status': app['status']}
+
+class ControlService(QObject):
+    """Exposes an AppManager to remote overlays
+
+    Methods: ``list`` (a snapshot with its version), ``add``, ``remove``,
+    ``launch`` and ``status``. Every AppManager change is pushed as an
+    ``apps_changed`` event carrying only the changed and removed apps and
+    the next version number. AppManager and ``launch`` are only touched on
+    the Qt thread; the server runs on its own loop thread. ``launch(name)``
+    must not open any UI: it raises on failure, or returns a
+    concurrent.futures.Future that does, and the caller gets the error
+    back as the call's error. Every request
+    must carry a token from ``tokens``, and its role decides which methods
+    it may call (see auth.ACTION_ROLES).
+    """
+
+    _invoke = Signal(object, object)
+
+    def __init__(self, app_manager, launch: Callable[[str], Optional[concurrent.futures.Future]],
+                 host: str = 'localhost', port: int = DEFAULT_PORT, parent=None,
+                 tokens: Optional[auth.TokenService] = None):
+        super().__init__(parent)
+        self.app_manager = app_manager
+        self.launch = launch
+        self.tokens = tokens or auth.tokens
+        self.version = 0
+        self._invoke.connect(self._run_invoke, Qt.QueuedConnection)
+        self.server = RPCServer({
+            'list': self._list,
+            'add': self._add,
+            'remove': self._remove,
+            'launch': self._launch,
+            'status': self._status
+        }, host, port, verify=self.tokens.verify)
+        self._loop: Optional[LoopThread] = None
+
+    def start(self) -> bool:
+        self._loop = LoopThread()
+        try:
+            self._loop.submit(self.server.start()).result(5)
+        except (OSError, concurrent.futures.TimeoutError) as e:
+            print(f"Error starting control service on {self.server.host}:{self.server.port}: {e}")
+            self._loop.stop()
+            self._loop = None
+            return False
+        self.app_manager.add_listener(self._on_apps_changed)
+        return True
+
+    def stop(self):
+        if not self._loop:
+            return
+        self.app_manager.remove_listener(self._on_apps_changed)
+        try:
+            self._loop.submit(self.server.stop()).result(2)
+        except concurrent.futures.TimeoutError:
+            pass
+        self._loop.stop()
+        self._loop = None
+
+    def _on_apps_changed(self, changed: List[str], removed: List[str]):
+        apps = self.app_manager.apps
+        self.version += 1
+        data = {
+            'version': self.version,
+            'changed': {name: public_app(apps[name]) for name in changed if name in apps},
+            'removed': removed
+        }
+        self._loop.loop.call_soon_threadsafe(self.server.publish, 'apps_changed', data)
+
+    async def _on_qt(self, function: Callable, *args) -> Any:
+        future = concurrent.futures.Future()
+        self._invoke.emit(lambda: function(*args), future)
+        return await asyncio.wrap_future(future)
+
+    def _run_invoke(self, function: Callable, future: concurrent.futures.Future):
+        try:
+            future.set_result(function())
+        except Exception as e:
+            future.set_exception(e)
+
+    def _snapshot(self) -> Dict[str, Any]:
+        return {
+            'version': self.version,
+            'apps': {name: public_app(app) for name, app in self.app_manager.apps.items()}
+        }
+
+    def _checked_status(self, name: str) -> str:
+        app = self.app_manager.apps.get(name)
+        if not app:
+            raise LookupError(f"no app named {name!r}")
+        return app['status']
+
+    async def _list(self, claims: Dict[str, Any]):
+        auth.require_role(claims, 'list')
+        return await self._on_qt(self._snapshot)
+
+    async def _add(self, claims: Dict[str, Any], name: str, type: str, config: Optional[Dict[str, Any]] = None):
+        return await self._on_qt(self.app_manager.add_app, name, type, config or {}, claims)
+
+    async def _remove(self, claims: Dict[str, Any], name: str):
+        return await self._on_qt(self.app_manager.remove_app, name, claims)
+
+    async def _launch(self, claims: Dict[str, Any], name: str):
+        auth.require_role(claims, 'launch')
+        await self._status(claims, name)
+        started = await self._on_qt(self.launch, name)
+        if isinstance(started, concurrent.futures.Future):
+            await asyncio.wrap_future(started)
+        return await self._status(claims, name)
+
+    async def _status(self, claims: Dict[str, Any], name: str):
+        auth.require_role(claims, 'status')
+        return await self._on_qt(self._checked_status, name)
+
+class RemoteControl(QObject):
+    """Live mirror of a peer's apps, kept current by its ``apps_changed`` events
+
+    A full ``list`` is fetched only on (re)connect or when an event's
+    version shows one was missed; otherwise each event is applied on its
+    own and reported through ``appChanged`` / ``appRemoved``. ``appsReset``
+    follows every full fetch. All signals arrive on the Qt thread.
+    Connections come from ``pool`` (the shared PeerPool by default), so
+    mirrors and calls to the same peer with the same token share them.
+    Requests carry ``token``, by default the token of this overlay's own
+    session.
+    """
+
+    connectionChanged = Signal(bool)
+    appsReset = Signal()
+    appChanged = Signal(str, object)
+    appRemoved = Signal(str)
+    # A full fetch failed, e.g. because the peer refused the token
+    error = Signal(str)
+    _connection = Signal(bool)
+    _event = Signal(object)
+    _done = Signal(object, object)
+
+    def __init__(self, url: str, parent=None, token: Optional[str] = None,
+                 pool: Optional[Tuple[LoopThread, PeerPool]] = None):
+        super().__init__(parent)
+        self.url = url
+        self.token = token or auth.tokens.session
+        self.apps: Dict[str, Dict[str, Any]] = {}
+        self.version: Optional[int] = None
+        self.snapshots = 0
+        self._buffered: List[Dict[str, Any]] = []
+        self._connection.connect(self._on_connection, Qt.QueuedConnection)
+        self._event.connect(self._on_event, Qt.QueuedConnection)
+        self._done.connect(self._on_done, Qt.QueuedConnection)
+        self._loop, self.pool = pool or shared_pool()
+        self._subscription: Optional[int] = None
+        # Both run on the pool's loop, so a stop always follows the subscribe
+        self._loop.loop.call_soon_threadsafe(self._subscribe)
+
+    @property
+    def connected(self) -> bool:
+        return self.pool.connected(self.url, self.token)
+
+    def stats(self) -> Optional[Dict[str, Any]]:
+        """The pool's figures for this peer, see PeerPool.stats"""
+        return self.pool.stats(self.url, self.token)
+
+    def call(self, method: str, callback: Optional[Callable[[concurrent.futures.Future], None]] = None,
+             **params) -> concurrent.futures.Future:
+        """Call ``method`` on the peer; ``callback(future)`` runs on the Qt thread"""
+        future = self._loop.submit(self.pool.call(self.url, method, token=self.token, **params))
+        if callback:
+            future.add_done_callback(lambda future: self._done.emit(callback, future))
+        return future
+
+    def stop(self):
+        """Stop mirroring; the pooled connections stay for other users until idle"""
+        self._loop.loop.call_soon_threadsafe(self._unsubscribe)
+
+    def _subscribe(self):
+        self._subscription = self.pool.subscribe(self.url, self._on_peer_event, self._connection.emit, self.token)
+
+    def _unsubscribe(self):
+        if self._subscription is not None:
+            self.pool.unsubscribe(self._subscription)
+            self._subscription = None
+
+    def _on_peer_event(self, event: str, data: Any):
+        if event == 'apps_changed':
+            self._event.emit(data)
+
+    def resync(self):
+        self.version = None
+        self.call('list', callback=self._on_snapshot)
+
+    def _on_connection(self, connected: bool):
+        if connected:
+            self.resync()
+        self.connectionChanged.emit(connected)
+
+    def _on_snapshot(self, future: concurrent.futures.Future):
+        try:
+            snapshot = future.result()
+        except (ConnectionError, RemoteError) as e:
+            print(f"Error listing apps on {self.url}: {e}")
+            self.error.emit(f"Listing apps failed: {e}")
+            return
+        self.snapshots += 1
+        self.apps = snapshot['apps']
+        self.version = snapshot['version']
+        self.appsReset.emit()
+        # Events may overtake the snapshot they follow
+        buffered, self._buffered = self._buffered, []
+        for data in buffered:
+            self._on_event(data)
+
+    def _on_event(self, data: Dict[str, Any]):
+        if self.version is None:
+            self._buffered.append(data)
+            return
+        if data['version'] <= self.version:
+            return
+        if data['version'] != self.version + 1:
+            # Missed an update; start over from a full snapshot
+            self.resync()
+            return
+        self.version = data['version']
+        for name in data['removed']:
+            if self.apps.pop(name, None) is not None:
+                self.appRemoved.emit(name)
+        for name, app in data['changed'].items():
+            self.apps[name] = app
+            self.appChanged.emit(name, app)
+
+    def _on_done(self, callback, future: concurrent.futures.Future):
+        callback(future)
@@ -0,0 +1,285 @@
+import argparse
+import base64
+import concurrent.futures
+import getpass
+import hashlib
+import hmac
+import json
+import math
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from PySide6.QtCore import QObject, Qt, Signal
+from app_store import write_json_atomic
+from auth import ROLE_ADMIN, ROLE_RANKS
+
+CREDENTIALS_PATH = 'credentials.json'
+SALT_BYTES = 16
+KEY_BYTES = 32
+# Cost settings: roughly 140 ms and 32 MiB per scrypt check, 250 ms per
+# PBKDF2 check on one desktop core (benchmarks/bench_credentials.py).
+# Hashes made with other settings are redone at the next successful sign-in.
+SCRYPT_N = 2 ** 15
+SCRYPT_R = 8
+SCRYPT_P = 1
+PBKDF2_ITERATIONS = 600000
+# hashlib.scrypt needs Python built against OpenSSL 1.1+
+DEFAULT_SCHEME = 'scrypt' if hasattr(hashlib, 'scrypt') else 'pbkdf2_sha256'
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+def hash_password(password: str, scheme: str = DEFAULT_SCHEME, salt: Optional[bytes] = None,
+                  **cost) -> str:
+    """Salted hash of ``password`` encoded with its scheme and cost, e.g.
+    ``scrypt$32768$8$1$<salt>$<hash>`` or ``pbkdf2_sha256$600000$<salt>$<hash>``
+
+    ``cost`` overrides the defaults: ``n``, ``r``, ``p`` for scrypt,
+    ``iterations`` for PBKDF2.
+    """
+    salt = salt or os.urandom(SALT_BYTES)
+    if scheme == 'scrypt':
+        n, r, p = cost.get('n', SCRYPT_N), cost.get('r', SCRYPT_R), cost.get('p', SCRYPT_P)
+        key = _scrypt(password, salt, n, r, p)
+    elif scheme == 'pbkdf2_sha256':
+        key = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, cost.get('iterations', PBKDF2_ITERATIONS),
+                                  KEY_BYTES)
+    else:
+        raise ValueError(f"unknown password scheme {scheme!r}")
+    return f"{_settings(scheme, **cost)}${_b64(salt)}${_b64(key)}"
+
+def _settings(scheme: str, **cost) -> str:
+    if scheme == 'scrypt':
+        return f"scrypt${cost.get('n', SCRYPT_N)}${cost.get('r', SCRYPT_R)}${cost.get('p', SCRYPT_P)}"
+    return f"{scheme}${cost.get('iterations', PBKDF2_ITERATIONS)}"
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    # OpenSSL's default memory cap (32 MiB) is just below what n=2**15, r=8 needs
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * r * n, dklen=KEY_BYTES)
+
+def check_password(password: str, encoded: str) -> bool:
+    """Whether ``password`` matches a hash from ``hash_password``; slow on purpose"""
+    scheme, *fields = encoded.split('$')
+    try:
+        if scheme == 'scrypt':
+            n, r, p, salt, key = fields
+            candidate = _scrypt(password, base64.b64decode(salt), int(n), int(r), int(p))
+        elif scheme == 'pbkdf2_sha256':
+            iterations, salt, key = fields
+            candidate = hashlib.pbkdf2_hmac('sha256', password.encode(), base64.b64decode(salt), int(iterations),
+                                            KEY_BYTES)
+        else:
+            return False
+    except ValueError:
+        return False
+    return hmac.compare_digest(candidate, base64.b64decode(key))
+
+def needs_rehash(encoded: str, scheme: str = DEFAULT_SCHEME, **cost) -> bool:
+    """Whether a stored hash uses another scheme or cost than new ones would"""
+    return encoded.rsplit('$', 2)[0] != _settings(scheme, **cost)
+
+class RateLimiter:
+    """Throttles failed sign-ins per username
+
+    The first ``free_attempts`` failures cost nothing; after that each
+    attempt must wait ``base_delay`` seconds, doubling per failure up to
+    ``max_delay``. A success, or ``forget_after`` seconds without
+    attempts, clears the name. Checked before the password is hashed, so
+    guessing cannot keep a core busy.
+    """
+
+    def __init__(self, free_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 300.0,
+                 forget_after: float = 900.0):
+        self.free_attempts = free_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.forget_after = forget_after
+        # username -> (failures, time of the last failure)
+        self.failures: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def retry_after(self, username: str) -> float:
+        """Seconds until ``username`` may try again, 0 if it may now"""
+        with self._lock:
+            failures, last = self.failures.get(username, (0, 0.0))
+        if failures < self.free_attempts:
+            return 0.0
+        delay = min(self.base_delay * 2 ** (failures - self.free_attempts), self.max_delay)
+        return max(last + delay - time.monotonic(), 0.0)
+
+    def failure(self, username: str):
+        now = time.monotonic()
+        with self._lock:
+            failures, last = self.failures.get(username, (0, now))
+            if now - last > self.forget_after:
+                failures = 0
+            self.failures[username] = (failures + 1, now)
+            if len(self.failures) > 1024:
+                self._forget(now)
+
+    def success(self, username: str):
+        with self._lock:
+            self.failures.pop(username, None)
+
+    def _forget(self, now: float):
+        for username, (_, last) in list(self.failures.items()):
+            if now - last > self.forget_after:
+                del self.failures[username]
+
+class CredentialStore:
+    """Users with salted password hashes and roles, kept in a JSON file
+
+    The file (written atomically, readable by this user only) maps each
+    username to ``{'role': ..., 'password': <hash_password output>}``.
+    An empty store is seeded with ``admin``/``admin`` so a fresh install
+    can sign in; change it with ``python credentials.py set admin``.
+    """
+
+    def __init__(self, path: str = CREDENTIALS_PATH, scheme: str = DEFAULT_SCHEME, **cost):
+        self.path = path
+        self.scheme = scheme
+        self.cost = cost
+        self.users: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        # Compared against for unknown names, so they take as long as known ones
+        self._dummy = hash_password('', scheme, **cost)
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                self.users = json.load(f)
+        except FileNotFoundError:
+            self.users = {}
+        except (OSError, ValueError) as e:
+            # Left alone rather than reseeded: nobody can sign in until it is fixed
+            print(f"Error loading credentials from {self.path}: {e}")
+            self.users = {}
+            return
+        if not self.users:
+            print(f"No users in {self.path}, adding admin/admin; change it with: python credentials.py set admin")
+            self.set_user('admin', 'admin', ROLE_ADMIN)
+
+    def set_user(self, username: str, password: str, role: str):
+        if role not in ROLE_RANKS:
+            raise ValueError(f"unknown role {role!r}")
+        record = {'role': role, 'password': hash_password(password, self.scheme, **self.cost)}
+        with self._lock:
+            self.users[username] = record
+            write_json_atomic(self.path, self.users)
+
+    def remove_user(self, username: str) -> bool:
+        with self._lock:
+            if self.users.pop(username, None) is None:
+                return False
+            write_json_atomic(self.path, self.users)
+        return True
+
+    def verify(self, username: str, password: str) -> Optional[str]:
+        """The user's role if the password matches, else None; takes one slow hash either way"""
+        record = self.users.get(username)
+        if not check_password(password, record['password'] if record else self._dummy) or not record:
+            return None
+        if needs_rehash(record['password'], self.scheme, **self.cost):
+            # The cost settings changed since this hash was made
+            self.set_user(username, password, record['role'])
+        return record['role']
+
+class Authenticator(QObject):
+    """Checks passwords against a CredentialStore off the Qt thread
+
+    ``authenticate`` returns at once; the hash runs on one worker thread,
+    so sign-in never blocks the event loop and attempts never take more
+    than one core. ``callback(role, error)`` runs on the Qt thread with
+    the role on success, or None and a message. A name that is throttled
+    (see RateLimiter) or already being checked is refused without hashing.
+    """
+
+    _done = Signal(object, object, object)
+
+    def __init__(self, store: Optional[CredentialStore] = None, limiter: Optional[RateLimiter] = None, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.limiter = limiter or RateLimiter()
+        self.checked = 0
+        self._pending = set()
+        self._pool = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='credentials')
+        self._done.connect(self._on_done, Qt.QueuedConnection)
+
+    def authenticate(self, username: str, password: str, callback: Callable[[Optional[str], Optional[str]], None]):
+        key = username.strip().lower()
+        wait = self.limiter.retry_after(key)
+        if wait > 0:
+            callback(None, f"Too many attempts, try again in {math.ceil(wait)} s.")
+            return
+        if key in self._pending:
+            callback(None, "Already signing in.")
+            return
+        self._pending.add(key)
+        future = self._pool.submit(self._verify, username, password)
+        future.add_done_callback(lambda future: self._done.emit(key, callback, future))
+
+    def warm_up(self):
+        """Load the store on the worker now, e.g. while the sign-in dialog opens"""
+        self._pool.submit(self._load)
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _load(self) -> CredentialStore:
+        # On the worker: loading hashes once, and may hash the seed account
+        if self.store is None:
+            self.store = CredentialStore()
+        return self.store
+
+    def _verify(self, username: str, password: str) -> Optional[str]:
+        return self._load().verify(username, password)
+
+    def _on_done(self, key: str, callback, future: concurrent.futures.Future):
+        self._pending.discard(key)
+        self.checked += 1
+        try:
+            role = future.result()
+        except Exception as e:
+            print(f"Error checking credentials: {e}")
+            callback(None, "Sign-in failed, see the log.")
+            return
+        if role:
+            self.limiter.success(key)
+            callback(role, None)
+        else:
+            self.limiter.failure(key)
+            callback(None, "Invalid username or password.")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the overlay's sign-in users")
+    parser.add_argument('--file', default=CREDENTIALS_PATH)
+    commands = parser.add_subparsers(dest='command', required=True)
+    set_user = commands.add_parser('set', help="add a user or change their password and role")
+    set_user.add_argument('username')
+    set_user.add_argument('--role', choices=sorted(ROLE_RANKS), default=None, help="default: keep, or user")
+    remove = commands.add_parser('remove', help="delete a user")
+    remove.add_argument('username')
+    commands.add_parser('list', help="show users and roles")
+    args = parser.parse_args(argv)
+    store = CredentialStore(args.file)
+    if args.command == 'list':
+        for username, record in store.users.items():
+            print(f"{username}\t{record['role']}\t{record['password'].split('$', 1)[0]}")
+    elif args.command == 'remove':
+        if not store.remove_user(args.username):
+            print(f"No user named {args.username}")
+            return 1
+    else:
+        password = getpass.getpass(f"Password for {args.username}: ")
+        if password != getpass.getpass("Again: "):
+            print("Passwords do not match")
+            return 1
+        role = args.role or store.users.get(args.username, {}).get('role', 'user')
+        store.set_user(args.username, password, role)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
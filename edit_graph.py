@@ -0,0 +1,265 @@
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+import image_editor
+
+Params = Dict[str, object]
+
+def _scale(*names: str) -> Callable[[Params, float], Params]:
+    # Pixel-valued parameters shrink with the proxy; the rest are unchanged
+    def scale(params: Params, factor: float) -> Params:
+        scaled = dict(params)
+        for name in names:
+            if name in scaled:
+                scaled[name] = int(round(scaled[name] * factor))
+        return scaled
+    return scale
+
+def _blend(base: np.ndarray, layer: np.ndarray, alpha: float = 0.5) -> np.ndarray:
+    if base.shape != layer.shape:
+        raise ValueError("blend needs inputs of the same size and channels")
+    return cv2.addWeighted(base, 1 - alpha, layer, alpha, 0)
+
+def _scale_by(image: np.ndarray, factor: float) -> np.ndarray:
+    height, width = image.shape[:2]
+    return image_editor.resize(image, round(width * factor), round(height * factor))
+
+# op name -> (function(*inputs, **params) returning a new array, proxy param scaler)
+OPERATIONS: Dict[str, Tuple[Callable[..., np.ndarray], Optional[Callable[[Params, float], Params]]]] = {
+    'brightness_contrast': (image_editor.brightness_contrast, None),
+    'levels': (image_editor.levels, None),
+    'invert': (image_editor.invert, None),
+    'blur': (image_editor.blur, _scale('radius')),
+    'sharpen': (image_editor.sharpen, _scale('radius')),
+    'flip': (image_editor.flip, None),
+    'swap_rb': (image_editor.swap_rb, None),
+    'crop': (image_editor.crop, _scale('x', 'y', 'w', 'h')),
+    'resize': (image_editor.resize, _scale('width', 'height')),
+    'scale': (_scale_by, None),
+    'rotate': (image_editor.rotate, None),
+    'convert': (image_editor.convert, None),
+    'blend': (_blend, None)
+}
+
+class LRUCache:
+    """Arrays keyed by anything hashable, evicted least recently used past ``max_bytes``"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: 'OrderedDict[object, np.ndarray]' = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key) -> Optional[np.ndarray]:
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value: np.ndarray):
+        if value.nbytes > self.max_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= old.nbytes
+        self.entries[key] = value
+        self.nbytes += value.nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+
+class Node:
+    def __init__(self, node_id: int, op: str, inputs: List[int], params: Params):
+        self.id = node_id
+        self.op = op
+        self.inputs = inputs
+        self.params = params
+        self.key: Optional[int] = None
+
+class EditGraph:
+    """Non-destructive edits as a DAG over one source image
+
+    Each node applies an operation from OPERATIONS to the outputs of its
+    input nodes. A node's cache key is derived from its op, params and its
+    inputs' keys, so changing a parameter gives that node and everything
+    downstream new keys while upstream results stay cached. Outputs live in
+    an LRU cache with a byte budget.
+
+    ``render()`` evaluates at proxy resolution (longest side ``proxy_size``)
+    for live preview; ``export()`` evaluates at full resolution. Cached
+    arrays are shared and must not be modified by callers.
+    """
+
+    SOURCE = 0
+    # Interned signatures kept before the first prune
+    MIN_PRUNE = 1024
+
+    def __init__(self, source: np.ndarray, cache_bytes: int = 512 * 1024 * 1024, proxy_size: int = 1024):
+        if source.dtype != np.uint8:
+            raise ValueError("EditGraph expects a uint8 image")
+        self.source = source
+        self.cache = LRUCache(cache_bytes)
+        self.nodes: Dict[int, Node] = {self.SOURCE: Node(self.SOURCE, 'source', [], {})}
+        self.tail = self.SOURCE
+        self._next_id = 1
+        # Interned signatures; pruned to the keys still in use as it grows
+        self._keys: Dict[tuple, int] = {}
+        self._next_key = 0
+        self._prune_at = self.MIN_PRUNE
+        self.proxy_size = proxy_size
+        height, width = source.shape[:2]
+        self.proxy_factor = min(1.0, proxy_size / max(height, width))
+        self._proxy = None
+
+    @classmethod
+    def open(cls, path: str, **kwargs) -> 'EditGraph':
+        return cls(image_editor.read_image(path), **kwargs)
+
+    @classmethod
+    def from_recipe(cls, source: np.ndarray, recipe: List[Params], **kwargs) -> 'EditGraph':
+        """Graph with one node per ``{'op': ..., **params}`` step, chained in order"""
+        graph = cls(source, **kwargs)
+        for step in recipe:
+            params = dict(step)
+            graph.add(params.pop('op'), **params)
+        return graph
+
+    def recipe(self, node_id: Optional[int] = None) -> List[Params]:
+        """The chain of steps leading to ``node_id`` (default: the tail), for from_recipe"""
+        steps = []
+        node = self.nodes[self.tail if node_id is None else node_id]
+        while node.id != self.SOURCE:
+            if len(node.inputs) != 1:
+                raise ValueError(f"{node.op} joins branches and cannot be saved as a recipe")
+            steps.append({'op': node.op, **node.params})
+            node = self.nodes[node.inputs[0]]
+        return steps[::-1]
+
+    def add(self, op: str, *inputs: int, **params) -> int:
+        """Append a node; with no inputs it takes the current tail. Returns its id"""
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {op}")
+        inputs = list(inputs) or [self.tail]
+        for node_id in inputs:
+            if node_id not in self.nodes:
+                raise KeyError(node_id)
+        node = Node(self._next_id, op, inputs, params)
+        self._next_id += 1
+        self.nodes[node.id] = node
+        self.tail = node.id
+        return node.id
+
+    def set_params(self, node_id: int, **params):
+        """Update a node's parameters; only it and its downstream nodes re-render"""
+        node = self.nodes[node_id]
+        node.params = {**node.params, **params}
+        self._invalidate(node_id)
+
+    def remove(self, node_id: int) -> bool:
+        """Drop a node nothing else depends on, e.g. to undo the last edit"""
+        if node_id == self.SOURCE or node_id not in self.nodes:
+            return False
+        if any(node_id in node.inputs for node in self.nodes.values()):
+            return False
+        node = self.nodes.pop(node_id)
+        if self.tail == node_id:
+            self.tail = node.inputs[0]
+        return True
+
+    def downstream(self, node_id: int) -> List[int]:
+        """``node_id`` and every node that depends on it"""
+        found = [node_id]
+        seen = {node_id}
+        for node in sorted(self.nodes.values(), key=lambda n: n.id):
+            # Inputs always have smaller ids, so one ordered pass suffices
+            if node.id not in seen and any(i in seen for i in node.inputs):
+                seen.add(node.id)
+                found.append(node.id)
+        return found
+
+    def render(self, node_id: Optional[int] = None) -> np.ndarray:
+        """Proxy-resolution output of ``node_id`` (default: the tail)"""
+        return self._evaluate(self.tail if node_id is None else node_id, proxy=True)
+
+    def export(self, node_id: Optional[int] = None) -> np.ndarray:
+        """Full-resolution output of ``node_id`` (default: the tail)"""
+        return self._evaluate(self.tail if node_id is None else node_id, proxy=False)
+
+    def save(self, path: str, node_id: Optional[int] = None) -> bool:
+        return cv2.imwrite(path, self.export(node_id))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.cache.hits,
+            'misses': self.cache.misses,
+            'evictions': self.cache.evictions,
+            'entries': len(self.cache.entries),
+            'bytes': self.cache.nbytes
+        }
+
+    def _invalidate(self, node_id: int):
+        for affected in self.downstream(node_id):
+            self.nodes[affected].key = None
+
+    def _key(self, node: Node) -> int:
+        if node.key is None:
+            # Interned so keys stay flat ints however deep the graph is
+            signature = (node.op, tuple(sorted(node.params.items())),
+                         tuple(self._key(self.nodes[i]) for i in node.inputs))
+            key = self._keys.get(signature)
+            if key is None:
+                # Never reused, so a pruned key cannot alias a live one
+                key = self._keys[signature] = self._next_key
+                self._next_key += 1
+                if len(self._keys) > self._prune_at:
+                    self._prune_keys(key)
+            node.key = key
+        return node.key
+
+    def _prune_keys(self, keep: int):
+        # Every parameter change interns new signatures; drop those no node or
+        # cache entry refers to any more. Rescheduled at twice the survivors,
+        # so the cost per new key stays constant.
+        live = {node.key for node in self.nodes.values()}
+        live.update(key for key, _ in self.cache.entries)
+        live.add(keep)
+        self._keys = {signature: key for signature, key in self._keys.items() if key in live}
+        self._prune_at = max(self.MIN_PRUNE, 2 * len(self._keys))
+
+    def _evaluate(self, node_id: int, proxy: bool) -> np.ndarray:
+        node = self.nodes[node_id]
+        if node.id == self.SOURCE:
+            return self._proxy_source() if proxy else self.source
+        cache_key = (self._key(node), proxy)
+        output = self.cache.get(cache_key)
+        if output is not None:
+            return output
+        function, scale = OPERATIONS[node.op]
+        params = node.params
+        if proxy and scale and self.proxy_factor < 1:
+            params = scale(params, self.proxy_factor)
+        output = function(*[self._evaluate(i, proxy) for i in node.inputs], **params)
+        self.cache.put(cache_key, output)
+        return output
+
+    def _proxy_source(self) -> np.ndarray:
+        if self._proxy is None:
+            if self.proxy_factor < 1:
+                height, width = self.source.shape[:2]
+                self._proxy = image_editor.resize(
+                    self.source, round(width * self.proxy_factor), round(height * self.proxy_factor)
+                )
+            else:
+                self._proxy = self.source
+        return self._proxy
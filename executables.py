@@ -0,0 +1,115 @@
+import os
+import shutil
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Known install locations per app type, checked before PATH
+KNOWN_PATHS = {
+    'TeamViewer': {
+        'darwin': [
+            '/Applications/TeamViewer.app/Contents/MacOS/TeamViewer',
+            '~/Applications/TeamViewer.app/Contents/MacOS/TeamViewer'
+        ],
+        'win32': [
+            'C:\\Program Files\\TeamViewer\\TeamViewer.exe',
+            'C:\\Program Files (x86)\\TeamViewer\\TeamViewer.exe'
+        ],
+        'linux': [
+            '/usr/bin/teamviewer',
+            '/opt/teamviewer/teamviewer'
+        ]
+    },
+    'OBS Studio': {
+        'darwin': [
+            '/Applications/OBS.app/Contents/MacOS/obs',
+            '~/Applications/OBS.app/Contents/MacOS/obs'
+        ],
+        'win32': [
+            'C:\\Program Files\\obs-studio\\bin\\64bit\\obs64.exe',
+            'C:\\Program Files (x86)\\obs-studio\\bin\\32bit\\obs32.exe'
+        ],
+        'linux': [
+            '/usr/bin/obs',
+            '/usr/local/bin/obs'
+        ]
+    }
+}
+
+# Executable names looked up on PATH when no known location exists
+PATH_NAMES = {
+    'TeamViewer': ['teamviewer', 'TeamViewer'],
+    'OBS Studio': ['obs', 'obs64', 'obs32']
+}
+
+class ExecutableResolver:
+    """Finds app executables once and remembers them
+
+    A cached path is revalidated with a single ``os.stat``; it is resolved
+    again if the file is gone or its mtime changed (e.g. after an update).
+    Misses are not cached, so an app installed while the overlay runs is
+    picked up on the next launch.
+    """
+
+    def __init__(self, platform: str = sys.platform):
+        self.platform = platform if platform in ('darwin', 'win32') else 'linux'
+        self.cache: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def candidates(self, app_type: str) -> List[str]:
+        paths = KNOWN_PATHS.get(app_type, {}).get(self.platform, [])
+        return [os.path.expanduser(path) for path in paths]
+
+    def resolve(self, app_type: str) -> Optional[str]:
+        """Return the executable path for an app type, or None if it is not installed"""
+        with self._lock:
+            cached = self.cache.get(app_type)
+        if cached:
+            path, mtime = cached
+            try:
+                if os.stat(path).st_mtime == mtime:
+                    return path
+            except OSError:
+                pass
+        return self._probe(app_type)
+
+    def _probe(self, app_type: str) -> Optional[str]:
+        found = None
+        for path in self.candidates(app_type):
+            if os.path.exists(path):
+                found = path
+                break
+        if not found:
+            for name in PATH_NAMES.get(app_type, []):
+                found = shutil.which(name)
+                if found:
+                    break
+        with self._lock:
+            if not found:
+                self.cache.pop(app_type, None)
+                return None
+            try:
+                self.cache[app_type] = (found, os.stat(found).st_mtime)
+            except OSError:
+                self.cache.pop(app_type, None)
+            return found
+
+    def invalidate(self, app_type: Optional[str] = None):
+        """Forget one cached path, or all of them"""
+        with self._lock:
+            if app_type is None:
+                self.cache.clear()
+            else:
+                self.cache.pop(app_type, None)
+
+    def warm_up(self) -> threading.Thread:
+        """Resolve every known app type in the background"""
+        thread = threading.Thread(
+            target=lambda: [self._probe(app_type) for app_type in KNOWN_PATHS],
+            daemon=True
+        )
+        thread.start()
+        return thread
+
+# Shared by every launcher so each app type is probed once per process
+resolver = ExecutableResolver()
@@ -0,0 +1,374 @@
+import argparse
+import asyncio
+import struct
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set
+import cv2
+import numpy as np
+import websockets
+from auth import TokenService, bearer_check, bearer_headers, tokens as default_tokens
+from metrics import MovingAverage
+from video_manager import Frame, VideoManager
+
+# sequence, capture time (sender's time.monotonic_ns), codec, quality
+FRAME_HEADER = struct.Struct('!IQBB')
+# Sent back by the receiver for every frame it reads: sequence
+ACK = struct.Struct('!I')
+
+CODEC_JPEG = 0
+CODEC_PNG = 1
+CODECS = {'jpeg': CODEC_JPEG, 'png': CODEC_PNG}
+
+def encode_frame(image: np.ndarray, codec: int, quality: int, scale: float) -> np.ndarray:
+    """Encode one frame; runs on a worker thread (OpenCV releases the GIL)"""
+    if scale < 1.0:
+        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    if codec == CODEC_PNG:
+        # Fastest zlib level: PNG is for lossless, not small
+        ok, data = cv2.imencode('.png', image, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+    else:
+        ok, data = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("could not encode frame")
+    return data
+
+def decode_frame(payload) -> Optional[np.ndarray]:
+    return cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+
+class QualityController:
+    """Adapts JPEG quality, then resolution, to the link
+
+    The link counts as congested while the smoothed round trip is above
+    ``target_rtt_ms`` or frames had to wait for the send window. Congestion
+    cuts quality by a fifth, at most once per round trip, and below
+    ``min_quality`` steps the resolution down instead. Every ``recover_acks`` uncongested
+    acks undo one step, resolution first.
+    """
+
+    SCALES = (1.0, 0.75, 0.5, 0.25)
+    RTT_ALPHA = 0.2
+
+    def __init__(self, quality: int = 80, min_quality: int = 30, max_quality: int = 90,
+                 target_rtt_ms: float = 50.0, recover_acks: int = 15):
+        self.quality = quality
+        self.min_quality = min_quality
+        self.max_quality = max(max_quality, quality)
+        self.target_rtt_ms = target_rtt_ms
+        self.recover_acks = recover_acks
+        self.scale_index = 0
+        # Smoothed frame round trip in ms
+        self.rtt = MovingAverage(self.RTT_ALPHA)
+        self._good = 0
+        self._last_cut = 0.0
+
+    @property
+    def scale(self) -> float:
+        return self.SCALES[self.scale_index]
+
+    def on_ack(self, rtt_ms: float, window_full: bool):
+        rtt_ms = self.rtt.add(rtt_ms)
+        now = time.monotonic()
+        if rtt_ms > self.target_rtt_ms or window_full:
+            self._good = 0
+            if (now - self._last_cut) * 1000 < rtt_ms:
+                # The last cut has not reached the receiver yet
+                return
+            self._last_cut = now
+            if self.quality > self.min_quality:
+                self.quality = max(int(self.quality * 0.8), self.min_quality)
+            elif self.scale_index < len(self.SCALES) - 1:
+                self.scale_index += 1
+            return
+        self._good += 1
+        if self._good >= self.recover_acks:
+            self._good = 0
+            if self.scale_index:
+                self.scale_index -= 1
+            else:
+                self.quality = min(self.quality + 5, self.max_quality)
+
+class _Session:
+    """One connected receiver and its send window"""
+
+    def __init__(self, websocket, controller: QualityController):
+        self.websocket = websocket
+        self.controller = controller
+        self.wake = asyncio.Event()
+        # sequence -> send time of frames not acknowledged yet
+        self.unacked: Dict[int, int] = {}
+        # A newer frame waited for the window since the last ack
+        self.window_full = False
+        self.sent = 0
+        self.bytes = 0
+        self.stale = 0
+
+class FrameSender:
+    """Serves one VideoManager stream to WebSocket receivers as JPEG or PNG frames
+
+    Frames are encoded on a pool of ``workers`` threads, up to one frame
+    per worker in flight. A frame is never queued behind newer ones: only
+    the newest captured frame is picked up, and an encoded frame older
+    than ``max_age_ms`` is discarded when a newer one is on its way.
+    At most ``window`` frames may be unacknowledged per receiver, which
+    keeps socket buffers from turning into latency. With ``adaptive``,
+    each receiver's quality and resolution follow its round-trip time and
+    whether frames wait for the window (see QualityController). Every
+    receiver must present a token from ``tokens`` (by default this
+    machine's auth.tokens) allowing 'watch' when it connects, as
+    ``Authorization: Bearer <token>``.
+    """
+
+    def __init__(self, video_manager: VideoManager, stream_name: str, host: str = 'localhost', port: int = 8770,
+                 codec: str = 'jpeg', quality: int = 80, workers: int = 2, window: int = 2,
+                 max_age_ms: float = 100.0, adaptive: bool = True, target_rtt_ms: float = 50.0,
+                 tokens: Optional[TokenService] = None):
+        self.video_manager = video_manager
+        self.stream_name = stream_name
+        self.host = host
+        self.port = port
+        self.codec = CODECS[codec]
+        self.quality = quality
+        self.workers = workers
+        self.window = window
+        self.max_age_ns = int(max_age_ms * 1e6)
+        self.adaptive = adaptive
+        self.target_rtt_ms = target_rtt_ms
+        self.tokens = tokens or default_tokens
+        self.sessions: Set[_Session] = set()
+        self._latest: Optional[Frame] = None
+        self._pool = ThreadPoolExecutor(workers)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+
+    async def start(self) -> bool:
+        """Start serving; False if the stream does not exist"""
+        self._loop = asyncio.get_running_loop()
+        if not self.video_manager.add_sink(self.stream_name, self._on_frame):
+            return False
+        self._server = await websockets.serve(self._handle_client, self.host, self.port,
+                                              compression=None, max_size=None,
+                                              process_request=bearer_check(self.tokens, 'watch'))
+        if self.port == 0:
+            self.port = next(iter(self._server.sockets)).getsockname()[1]
+        return True
+
+    async def stop(self):
+        self.video_manager.remove_sink(self.stream_name, self._on_frame)
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self):
+        return [{
+            'sent': session.sent,
+            'bytes': session.bytes,
+            'stale': session.stale,
+            'in_flight': len(session.unacked),
+            'rtt_ms': round(session.controller.rtt.value, 2),
+            'quality': session.controller.quality,
+            'scale': session.controller.scale
+        } for session in list(self.sessions)]
+
+    def _on_frame(self, frame: Frame):
+        # Capture thread: keep only the newest frame and wake the sessions
+        self._latest = frame
+        self._loop.call_soon_threadsafe(self._wake_all)
+
+    def _wake_all(self):
+        for session in self.sessions:
+            session.wake.set()
+
+    async def _handle_client(self, websocket):
+        session = _Session(websocket, QualityController(self.quality, target_rtt_ms=self.target_rtt_ms))
+        self.sessions.add(session)
+        sender = asyncio.create_task(self._send_loop(session))
+        try:
+            # Returns once the connection closes, which may find the send
+            # loop waiting for a frame
+            await self._read_acks(session)
+        finally:
+            sender.cancel()
+            self.sessions.discard(session)
+
+    async def _read_acks(self, session: _Session):
+        try:
+            async for message in session.websocket:
+                sequence, = ACK.unpack_from(message)
+                sent_ns = session.unacked.pop(sequence, None)
+                if sent_ns is None:
+                    continue
+                rtt_ms = (time.monotonic_ns() - sent_ns) / 1e6
+                if self.adaptive:
+                    session.controller.on_ack(rtt_ms, session.window_full)
+                else:
+                    session.controller.rtt.add(rtt_ms)
+                session.window_full = False
+                session.wake.set()
+        except websockets.ConnectionClosed:
+            pass
+
+    async def _send_loop(self, session: _Session):
+        pending = deque()
+        last_seq = 0
+        while True:
+            frame = self._latest
+            while (frame is not None and frame.seq > last_seq and len(pending) < self.workers
+                   and len(session.unacked) + len(pending) < self.window):
+                if last_seq:
+                    # Captured while the pipeline was full, never sent
+                    session.stale += frame.seq - last_seq - 1
+                last_seq = frame.seq
+                controller = session.controller
+                job = self._loop.run_in_executor(self._pool, encode_frame, frame.image, self.codec,
+                                                 controller.quality, controller.scale)
+                pending.append((frame, controller.quality, job))
+                frame = self._latest
+            if frame is not None and frame.seq > last_seq and len(session.unacked) >= self.window:
+                session.window_full = True
+            if not pending:
+                await session.wake.wait()
+                session.wake.clear()
+                continue
+            frame, quality, job = pending.popleft()
+            try:
+                payload = await job
+            except (ValueError, cv2.error) as e:
+                print(f"Error encoding frame {frame.seq}: {e}")
+                continue
+            newest = self._latest
+            if (time.monotonic_ns() - frame.captured_ns > self.max_age_ns
+                    and (pending or (newest is not None and newest.seq > frame.seq))):
+                session.stale += 1
+                continue
+            message = b''.join((FRAME_HEADER.pack(frame.seq & 0xFFFFFFFF, frame.captured_ns, self.codec, quality),
+                                memoryview(payload)))
+            session.unacked[frame.seq & 0xFFFFFFFF] = time.monotonic_ns()
+            session.sent += 1
+            session.bytes += len(message)
+            try:
+                await session.websocket.send(message)
+            except websockets.ConnectionClosed:
+                return
+
+class FrameReceiver:
+    """Receives frames from a FrameSender and passes them to ``on_frame``
+
+    Every frame is acknowledged as soon as it is read, before decoding, so
+    the sender measures the link and not this machine. Decoding runs on a
+    worker thread; frames arriving while it is busy replace each other, so
+    only the newest waits. ``on_frame(sequence, image, captured_ns)`` runs
+    on the event loop; ``captured_ns`` is on the sender's monotonic clock.
+    ``token`` is presented to the sender; by default it is the token of
+    this overlay's own session.
+    """
+
+    def __init__(self, uri: str, on_frame: Callable[[int, np.ndarray, int], None], token: Optional[str] = None):
+        self.uri = uri
+        self.on_frame = on_frame
+        self.token = token or default_tokens.session
+        self.received = 0
+        self.decoded = 0
+        self.stale = 0
+        self.bytes = 0
+        self._pending = None
+        self._decoder: Optional[asyncio.Task] = None
+        self._pool = ThreadPoolExecutor(1)
+        self._websocket = None
+
+    async def run(self):
+        """Connect and receive until the connection closes"""
+        async with websockets.connect(self.uri, compression=None, max_size=None,
+                                      extra_headers=bearer_headers(self.token)) as websocket:
+            self._websocket = websocket
+            async for message in websocket:
+                sequence, captured_ns, codec, quality = FRAME_HEADER.unpack_from(message)
+                await websocket.send(ACK.pack(sequence))
+                self.received += 1
+                self.bytes += len(message)
+                if self._pending is not None:
+                    self.stale += 1
+                self._pending = (sequence, captured_ns, message)
+                if self._decoder is None or self._decoder.done():
+                    self._decoder = asyncio.create_task(self._decode_loop())
+        self._websocket = None
+
+    async def close(self):
+        if self._websocket:
+            await self._websocket.close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _decode_loop(self):
+        loop = asyncio.get_running_loop()
+        while self._pending is not None:
+            sequence, captured_ns, message = self._pending
+            self._pending = None
+            image = await loop.run_in_executor(self._pool, decode_frame, memoryview(message)[FRAME_HEADER.size:])
+            if image is None:
+                print(f"Error decoding frame {sequence}")
+                continue
+            self.decoded += 1
+            self.on_frame(sequence, image, captured_ns)
+
+async def _report(get_stats, interval: float = 5.0):
+    while True:
+        await asyncio.sleep(interval)
+        print(get_stats())
+
+async def _send(args) -> int:
+    manager = VideoManager()
+    manager.open_stream('stream', int(args.source) if args.source.isdigit() else args.source)
+    sender = FrameSender(manager, 'stream', args.host, args.port, args.codec, args.quality,
+                         window=args.window, adaptive=not args.fixed)
+    if not await sender.start():
+        print(f"Error opening {args.source}")
+        return 1
+    print(f"Serving {args.source} on ws://{args.host}:{sender.port}")
+    try:
+        await _report(lambda: {'stream': manager.get_stats('stream'), 'receivers': sender.get_stats()})
+    finally:
+        await sender.stop()
+        manager.close_all()
+
+async def _receive(args) -> int:
+    receiver = FrameReceiver(args.uri, lambda sequence, image, captured_ns: None, args.token)
+    report = asyncio.create_task(_report(lambda: {
+        'received': receiver.received, 'decoded': receiver.decoded,
+        'stale': receiver.stale, 'megabytes': round(receiver.bytes / 1e6, 1)
+    }))
+    try:
+        await receiver.run()
+    except (OSError, websockets.InvalidHandshake) as e:
+        print(f"Error connecting to {args.uri}: {e}")
+        return 1
+    finally:
+        report.cancel()
+        await receiver.close()
+    return 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Stream a camera or video between two machines over WebSockets")
+    commands = parser.add_subparsers(dest='command', required=True)
+    send = commands.add_parser('send', help="serve a video source")
+    send.add_argument('source', help="camera index, file or URL")
+    send.add_argument('--host', default='0.0.0.0')
+    send.add_argument('--port', type=int, default=8770)
+    send.add_argument('--codec', choices=sorted(CODECS), default='jpeg')
+    send.add_argument('--quality', type=int, default=80, help="JPEG quality to start from")
+    send.add_argument('--window', type=int, default=2, help="unacknowledged frames per receiver")
+    send.add_argument('--fixed', action='store_true', help="keep quality and resolution fixed")
+    receive = commands.add_parser('receive', help="connect to a sender and report what arrives")
+    receive.add_argument('uri', help="e.g. ws://192.168.1.20:8770")
+    receive.add_argument('--token', help="access token, see python auth.py issue")
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(_send(args) if args.command == 'send' else _receive(args))
+    except KeyboardInterrupt:
+        return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
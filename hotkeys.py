@@ -0,0 +1,433 @@
+import json
+import os
+import select
+import sys
+import threading
+from typing import Callable, Dict, Optional, Tuple
+from PySide6.QtCore import QObject, Qt, Signal
+
+# Modifier bits shared by every backend
+SHIFT = 1
+CTRL = 2
+ALT = 4
+CMD = 8
+
+MODIFIER_NAMES = {
+    'shift': SHIFT,
+    'ctrl': CTRL, 'control': CTRL,
+    'alt': ALT, 'option': ALT,
+    'cmd': CMD, 'super': CMD, 'meta': CMD, 'win': CMD
+}
+
+# Actions bound when hotkeys.json does not override them
+DEFAULT_BINDINGS = {
+    'toggle_overlay': 'cmd+shift+space'
+}
+
+Chord = Tuple[int, str]
+
+def parse_chord(text: str) -> Chord:
+    """Turn ``'cmd+shift+space'`` into ``(CMD | SHIFT, 'space')``"""
+    mods = 0
+    key = None
+    for part in text.lower().replace(' ', '').split('+'):
+        if part in MODIFIER_NAMES:
+            mods |= MODIFIER_NAMES[part]
+        elif part and key is None:
+            key = part
+        else:
+            raise ValueError(f"Invalid hotkey: {text}")
+    if key is None:
+        raise ValueError(f"Hotkey has no key: {text}")
+    return mods, key
+
+def to_key_sequence(chord: Chord) -> str:
+    """QKeySequence text for a chord; Qt calls Cmd 'Ctrl' on macOS"""
+    mods, key = chord
+    cmd, ctrl = ('Ctrl', 'Meta') if sys.platform == 'darwin' else ('Meta', 'Ctrl')
+    parts = []
+    if mods & CTRL:
+        parts.append(ctrl)
+    if mods & CMD:
+        parts.append(cmd)
+    if mods & ALT:
+        parts.append('Alt')
+    if mods & SHIFT:
+        parts.append('Shift')
+    parts.append(key.capitalize())
+    return '+'.join(parts)
+
+def load_bindings(path: str = 'hotkeys.json') -> Dict[str, str]:
+    """Action -> chord table: the defaults, overridden by ``path`` if it exists"""
+    bindings = dict(DEFAULT_BINDINGS)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                bindings.update(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"Error loading hotkeys: {e}")
+    return bindings
+
+class X11Backend:
+    """Grabs only the bound chords on the X root window with XGrabKey
+
+    The X server delivers nothing but those chords, so other keystrokes
+    never reach this process.
+    """
+
+    name = 'x11'
+
+    def __init__(self, fire: Callable[[Chord], None]):
+        from Xlib import X, XK, display, error
+        self.X, self.XK, self.error = X, XK, error
+        self.fire = fire
+        self.display = display.Display()
+        self.root = self.display.screen().root
+        self.grabs: Dict[Tuple[int, int], Chord] = {}
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread = None
+        self._running = False
+
+    @staticmethod
+    def available() -> bool:
+        if not os.environ.get('DISPLAY'):
+            return False
+        try:
+            import Xlib.display  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def _mask(self, mods: int) -> int:
+        X = self.X
+        mask = 0
+        if mods & SHIFT:
+            mask |= X.ShiftMask
+        if mods & CTRL:
+            mask |= X.ControlMask
+        if mods & ALT:
+            mask |= X.Mod1Mask
+        if mods & CMD:
+            mask |= X.Mod4Mask
+        return mask
+
+    def _keycode(self, key: str) -> int:
+        for name in (key, key.capitalize(), key.upper(), {'enter': 'Return', 'esc': 'Escape'}.get(key, '')):
+            keysym = self.XK.string_to_keysym(name) if name else 0
+            if keysym:
+                return self.display.keysym_to_keycode(keysym)
+        return 0
+
+    def grab(self, chord: Chord) -> bool:
+        X = self.X
+        keycode = self._keycode(chord[1])
+        if not keycode:
+            return False
+        mask = self._mask(chord[0])
+        # Lock and NumLock change the modifier state, so each chord is grabbed
+        # once per combination of them
+        catcher = self.error.CatchError(self.error.BadAccess)
+        for extra in (0, X.LockMask, X.Mod2Mask, X.LockMask | X.Mod2Mask):
+            self.root.grab_key(keycode, mask | extra, True, X.GrabModeAsync, X.GrabModeAsync, onerror=catcher)
+        self.display.sync()
+        if catcher.get_error():
+            # Another client already owns this chord
+            self.ungrab(chord, keycode, mask)
+            return False
+        self.grabs[(keycode, mask)] = chord
+        return True
+
+    def ungrab(self, chord: Chord, keycode: Optional[int] = None, mask: Optional[int] = None):
+        X = self.X
+        keycode = keycode or self._keycode(chord[1])
+        mask = self._mask(chord[0]) if mask is None else mask
+        for extra in (0, X.LockMask, X.Mod2Mask, X.LockMask | X.Mod2Mask):
+            self.root.ungrab_key(keycode, mask | extra)
+        self.display.sync()
+        self.grabs.pop((keycode, mask), None)
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        X = self.X
+        relevant = X.ShiftMask | X.ControlMask | X.Mod1Mask | X.Mod4Mask
+        fd = self.display.fileno()
+        while self._running:
+            readable, _, _ = select.select([fd, self._wake_r], [], [])
+            if self._wake_r in readable:
+                break
+            for _ in range(self.display.pending_events()):
+                event = self.display.next_event()
+                if event.type == X.KeyPress:
+                    chord = self.grabs.get((event.detail, event.state & relevant))
+                    if chord:
+                        self.fire(chord)
+
+    def stop(self):
+        self._running = False
+        os.write(self._wake_w, b'x')
+        if self._thread:
+            self._thread.join(timeout=1)
+        for keycode, mask in list(self.grabs):
+            self.ungrab(self.grabs[(keycode, mask)], keycode, mask)
+        self.display.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+class EvdevBackend:
+    """Reads key events from /dev/input keyboards (Wayland, consoles)
+
+    Needs read access to the input devices. Each event costs one integer
+    dict lookup; only chord keys with matching modifiers reach ``fire``.
+    """
+
+    name = 'evdev'
+
+    def __init__(self, fire: Callable[[Chord], None]):
+        import evdev
+        self.evdev = evdev
+        self.fire = fire
+        self.chords: Dict[Tuple[int, int], Chord] = {}
+        codes = evdev.ecodes
+        self.modifier_codes = {
+            codes.KEY_LEFTSHIFT: SHIFT, codes.KEY_RIGHTSHIFT: SHIFT,
+            codes.KEY_LEFTCTRL: CTRL, codes.KEY_RIGHTCTRL: CTRL,
+            codes.KEY_LEFTALT: ALT, codes.KEY_RIGHTALT: ALT,
+            codes.KEY_LEFTMETA: CMD, codes.KEY_RIGHTMETA: CMD
+        }
+        self.devices = self.keyboards()
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread = None
+
+    @classmethod
+    def keyboards(cls):
+        import evdev
+        devices = []
+        for path in evdev.list_devices():
+            try:
+                device = evdev.InputDevice(path)
+            except OSError:
+                continue
+            keys = device.capabilities().get(evdev.ecodes.EV_KEY, [])
+            if evdev.ecodes.KEY_SPACE in keys:
+                devices.append(device)
+            else:
+                device.close()
+        return devices
+
+    @classmethod
+    def available(cls) -> bool:
+        if not sys.platform.startswith('linux'):
+            return False
+        try:
+            import evdev  # noqa: F401
+        except ImportError:
+            return False
+        devices = cls.keyboards()
+        for device in devices:
+            device.close()
+        return bool(devices)
+
+    def grab(self, chord: Chord) -> bool:
+        code = self.evdev.ecodes.ecodes.get('KEY_' + chord[1].upper())
+        if code is None:
+            return False
+        self.chords[(code, chord[0])] = chord
+        return True
+
+    def ungrab(self, chord: Chord):
+        code = self.evdev.ecodes.ecodes.get('KEY_' + chord[1].upper())
+        self.chords.pop((code, chord[0]), None)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        ev_key = self.evdev.ecodes.EV_KEY
+        modifier_codes = self.modifier_codes
+        chords = self.chords
+        devices = {device.fd: device for device in self.devices}
+        mods = 0
+        while True:
+            readable, _, _ = select.select(list(devices) + [self._wake_r], [], [])
+            if self._wake_r in readable:
+                return
+            for fd in readable:
+                try:
+                    events = devices[fd].read()
+                except OSError:
+                    # Keyboard unplugged
+                    del devices[fd]
+                    continue
+                for event in events:
+                    if event.type != ev_key:
+                        continue
+                    bit = modifier_codes.get(event.code)
+                    if bit:
+                        mods = mods | bit if event.value else mods & ~bit
+                    elif event.value == 1:
+                        chord = chords.get((event.code, mods))
+                        if chord:
+                            self.fire(chord)
+
+    def stop(self):
+        os.write(self._wake_w, b'x')
+        if self._thread:
+            self._thread.join(timeout=1)
+        for device in self.devices:
+            device.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+class PynputBackend:
+    """Fallback through a pynput listener (macOS, Windows, X without python-xlib grabs)
+
+    pynput hands every keystroke to Python, so the handlers keep that path
+    to a cached dict lookup and a bit operation.
+    """
+
+    name = 'pynput'
+
+    def __init__(self, fire: Callable[[Chord], None]):
+        self.fire = fire
+        self.chords: Dict[Chord, Chord] = {}
+        self.mods = 0
+        # pynput key object -> (modifier bit, key name), filled on first sight
+        self._keys: Dict[object, Tuple[int, str]] = {}
+        self._listener = None
+
+    @staticmethod
+    def available() -> bool:
+        try:
+            import pynput.keyboard  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def grab(self, chord: Chord) -> bool:
+        self.chords[chord] = chord
+        return True
+
+    def ungrab(self, chord: Chord):
+        self.chords.pop(chord, None)
+
+    def _describe(self, key) -> Tuple[int, str]:
+        char = getattr(key, 'char', None)
+        if char:
+            info = (0, char.lower())
+        else:
+            name = getattr(key, 'name', None) or ''
+            # 'shift_r', 'ctrl_l', 'alt_gr' -> 'shift', 'ctrl', 'alt'
+            info = (MODIFIER_NAMES.get(name.split('_')[0], 0), name)
+        self._keys[key] = info
+        return info
+
+    def on_press(self, key):
+        info = self._keys.get(key) or self._describe(key)
+        if info[0]:
+            self.mods |= info[0]
+            return
+        chord = self.chords.get((self.mods, info[1]))
+        if chord:
+            self.fire(chord)
+
+    def on_release(self, key):
+        info = self._keys.get(key) or self._describe(key)
+        if info[0]:
+            self.mods &= ~info[0]
+
+    def start(self):
+        from pynput import keyboard
+        self._listener = keyboard.Listener(on_press=self.on_press, on_release=self.on_release)
+        self._listener.daemon = True
+        self._listener.start()
+
+    def stop(self):
+        if self._listener:
+            self._listener.stop()
+
+BACKENDS = (X11Backend, EvdevBackend, PynputBackend)
+
+class HotkeyManager(QObject):
+    """System-wide hotkeys from an action -> chord table
+
+    The first available backend is used: XGrabKey on X11, evdev where the
+    input devices are readable, pynput otherwise. Backends fire on their own
+    thread; activations are queued to the Qt thread and emitted as
+    ``activated(action)``.
+    """
+
+    activated = Signal(str)
+    _fired = Signal(object)
+
+    def __init__(self, bindings: Optional[Dict[str, str]] = None, parent=None):
+        super().__init__(parent)
+        self.bindings: Dict[str, Chord] = {}
+        self.actions: Dict[Chord, str] = {}
+        self.backend = None
+        self._fired.connect(self._on_fired, Qt.QueuedConnection)
+        for action, text in (bindings if bindings is not None else load_bindings()).items():
+            self.bind(action, text)
+
+    def bind(self, action: str, text: str) -> bool:
+        """Bind ``action`` to a chord such as ``'ctrl+alt+o'``, replacing its old chord"""
+        try:
+            chord = parse_chord(text)
+        except ValueError as e:
+            print(f"Error binding {action}: {e}")
+            return False
+        if self.actions.get(chord, action) != action:
+            print(f"Hotkey {text} is already bound to {self.actions[chord]}")
+            return False
+        if self.bindings.get(action) == chord:
+            return True
+        # Grab first: if the new chord is taken, the old one keeps working
+        if self.backend and not self.backend.grab(chord):
+            print(f"Could not register hotkey {text}")
+            return False
+        self.unbind(action)
+        self.bindings[action] = chord
+        self.actions[chord] = action
+        return True
+
+    def unbind(self, action: str):
+        chord = self.bindings.pop(action, None)
+        if chord is None:
+            return
+        del self.actions[chord]
+        if self.backend:
+            self.backend.ungrab(chord)
+
+    def start(self) -> Optional[str]:
+        """Register the bindings system-wide; returns the backend name or None"""
+        if self.backend:
+            return self.backend.name
+        for backend in BACKENDS:
+            if not backend.available():
+                continue
+            try:
+                self.backend = backend(self._fired.emit)
+            except Exception as e:
+                print(f"Hotkey backend {backend.name} unavailable: {e}")
+                continue
+            for action, chord in list(self.bindings.items()):
+                if not self.backend.grab(chord):
+                    print(f"Could not register hotkey for {action}")
+            self.backend.start()
+            return self.backend.name
+        print("No global hotkey backend available")
+        return None
+
+    def stop(self):
+        if self.backend:
+            self.backend.stop()
+            self.backend = None
+
+    def _on_fired(self, chord: Chord):
+        action = self.actions.get(chord)
+        if action:
+            self.activated.emit(action)
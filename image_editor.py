@@ -0,0 +1,296 @@
+from typing import Callable, List, Optional, Tuple
+import cv2
+import numpy as np
+
+Region = Tuple[int, int, int, int]
+
+# Named conversions accepted by ImageEditor.convert
+CONVERSIONS = {
+    'gray': cv2.COLOR_BGR2GRAY,
+    'bgr': cv2.COLOR_GRAY2BGR,
+    'rgb': cv2.COLOR_BGR2RGB
+}
+
+def read_image(path: str) -> np.ndarray:
+    """Load ``path`` as uint8 BGR or grayscale, dropping any alpha channel"""
+    image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+    if image is None:
+        raise ValueError(f"Could not read image: {path}")
+    if image.ndim == 3 and image.shape[2] == 4:
+        image = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+    return image
+
+# Operations on uint8 arrays. Those taking ``dst`` write into it (it may be
+# ``image`` itself); the rest return a new array.
+
+def brightness_contrast(image: np.ndarray, brightness: float = 0, contrast: float = 1.0, dst=None) -> np.ndarray:
+    """``out = in * contrast + brightness``, with contrast pivoting on mid-gray"""
+    values = np.arange(256, dtype=np.float32)
+    return cv2.LUT(image, _lut((values - 128) * contrast + 128 + brightness), dst=dst)
+
+def levels(image: np.ndarray, black: int = 0, white: int = 255, gamma: float = 1.0, dst=None) -> np.ndarray:
+    """Map ``black..white`` to the full range with a gamma curve"""
+    if not 0 <= black < white <= 255:
+        raise ValueError("levels need 0 <= black < white <= 255")
+    values = np.clip((np.arange(256, dtype=np.float32) - black) / (white - black), 0, 1)
+    return cv2.LUT(image, _lut(255 * values ** (1 / gamma)), dst=dst)
+
+def invert(image: np.ndarray, dst=None) -> np.ndarray:
+    return cv2.bitwise_not(image, dst=dst)
+
+def blur(image: np.ndarray, radius: int = 2, dst=None) -> np.ndarray:
+    if radius <= 0:
+        return image if dst is image else image.copy()
+    ksize = 2 * radius + 1
+    return cv2.GaussianBlur(image, (ksize, ksize), 0, dst=dst)
+
+def sharpen(image: np.ndarray, amount: float = 1.0, radius: int = 1, dst=None) -> np.ndarray:
+    """Unsharp mask: ``in + amount * (in - blur(in))``"""
+    ksize = 2 * max(radius, 1) + 1
+    blurred = cv2.GaussianBlur(image, (ksize, ksize), 0)
+    return cv2.addWeighted(image, 1 + amount, blurred, -amount, 0, dst=dst)
+
+def flip(image: np.ndarray, horizontal: bool = True, dst=None) -> np.ndarray:
+    return cv2.flip(image, 1 if horizontal else 0, dst=dst)
+
+def swap_rb(image: np.ndarray, dst=None) -> np.ndarray:
+    if image.ndim == 2:
+        return image if dst is image else image.copy()
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=dst)
+
+def crop(image: np.ndarray, x: int, y: int, w: int, h: int) -> np.ndarray:
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, image.shape[1]), min(y + h, image.shape[0])
+    if x1 <= x0 or y1 <= y0:
+        raise ValueError("Crop is outside the image")
+    return image[y0:y1, x0:x1].copy()
+
+def resize(image: np.ndarray, width: int, height: int) -> np.ndarray:
+    width, height = max(int(width), 1), max(int(height), 1)
+    shrinking = width * height < image.shape[0] * image.shape[1]
+    interpolation = cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR
+    return cv2.resize(image, (width, height), interpolation=interpolation)
+
+def rotate(image: np.ndarray, angle: float) -> np.ndarray:
+    """Rotate counter-clockwise by ``angle`` degrees, growing the canvas to fit"""
+    angle %= 360
+    quarter = {90: cv2.ROTATE_90_COUNTERCLOCKWISE, 180: cv2.ROTATE_180, 270: cv2.ROTATE_90_CLOCKWISE}
+    if angle == 0:
+        return image.copy()
+    if angle in quarter:
+        return cv2.rotate(image, quarter[angle])
+    h, w = image.shape[:2]
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    cos, sin = abs(matrix[0, 0]), abs(matrix[0, 1])
+    new_w, new_h = int(h * sin + w * cos), int(h * cos + w * sin)
+    matrix[0, 2] += new_w / 2 - w / 2
+    matrix[1, 2] += new_h / 2 - h / 2
+    return cv2.warpAffine(image, matrix, (new_w, new_h), flags=cv2.INTER_LINEAR)
+
+def convert(image: np.ndarray, mode: str) -> np.ndarray:
+    """Convert to one of CONVERSIONS"""
+    if mode not in CONVERSIONS:
+        raise ValueError(f"Unknown conversion: {mode}")
+    gray = image.ndim == 2
+    if mode == 'bgr' and not gray or mode in ('gray', 'rgb') and gray:
+        return image.copy()
+    return cv2.cvtColor(image, CONVERSIONS[mode])
+
+def _lut(values: np.ndarray) -> np.ndarray:
+    return np.clip(np.rint(values), 0, 255).astype(np.uint8)
+
+class TilePatch:
+    """The previous contents of the tiles an edit changed"""
+
+    def __init__(self, tiles: List[Tuple[int, int, np.ndarray]]):
+        self.tiles = tiles
+        self.nbytes = sum(tile.nbytes for _, _, tile in tiles)
+
+    def apply(self, image: np.ndarray) -> Tuple[np.ndarray, 'TilePatch']:
+        """Write the tiles back; returns the image and the patch that reverts this"""
+        inverse = []
+        for y, x, tile in self.tiles:
+            h, w = tile.shape[:2]
+            target = image[y:y + h, x:x + w]
+            inverse.append((y, x, target.copy()))
+            target[...] = tile
+        return image, TilePatch(inverse)
+
+class ImageSwap:
+    """A whole previous image, kept for edits that change the shape
+
+    The old array is simply retained, not copied.
+    """
+
+    def __init__(self, image: np.ndarray):
+        self.image = image
+        self.nbytes = image.nbytes
+
+    def apply(self, image: np.ndarray) -> Tuple[np.ndarray, 'ImageSwap']:
+        return self.image, ImageSwap(image)
+
+class TileHistory:
+    """Undo/redo stacks holding only the tiles each edit changed
+
+    After an edit the affected area is compared tile by tile with its
+    previous contents and only differing tiles are kept. The oldest undo
+    steps are dropped once the history exceeds ``max_bytes``.
+    """
+
+    def __init__(self, tile_size: int = 256, max_bytes: int = 512 * 1024 * 1024):
+        self.tile_size = tile_size
+        self.max_bytes = max_bytes
+        self.undo_stack: list = []
+        self.redo_stack: list = []
+        self.nbytes = 0
+
+    def record_tiles(self, before: np.ndarray, after: np.ndarray, origin: Tuple[int, int]):
+        """Keep the tiles of ``before`` that differ from ``after`` (both views of one region)"""
+        size = self.tile_size
+        oy, ox = origin
+        h, w = before.shape[:2]
+        changed = []
+        for y in range(0, h, size):
+            for x in range(0, w, size):
+                if not np.array_equal(before[y:y + size, x:x + size], after[y:y + size, x:x + size]):
+                    changed.append((y, x))
+        if not changed:
+            return
+        if len(changed) == -(-h // size) * -(-w // size):
+            # Everything changed: keep ``before`` whole rather than copying it into tiles
+            self.push(TilePatch([(oy, ox, before)]))
+            return
+        self.push(TilePatch([
+            (oy + y, ox + x, before[y:y + size, x:x + size].copy()) for y, x in changed
+        ]))
+
+    def record_image(self, image: np.ndarray):
+        self.push(ImageSwap(image))
+
+    def push(self, entry):
+        self.undo_stack.append(entry)
+        self.nbytes += entry.nbytes
+        for redo in self.redo_stack:
+            self.nbytes -= redo.nbytes
+        self.redo_stack.clear()
+        while self.nbytes > self.max_bytes and len(self.undo_stack) > 1:
+            self.nbytes -= self.undo_stack.pop(0).nbytes
+
+    def undo(self, image: np.ndarray) -> Optional[np.ndarray]:
+        return self._step(image, self.undo_stack, self.redo_stack)
+
+    def redo(self, image: np.ndarray) -> Optional[np.ndarray]:
+        return self._step(image, self.redo_stack, self.undo_stack)
+
+    def _step(self, image, source, target):
+        if not source:
+            return None
+        entry = source.pop()
+        image, inverse = entry.apply(image)
+        target.append(inverse)
+        self.nbytes += inverse.nbytes - entry.nbytes
+        return image
+
+class ImageEditor:
+    """Headless editing on a uint8 BGR (or grayscale) NumPy image
+
+    Pixel operations run in place on the image or on a ``region``
+    ``(x, y, w, h)`` of it. Geometry and colour-space changes produce a new
+    array. Every edit can be undone through a TileHistory.
+    """
+
+    def __init__(self, image: np.ndarray, history: Optional[TileHistory] = None):
+        if image.dtype != np.uint8:
+            raise ValueError("ImageEditor expects a uint8 image")
+        self.image = np.ascontiguousarray(image)
+        self.history = history or TileHistory()
+
+    @classmethod
+    def open(cls, path: str) -> 'ImageEditor':
+        return cls(read_image(path))
+
+    def save(self, path: str) -> bool:
+        return cv2.imwrite(path, self.image)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.image.shape[1], self.image.shape[0]
+
+    # Pixel operations, in place
+
+    def brightness_contrast(self, brightness: float = 0, contrast: float = 1.0, region: Optional[Region] = None):
+        self._edit(region, lambda view: brightness_contrast(view, brightness, contrast, dst=view))
+
+    def levels(self, black: int = 0, white: int = 255, gamma: float = 1.0, region: Optional[Region] = None):
+        self._edit(region, lambda view: levels(view, black, white, gamma, dst=view))
+
+    def invert(self, region: Optional[Region] = None):
+        self._edit(region, lambda view: invert(view, dst=view))
+
+    def blur(self, radius: int = 2, region: Optional[Region] = None):
+        self._edit(region, lambda view: blur(view, radius, dst=view))
+
+    def sharpen(self, amount: float = 1.0, radius: int = 1, region: Optional[Region] = None):
+        self._edit(region, lambda view: sharpen(view, amount, radius, dst=view))
+
+    def flip(self, horizontal: bool = True):
+        self._edit(None, lambda view: flip(view, horizontal, dst=view))
+
+    # Geometry and colour space, new array
+
+    def crop(self, x: int, y: int, w: int, h: int):
+        self._replace(crop(self.image, x, y, w, h))
+
+    def resize(self, width: int, height: int):
+        self._replace(resize(self.image, width, height))
+
+    def rotate(self, angle: float):
+        if angle % 360:
+            self._replace(rotate(self.image, angle))
+
+    def convert(self, mode: str):
+        """Convert to one of CONVERSIONS; 'rgb' swaps channels in place"""
+        if mode == 'rgb':
+            self._edit(None, lambda view: swap_rb(view, dst=view))
+        elif mode == 'gray' and self.image.ndim == 3 or mode == 'bgr' and self.image.ndim == 2:
+            self._replace(convert(self.image, mode))
+        elif mode not in CONVERSIONS:
+            raise ValueError(f"Unknown conversion: {mode}")
+
+    # History
+
+    def undo(self) -> bool:
+        image = self.history.undo(self.image)
+        if image is None:
+            return False
+        self.image = image
+        return True
+
+    def redo(self) -> bool:
+        image = self.history.redo(self.image)
+        if image is None:
+            return False
+        self.image = image
+        return True
+
+    def _view(self, region: Optional[Region]) -> Tuple[np.ndarray, Tuple[int, int]]:
+        if region is None:
+            return self.image, (0, 0)
+        x, y, w, h = region
+        x0, y0 = max(x, 0), max(y, 0)
+        return self.image[y0:y + h, x0:x + w], (y0, x0)
+
+    def _edit(self, region: Optional[Region], operation: Callable[[np.ndarray], np.ndarray]):
+        view, origin = self._view(region)
+        if view.size == 0:
+            return
+        before = view.copy()
+        result = operation(view)
+        if result is not view:
+            # OpenCV could not write into this view and returned a new array
+            view[...] = result
+        self.history.record_tiles(before, view, origin)
+
+    def _replace(self, image: np.ndarray):
+        self.history.record_image(self.image)
+        self.image = np.ascontiguousarray(image)
@@ -0,0 +1,108 @@
+import os
+import subprocess
+import threading
+from typing import Dict, List, Optional, Set
+from PySide6.QtCore import QObject, QSocketNotifier, Qt, Signal
+
+class ProcessLauncher(QObject):
+    """Starts app processes, keeps their handles and reports when they exit
+
+    On Linux each child gets a pidfd watched by a QSocketNotifier, so exits
+    are delivered by the Qt event loop without polling. Elsewhere a daemon
+    thread blocks in ``wait()`` and the result is queued back to the Qt
+    thread. Status changes are written to the AppManager (if given) and
+    emitted through ``statusChanged``.
+    """
+
+    statusChanged = Signal(str, str)
+    _exited = Signal(str, object)
+
+    def __init__(self, app_manager=None, parent=None):
+        super().__init__(parent)
+        self.app_manager = app_manager
+        self.processes: Dict[str, subprocess.Popen] = {}
+        self._notifiers: Dict[str, QSocketNotifier] = {}
+        self._terminating: Set[str] = set()
+        self._exited.connect(self._on_exit, Qt.QueuedConnection)
+        self.reset_statuses()
+
+    def reset_statuses(self):
+        """Mark apps a previous session left 'active', 'streaming' or 'crashed' as inactive
+
+        Those statuses describe processes of that session; none of them
+        outlives it. Call again after loading apps if the AppManager was
+        created empty.
+        """
+        if not self.app_manager:
+            return
+        stale = [app_name for app_name, app in self.app_manager.apps.items()
+                 if app['status'] != 'inactive' and app_name not in self.processes]
+        for app_name in stale:
+            self.app_manager.set_app_status(app_name, 'inactive')
+
+    def launch(self, app_name: str, args: List[str]) -> bool:
+        """Start ``args`` for ``app_name`` unless it is already running"""
+        if self.is_running(app_name):
+            return False
+        process = subprocess.Popen(args)
+        self.processes[app_name] = process
+        self._watch(app_name, process)
+        self._set_status(app_name, 'active')
+        return True
+
+    def is_running(self, app_name: str) -> bool:
+        process = self.processes.get(app_name)
+        return process is not None and process.returncode is None
+
+    def terminate(self, app_name: str) -> bool:
+        """Ask a running app to exit; its status updates once it is reaped"""
+        if not self.is_running(app_name):
+            return False
+        self._terminating.add(app_name)
+        self.processes[app_name].terminate()
+        return True
+
+    def _watch(self, app_name: str, process: subprocess.Popen):
+        pidfd = self._open_pidfd(process.pid)
+        if pidfd is None:
+            threading.Thread(target=self._wait, args=(app_name, process), daemon=True).start()
+            return
+        notifier = QSocketNotifier(pidfd, QSocketNotifier.Read, self)
+        notifier.activated.connect(lambda *_: self._on_pidfd_ready(app_name, process, notifier, pidfd))
+        self._notifiers[app_name] = notifier
+
+    @staticmethod
+    def _open_pidfd(pid: int) -> Optional[int]:
+        if not hasattr(os, 'pidfd_open'):
+            return None
+        try:
+            return os.pidfd_open(pid)
+        except OSError:
+            # Kernel older than 5.3
+            return None
+
+    def _on_pidfd_ready(self, app_name: str, process: subprocess.Popen, notifier: QSocketNotifier, pidfd: int):
+        notifier.setEnabled(False)
+        notifier.deleteLater()
+        os.close(pidfd)
+        if self._notifiers.get(app_name) is notifier:
+            del self._notifiers[app_name]
+        process.wait()
+        self._on_exit(app_name, process)
+
+    def _wait(self, app_name: str, process: subprocess.Popen):
+        process.wait()
+        self._exited.emit(app_name, process)
+
+    def _on_exit(self, app_name: str, process: subprocess.Popen):
+        if self.processes.get(app_name) is not process:
+            return
+        del self.processes[app_name]
+        stopped = app_name in self._terminating or process.returncode == 0
+        self._terminating.discard(app_name)
+        self._set_status(app_name, 'inactive' if stopped else 'crashed')
+
+    def _set_status(self, app_name: str, status: str):
+        if self.app_manager:
+            self.app_manager.set_app_status(app_name, status)
+        self.statusChanged.emit(app_name, status)
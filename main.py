@@ -1,25 +1,119 @@
+import time
+_IMPORT_START = time.perf_counter()
 import sys
-import os
-import shutil
-import subprocess
+import concurrent.futures
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                               QPushButton, QLabel, QDialog, QComboBox, QLineEdit, 
                               QFormLayout, QMessageBox, QHBoxLayout, QFrame,
                               QScrollArea, QSizePolicy, QGridLayout, QFileDialog,
                               QStackedWidget)
-from PySide6.QtCore import Qt, QPoint, QSize, Signal, QEvent
+from PySide6.QtCore import Qt, QObject, QPoint, QSize, Signal, QEvent, QTimer
 from PySide6.QtGui import QColor, QPalette, QShortcut, QKeySequence, QIcon, QAction, QPixmap
 from app_manager import AppManager
+from auth import PermissionDenied, tokens
+from credentials import Authenticator
+from executables import resolver
+from launcher import ProcessLauncher
+from hotkeys import HotkeyManager, to_key_sequence
 import threading
-from pynput import keyboard
-import objc
-from AppKit import NSApplication, NSApp, NSRunningApplication, NSApplicationActivateIgnoringOtherApps
-try:
-    from Quartz import AXIsProcessTrusted
-except ImportError:
-    AXIsProcessTrusted = None
 from components.sidebar import Sidebar
 from components.app_nav_button import AppNavButton
+from components.app_nav_list import AppNavList
+from components.tile_grid import TileGrid
+from components.theme import ThemeManager
+from startup_profile import StartupProfiler
+
+# Camera recordings; pre-roll memory is further capped by the recorder
+RECORDINGS_DIR = 'recordings'
+PREROLL_SECONDS = 5
+# OBS WebSocket server, unless an OBS app's config sets 'obs_url'
+OBS_URL = 'ws://localhost:4455'
+# How long a stream request waits for a freshly launched OBS to accept connections
+OBS_START_TIMEOUT = 30
+
+def start_obs_stream(controllers, launcher, app_name, config, on_status=None, parent=None):
+    """Start streaming through the OBS WebSocket API, launching OBS only if it isn't reachable
+
+    Each OBS app keeps one OBSController, a persistent connection, in
+    ``controllers``. With ``on_status``, stream state events report the
+    app as 'streaming' or 'active'. Nothing here blocks the Qt thread:
+    whether OBS already listens is checked on the controller's loop.
+    Returns a future, completed on the Qt thread, that fails with
+    LookupError if OBS had to be launched but is not installed, or with
+    the error StartStream got.
+    """
+    from obs_client import STATUS_OUTPUT_RUNNING, OBSController, OBSError
+    controller = controllers.get(app_name)
+    if controller is None:
+        controller = OBSController(config.get('obs_url', OBS_URL), config.get('obs_password') or None, parent)
+        if on_status:
+            def on_event(event_type, data):
+                if event_type == 'StreamStateChanged':
+                    on_status(app_name, 'streaming' if data.get('outputActive') else 'active')
+            controller.eventReceived.connect(on_event)
+        controllers[app_name] = controller
+    result = concurrent.futures.Future()
+
+    def on_started(future):
+        error = future.exception()
+        if error and not (isinstance(error, OBSError) and error.code == STATUS_OUTPUT_RUNNING):
+            print(f"Error starting OBS stream for {app_name}: {error}")
+            result.set_exception(error)
+        else:
+            result.set_result(True)
+
+    def on_probed(future):
+        if not future.result():
+            obs_path = resolver.resolve('OBS Studio')
+            if not obs_path:
+                result.set_exception(LookupError("OBS Studio is not installed or not found."))
+                return
+            try:
+                launcher.launch(app_name, [obs_path, '--stream', config.get('stream_key', '')])
+            except OSError as e:
+                result.set_exception(e)
+                return
+        controller.call('StartStream', timeout=OBS_START_TIMEOUT, callback=on_started)
+
+    if controller.connected or launcher.is_running(app_name):
+        controller.call('StartStream', timeout=OBS_START_TIMEOUT, callback=on_started)
+    else:
+        controller.probe(callback=on_probed)
+    return result
+
+def start_app(app_manager, launcher, obs_controllers, app_name, parent=None, tiles=None):
+    """Launch ``app_name`` without any UI, for local buttons and remote callers alike
+
+    Raises if it cannot be launched (unknown app, not installed, already
+    running); OBS apps return start_obs_stream's future instead, which
+    fails the same way. Cameras and image editors open in ``tiles``, an
+    AppContainer.
+    """
+    data = app_manager.apps.get(app_name)
+    if not data:
+        raise LookupError(f"no app named {app_name!r}")
+    if data['type'] == 'TeamViewer':
+        teamviewer_path = resolver.resolve('TeamViewer')
+        if not teamviewer_path:
+            raise LookupError("TeamViewer is not installed or not found.")
+        if not launcher.launch(app_name, [teamviewer_path, '--id', data['config']['connection_id']]):
+            raise RuntimeError(f"{app_name} is already running")
+    elif data['type'] == 'OBS Studio':
+        return start_obs_stream(obs_controllers, launcher, app_name, data['config'], app_manager.set_app_status,
+                                parent)
+    elif data['type'] in AppContainer.TYPES and tiles is not None:
+        tiles.open_app(app_name, data['type'], data['config'])
+    else:
+        raise ValueError(f"{data['type']} apps cannot be launched here")
+    return None
+
+def warn_on_failure(parent, future):
+    """Show a warning over ``parent`` if a launch future from start_obs_stream fails"""
+    def on_done(future):
+        error = future.exception()
+        if error:
+            QMessageBox.warning(parent, "Error", str(error))
+    future.add_done_callback(on_done)
 
 class AppWindow(QFrame):
     closeRequested = Signal(str)
@@ -33,42 +127,8 @@ class AppWindow(QFrame):
         
     def initUI(self):
         self.setFrameStyle(QFrame.StyledPanel | QFrame.Raised)
-        self.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border: 1px solid #cccccc;
-                border-radius: 5px;
-                margin: 2px;
-                padding: 5px;
-            }
-            QPushButton {
-                background-color: #2c3e50;
-                color: white;
-                border: none;
-                padding: 3px;
-                border-radius: 3px;
-                min-height: 20px;
-                max-height: 20px;
-            }
-            QPushButton:hover {
-                background-color: #34495e;
-            }
-            QPushButton#closeButton {
-                background-color: #e74c3c;
-                min-width: 16px;
-                max-width: 16px;
-                min-height: 16px;
-                max-height: 16px;
-                border-radius: 8px;
-                font-size: 12px;
-            }
-            QPushButton#closeButton:hover {
-                background-color: #c0392b;
-            }
-            QLabel {
-                font-size: 11px;
-            }
-        """)
+        # Styled by the application theme (components/theme.py)
+        self.setObjectName("appWindow")
         
         # Set size policy to make the widget expandable
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
@@ -81,7 +141,7 @@ class AppWindow(QFrame):
         header = QHBoxLayout()
         header.setSpacing(3)
         title = QLabel(self.app_name)
-        title.setStyleSheet("font-weight: bold;")
+        title.setObjectName("appWindowTitle")
         close_btn = QPushButton("×")
         close_btn.setObjectName("closeButton")
         close_btn.clicked.connect(self.close_app)
@@ -90,7 +150,7 @@ class AppWindow(QFrame):
         
         # Content area
         content = QLabel(f"Type: {self.app_type}")
-        content.setStyleSheet("color: #666;")
+        content.setObjectName("appWindowType")
         
         # Add launch button
         launch_btn = QPushButton("Launch")
@@ -108,121 +168,117 @@ class AppWindow(QFrame):
     def launch_app(self):
         self.launchRequested.emit(self.app_name)
 
-class AppContainer(QWidget):
-    def __init__(self, app_manager, parent=None):
-        super().__init__(parent)
-        self.app_manager = app_manager
-        self.app_windows = {}
-        self.initUI()
-        
-    def initUI(self):
-        # Use QGridLayout for responsive app windows
-        self.layout = QGridLayout(self)
-        self.layout.setSpacing(5)
-        self.layout.setContentsMargins(5, 5, 5, 5)
+class AppContainer(TileGrid):
+    """Tiles for the apps that run inside the overlay: cameras and image editors
+
+    A tile's Launch and × buttons call ``launch`` and ``close`` with its
+    app's name, so they go through the same checks as the nav list.
+    ``open_app`` starts a camera's capture and arms its recorder, or puts
+    an editor in the tile. The video modules (and OpenCV) load with the
+    first camera tile, the editor with the first editor opened.
+    """
+
+    TYPES = ('Camera', 'Image Editor')
+
+    def __init__(self, launch, close, columns=2, parent=None, video_manager=None):
+        super().__init__(columns, parent)
+        self.launch = launch
+        self.close_app = close
+        self.app_windows = self.tiles
+        self.video_manager = video_manager
+        self.video_renderer = None
+        self.video_tiles = {}
+        self.editors = {}
+        self.recordings = None
+        self.record_buttons = {}
         
     def add_app_window(self, app_name: str, app_type: str):
         if app_name not in self.app_windows:
             app_window = AppWindow(app_name, app_type, self)
-            app_window.closeRequested.connect(self.remove_app)
-            app_window.launchRequested.connect(self.launch_app)
-            self.app_windows[app_name] = app_window
-            
-            # Calculate position in grid
-            count = len(self.app_windows) - 1
-            row = count // 2  # 2 columns
-            col = count % 2
-            
-            self.layout.addWidget(app_window, row, col)
+            app_window.closeRequested.connect(self.close_app)
+            app_window.launchRequested.connect(self.launch)
+            if app_type == 'Camera':
+                self.add_video_tile(app_name, app_window)
+            self.add_tile(app_name, app_window)
+
+    def add_video_tile(self, app_name: str, app_window: AppWindow):
+        from components.video_tile import VideoRenderer, VideoTile
+        if self.video_manager is None:
+            from video_manager import VideoManager
+            self.video_manager = VideoManager()
+        if self.video_renderer is None:
+            self.video_renderer = VideoRenderer(self.video_manager, parent=self)
+        tile = VideoTile(app_name, app_window)
+        # Below the title, above the type label and launch button
+        app_window.layout().insertWidget(1, tile, 1)
+        self.video_renderer.add_tile(tile)
+        self.video_tiles[app_name] = tile
+        record_btn = QPushButton("Record")
+        record_btn.setObjectName("recordButton")
+        record_btn.setCheckable(True)
+        record_btn.setFixedHeight(20)
+        record_btn.toggled.connect(lambda checked, name=app_name: self.set_recording(name, checked))
+        app_window.layout().addWidget(record_btn)
+        self.record_buttons[app_name] = record_btn
+
+    def open_app(self, app_name: str, app_type: str, config: dict):
+        """Start ``app_name`` in its tile; raises if it cannot be"""
+        app_window = self.app_windows.get(app_name)
+        if app_window is None or app_type not in self.TYPES:
+            raise ValueError(f"{app_type} apps cannot be launched here")
+        if app_type == 'Camera':
+            # The connection ID field holds a camera index, file or URL
+            source = config.get('connection_id', '0')
+            if not self.video_manager.open_stream(app_name, int(source) if source.isdigit() else source):
+                raise RuntimeError(f"{app_name} is already running")
+            self.arm_recorder(app_name)
+        else:
+            if app_name in self.editors:
+                raise RuntimeError(f"{app_name} is already open")
+            # OpenCV is imported on first use of the editor, not at startup
+            from components.image_editor_menu import ImageEditorMenu
+            editor = ImageEditorMenu(app_window)
+            app_window.layout().insertWidget(1, editor, 1)
+            self.editors[app_name] = editor
+
+    def arm_recorder(self, app_name: str):
+        # Attached as soon as the stream opens, so the pre-roll is full by
+        # the time Record is pressed
+        if self.recordings is None:
+            from recorder import RecordingManager
+            self.recordings = RecordingManager(self.video_manager, RECORDINGS_DIR, preroll_seconds=PREROLL_SECONDS)
+        return self.recordings.arm(app_name)
+
+    def set_recording(self, app_name: str, recording: bool):
+        if recording:
+            if not self.arm_recorder(app_name) or not self.recordings.start(app_name):
+                # The stream is not open yet
+                self.record_buttons[app_name].setChecked(False)
+        elif self.recordings:
+            self.recordings.stop(app_name)
             
-    def remove_app(self, app_name: str):
-        if app_name in self.app_windows:
-            app_window = self.app_windows[app_name]
-            self.layout.removeWidget(app_window)
+    def remove_app_window(self, app_name: str):
+        # Only the windows after this one move up a cell
+        app_window = self.remove_tile(app_name)
+        if app_window:
+            tile = self.video_tiles.pop(app_name, None)
+            if tile:
+                self.video_renderer.remove_tile(tile)
+                self.record_buttons.pop(app_name, None)
+                if self.recordings:
+                    self.recordings.disarm(app_name)
+                self.video_manager.close_stream(app_name)
+            self.editors.pop(app_name, None)
             app_window.deleteLater()
-            del self.app_windows[app_name]
-            self.app_manager.remove_app(app_name)
-            
-            # Rearrange remaining windows
-            self.rearrange_windows()
-            
-    def rearrange_windows(self):
-        # Remove all widgets from layout
-        while self.layout.count():
-            item = self.layout.takeAt(0)
-            if item.widget():
-                item.widget().setParent(None)
-        
-        # Add widgets back in order
-        for i, (app_name, window) in enumerate(self.app_windows.items()):
-            row = i // 2
-            col = i % 2
-            self.layout.addWidget(window, row, col)
-            
-    def launch_app(self, app_name: str):
-        app_data = self.app_manager.apps.get(app_name)
-        if not app_data:
-            return
-            
-        try:
-            if app_data['type'] == 'TeamViewer':
-                teamviewer_path = self.find_teamviewer_path()
-                if not teamviewer_path:
-                    QMessageBox.warning(self, "Error", "TeamViewer is not installed or not found.")
-                    return
-                subprocess.Popen([teamviewer_path, '--id', app_data['config']['connection_id']])
-            elif app_data['type'] == 'OBS Studio':
-                obs_path = self.find_obs_path()
-                if not obs_path:
-                    QMessageBox.warning(self, "Error", "OBS Studio is not installed or not found.")
-                    return
-                self.app_manager.launch_obs(app_data['config'].get('stream_key', ''))
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to launch {app_data['type']}: {str(e)}")
-            
-    def find_teamviewer_path(self):
-        if sys.platform == 'darwin':  # macOS
-            paths = [
-                '/Applications/TeamViewer.app/Contents/MacOS/TeamViewer',
-                os.path.expanduser('~/Applications/TeamViewer.app/Contents/MacOS/TeamViewer')
-            ]
-        elif sys.platform == 'win32':  # Windows
-            paths = [
-                'C:\\Program Files\\TeamViewer\\TeamViewer.exe',
-                'C:\\Program Files (x86)\\TeamViewer\\TeamViewer.exe'
-            ]
-        else:  # Linux
-            paths = [
-                '/usr/bin/teamviewer',
-                '/opt/teamviewer/teamviewer'
-            ]
-            
-        for path in paths:
-            if os.path.exists(path):
-                return path
-        return None
-        
-    def find_obs_path(self):
-        if sys.platform == 'darwin':  # macOS
-            paths = [
-                '/Applications/OBS.app/Contents/MacOS/obs',
-                os.path.expanduser('~/Applications/OBS.app/Contents/MacOS/obs')
-            ]
-        elif sys.platform == 'win32':  # Windows
-            paths = [
-                'C:\\Program Files\\obs-studio\\bin\\64bit\\obs64.exe',
-                'C:\\Program Files (x86)\\obs-studio\\bin\\32bit\\obs32.exe'
-            ]
-        else:  # Linux
-            paths = [
-                '/usr/bin/obs',
-                '/usr/local/bin/obs'
-            ]
-            
-        for path in paths:
-            if os.path.exists(path):
-                return path
-        return None
+
+    def close_all(self):
+        """Finish recordings and stop every capture, e.g. on exit"""
+        if self.recordings:
+            self.recordings.close_all()
+        if self.video_renderer:
+            self.video_renderer.stop()
+        if self.video_manager:
+            self.video_manager.close_all()
 
 class AddAppDialog(QDialog):
     def __init__(self, parent=None):
@@ -230,7 +286,7 @@ class AddAppDialog(QDialog):
         self.setWindowTitle("Add Application")
         layout = QFormLayout(self)
         self.app_type = QComboBox()
-        self.app_type.addItems(["TeamViewer", "OBS Studio", "Image Editor"])
+        self.app_type.addItems(["TeamViewer", "OBS Studio", "Image Editor", "Camera"])
         layout.addRow("Application Type:", self.app_type)
         self.connection_id = QLineEdit()
         layout.addRow("Connection ID:", self.connection_id)
@@ -248,426 +304,102 @@ class AddAppDialog(QDialog):
             'connection_id': self.connection_id.text()
         }
 
-class NavButton(QPushButton):
-    def __init__(self, text, icon=None, parent=None):
-        super().__init__(parent)
-        self.setText(text)
-        if icon:
-            self.setIcon(icon)
-        self.setCheckable(True)
-        self.setStyleSheet('''
-            QPushButton {
-                background-color: transparent;
-                color: #d6d6d6;
-                border: none;
-                text-align: left;
-                padding: 8px 12px;
-                font-size: 13px;
-                border-radius: 4px;
-            }
-            QPushButton:checked, QPushButton:hover {
-                background-color: #23272e;
-                color: #fff;
-            }
-        ''')
-        self.setMinimumHeight(32)
-        self.setIconSize(QSize(18, 18))
-
-class AppNavButton(QWidget):
-    def __init__(self, app_name, icon, delete_callback, select_callback, launch_callback, parent=None):
-        super().__init__(parent)
-        self.app_name = app_name
-        self.delete_callback = delete_callback
-        self.select_callback = select_callback
-        self.launch_callback = launch_callback
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(0)
-        self.button = NavButton(app_name, icon)
-        self.button.clicked.connect(self.on_select)
-        self.button.installEventFilter(self)
-        layout.addWidget(self.button)
-        self.delete_btn = QPushButton()
-        self.delete_btn.setIcon(QIcon.fromTheme('edit-delete') or QIcon())
-        self.delete_btn.setFixedSize(24, 24)
-        self.delete_btn.setStyleSheet('''
-            QPushButton { background: transparent; border: none; color: #e74c3c; }
-            QPushButton:hover { background: #2c3e50; }
-        ''')
-        self.delete_btn.clicked.connect(self.on_delete)
-        layout.addWidget(self.delete_btn)
-        self.setLayout(layout)
-    def on_delete(self):
-        self.delete_callback(self.app_name)
-    def on_select(self):
-        self.select_callback(self.button, self.app_name)
-    def setChecked(self, checked):
-        self.button.setChecked(checked)
-    def eventFilter(self, obj, event):
-        if obj == self.button and event.type() == QEvent.MouseButtonDblClick:
-            self.launch_callback(self.app_name)
-            return True
-        return super().eventFilter(obj, event)
-
-class ProfileDialog(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Profile Information")
-        self.setFixedSize(250, 150)
-        layout = QVBoxLayout(self)
-        # Mock data
-        layout.addWidget(QLabel("<b>Username:</b> johndoe"))
-        layout.addWidget(QLabel("<b>Email:</b> johndoe@example.com"))
-        layout.addWidget(QLabel("<b>Role:</b> Admin"))
-        layout.addStretch()
-        close_btn = QPushButton("Close")
-        close_btn.clicked.connect(self.accept)
-        layout.addWidget(close_btn, alignment=Qt.AlignRight)
-
-class ImageEditorMenu(QWidget):
-    def __init__(self, parent=None):
+def select_app(name):
+    """Nav row click handler; AppNavButton passes the row's app name"""
+    print(f"Selected app: {name}")
+
+def argv_option(flag, default):
+    """Value following ``flag`` on the command line, e.g. ``--control-port 8781``"""
+    if flag in sys.argv[:-1]:
+        return sys.argv[sys.argv.index(flag) + 1]
+    return default
+
+def start_control_service(app_manager, launch, parent=None):
+    """Serve ``app_manager`` to remote overlays; None if the port is taken
+
+    Listens on localhost unless started with ``--control-host``; run a
+    second instance with ``--control-port`` to try it on one machine.
+    """
+    from control_plane import DEFAULT_PORT, ControlService
+    host = argv_option('--control-host', 'localhost')
+    port = int(argv_option('--control-port', DEFAULT_PORT))
+    service = ControlService(app_manager, launch, host, port, parent)
+    return service if service.start() else None
+
+class AppLoader(QObject):
+    """Reads an AppManager's saved apps on a worker thread
+
+    The result is queued back to the Qt thread and merged there
+    (AppManager.merge_loaded), so apps added before it arrives are kept
+    and the catalog is only ever touched on the Qt thread. ``loaded``
+    fires after the merge.
+    """
+
+    loaded = Signal()
+    _read = Signal(object)
+
+    def __init__(self, app_manager, parent=None):
         super().__init__(parent)
-        layout = QVBoxLayout(self)
-        label = QLabel("<b>Image Editor Menu (Mock)</b>")
-        label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(label)
-        layout.addStretch()
-
-class OverlayWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.app_manager = AppManager()
-        self.selected_nav_name = None
-        self.nav_buttons = {}
-        self._drag_pos = None
-        self.initUI()
-        self.setup_shortcuts()
-        self.start_global_hotkey_listener()
-        
-    def initUI(self):
-        self.setWindowFlags(
-            Qt.FramelessWindowHint
-        )
-        # Sidebar as main window
-        sidebar_widget = QWidget()
-        sidebar_layout = QVBoxLayout(sidebar_widget)
-        sidebar_layout.setContentsMargins(0, 10, 0, 0)
-        sidebar_layout.setSpacing(0)
-
-        # --- Profile icon row ---
-        profile_row = QHBoxLayout()
-        profile_row.addStretch()
-        self.profile_btn = QPushButton()
-        try:
-            user_icon = QIcon("user.svg")
-            if not user_icon.isNull():
-                self.profile_btn.setIcon(user_icon)
-            else:
-                self.profile_btn.setIcon(QIcon.fromTheme('user-identity') or QIcon())
-        except Exception:
-            self.profile_btn.setIcon(QIcon.fromTheme('user-identity') or QIcon())
-        self.profile_btn.setIconSize(QSize(28, 28))
-        self.profile_btn.setFixedSize(36, 36)
-        self.profile_btn.setStyleSheet('''
-            QPushButton { background: transparent; border: none; }
-            QPushButton:hover { background: #e0e0e0; }
-        ''')
-        self.profile_btn.clicked.connect(self.show_profile_dialog)
-        profile_row.addWidget(self.profile_btn)
-        sidebar_layout.addLayout(profile_row)
-
-        # --- Menu toggle buttons ---
-        toggle_row = QHBoxLayout()
-        self.menu1_btn = QPushButton("My PC")
-        self.menu2_btn = QPushButton("Remote PC")
-        for btn in (self.menu1_btn, self.menu2_btn):
-            btn.setCheckable(True)
-            btn.setStyleSheet('''
-                QPushButton { background: #23272e; color: #67c1f5; border: none; font-size: 13px; padding: 8px 0; border-radius: 8px; }
-                QPushButton:checked { background: #67c1f5; color: #23272e; }
-                QPushButton:hover { background: #2c3e50; }
-            ''')
-            btn.setFixedHeight(32)
-        self.menu1_btn.setChecked(True)
-        self.menu1_btn.clicked.connect(lambda: self.switch_menu(0))
-        self.menu2_btn.clicked.connect(lambda: self.switch_menu(1))
-        toggle_row.addWidget(self.menu1_btn)
-        toggle_row.addWidget(self.menu2_btn)
-        sidebar_layout.addLayout(toggle_row)
-
-        # --- Stacked menus ---
-        self.stacked = QStackedWidget()
-        # Menu 1: App management
-        menu1 = QWidget()
-        menu1_layout = QVBoxLayout(menu1)
-        self.add_app_button = QPushButton("+ Add App")
-        self.add_app_button.setStyleSheet('''
-            QPushButton {
-                background-color: #23272e;
-                color: #67c1f5;
-                border: none;
-                font-size: 13px;
-                padding: 8px 0;
-                border-radius: 0 8px 8px 0;
-            }
-            QPushButton:hover {
-                background-color: #2c3e50;
-            }
-        ''')
-        self.add_app_button.setFixedHeight(36)
-        self.add_app_button.clicked.connect(self.add_app)
-        menu1_layout.addWidget(self.add_app_button)
-        sep = QFrame()
-        sep.setFrameShape(QFrame.HLine)
-        sep.setStyleSheet('color: #23272e; background: #23272e; margin: 8px 0;')
-        menu1_layout.addWidget(sep)
-        self.app_nav_container = QWidget()
-        self.app_nav_layout = QVBoxLayout(self.app_nav_container)
-        self.app_nav_layout.setContentsMargins(0, 0, 0, 0)
-        self.app_nav_layout.setSpacing(0)
-        menu1_layout.addWidget(self.app_nav_container)
-        menu1_layout.addStretch()
-        self.stacked.addWidget(menu1)
-        # Menu 2: Image editor menu (mock)
-        self.stacked.addWidget(ImageEditorMenu())
-        sidebar_layout.addWidget(self.stacked)
-        sidebar_layout.addStretch()
-        self.setCentralWidget(sidebar_widget)
-        self.setGeometry(100, 100, 220, 600)
-        self.refresh_navbar()
-
-    def setup_shortcuts(self):
-        # Minimize/Maximize shortcut (Cmd+Shift+Space)
-        shortcut = QShortcut(QKeySequence('Meta+Shift+Space'), self)
-        shortcut.activated.connect(self.toggle_minimize)
-        
-    def toggle_minimize(self):
-        if self.isMinimized() or not self.isActiveWindow():
-            self.showNormal()
-            self.raise_()
-            self.activateWindow()
-        else:
-            self.showMinimized()
-            
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self._drag_pos = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
-            event.accept()
-
-    def mouseMoveEvent(self, event):
-        if self._drag_pos and event.buttons() & Qt.LeftButton:
-            self.move(event.globalPosition().toPoint() - self._drag_pos)
-            event.accept()
-
-    def mouseReleaseEvent(self, event):
-        self._drag_pos = None
-        event.accept()
-
-    def refresh_navbar(self):
-        for i in reversed(range(self.app_nav_layout.count())):
-            widget = self.app_nav_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-        self.nav_buttons.clear()
-        for app_name, app_data in self.app_manager.apps.items():
-            icon = QIcon()  # Placeholder, can use real icons per app type
-            btn = AppNavButton(
-                app_name, icon,
-                delete_callback=self.delete_app,
-                select_callback=self.select_nav,
-                launch_callback=self.launch_app
-            )
-            self.app_nav_layout.addWidget(btn)
-            self.nav_buttons[app_name] = btn
-        # Restore selection if possible
-        if self.selected_nav_name in self.nav_buttons:
-            self.nav_buttons[self.selected_nav_name].setChecked(True)
-        else:
-            self.selected_nav_name = None
-
-    def select_nav(self, btn, app_name):
-        # Uncheck previous selection
-        if self.selected_nav_name and self.selected_nav_name in self.nav_buttons:
-            self.nav_buttons[self.selected_nav_name].setChecked(False)
-        btn.setChecked(True)
-        self.selected_nav_name = app_name
-
-    def delete_app(self, app_name):
-        if app_name in self.app_manager.apps:
-            self.app_manager.remove_app(app_name)
-            self.refresh_navbar()
-
-    def launch_app(self, app_name):
-        app_data = self.app_manager.apps.get(app_name)
-        if not app_data:
-            return
+        self.app_manager = app_manager
+        self._read.connect(self._on_read, Qt.QueuedConnection)
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
         try:
-            if app_data['type'] == 'TeamViewer':
-                teamviewer_path = self.find_teamviewer_path()
-                if not teamviewer_path:
-                    QMessageBox.warning(self, "Error", "TeamViewer is not installed or not found.")
-                    return
-                subprocess.Popen([teamviewer_path, '--id', app_data['config']['connection_id']])
-            elif app_data['type'] == 'OBS Studio':
-                obs_path = self.find_obs_path()
-                if not obs_path:
-                    QMessageBox.warning(self, "Error", "OBS Studio is not installed or not found.")
-                    return
-                self.app_manager.launch_obs(app_data['config'].get('stream_key', ''))
+            apps = self.app_manager.store.load()
         except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to launch {app_data['type']}: {str(e)}")
-
-    def find_teamviewer_path(self):
-        if sys.platform == 'darwin':  # macOS
-            paths = [
-                '/Applications/TeamViewer.app/Contents/MacOS/TeamViewer',
-                os.path.expanduser('~/Applications/TeamViewer.app/Contents/MacOS/TeamViewer')
-            ]
-        elif sys.platform == 'win32':  # Windows
-            paths = [
-                'C:\\Program Files\\TeamViewer\\TeamViewer.exe',
-                'C:\\Program Files (x86)\\TeamViewer\\TeamViewer.exe'
-            ]
-        else:  # Linux
-            paths = [
-                '/usr/bin/teamviewer',
-                '/opt/teamviewer/teamviewer'
-            ]
-        for path in paths:
-            if os.path.exists(path):
-                return path
-        return None
-        
-    def find_obs_path(self):
-        if sys.platform == 'darwin':  # macOS
-            paths = [
-                '/Applications/OBS.app/Contents/MacOS/obs',
-                os.path.expanduser('~/Applications/OBS.app/Contents/MacOS/obs')
-            ]
-        elif sys.platform == 'win32':  # Windows
-            paths = [
-                'C:\\Program Files\\obs-studio\\bin\\64bit\\obs64.exe',
-                'C:\\Program Files (x86)\\obs-studio\\bin\\32bit\\obs32.exe'
-            ]
-        else:  # Linux
-            paths = [
-                '/usr/bin/obs',
-                '/usr/local/bin/obs'
-            ]
-            
-        for path in paths:
-            if os.path.exists(path):
-                return path
-        return None
+            print(f"Error loading apps: {e}")
+            apps = {}
+        self._read.emit(apps)
 
-    def add_app(self):
-        dialog = AddAppDialog(self)
-        if dialog.exec():
-            app_data = dialog.get_app_data()
-            app_name = f"{app_data['type']}_{app_data['connection_id']}"
-            print(f"Attempting to add app: {app_name}")
-            if app_name not in self.app_manager.apps:
-                # Placeholder icon
-                icon = QIcon()
-                def launch_app(name):
-                    data = self.app_manager.apps.get(name)
-                    if not data:
-                        return
-                    try:
-                        if data['type'] == 'TeamViewer':
-                            teamviewer_path = self.find_teamviewer_path()
-                            if not teamviewer_path:
-                                QMessageBox.warning(self, "Error", "TeamViewer is not installed or not found.")
-                                return
-                            subprocess.Popen([teamviewer_path, '--id', data['connection_id']])
-                        elif data['type'] == 'OBS Studio':
-                            obs_path = self.find_obs_path()
-                            if not obs_path:
-                                QMessageBox.warning(self, "Error", "OBS Studio is not installed or not found.")
-                                return
-                            # Add OBS launch logic here
-                            QMessageBox.information(self, "OBS", "OBS Studio launch (mock)")
-                    except Exception as e:
-                        QMessageBox.warning(self, "Error", f"Failed to launch {data['type']}: {str(e)}")
-                def delete_app(name):
-                    if name in self.app_manager.apps:
-                        app_btn.setParent(None)
-                        self.app_manager.remove_app(name)
-                        self.refresh_navbar()
-                        print(f"Deleted app: {name}")
-                def select_app(name):
-                    print(f"Selected app: {name}")
-                app_btn = AppNavButton(app_name, icon, delete_app, select_app, launch_app)
-                # Remove any existing stretch at the end
-                count = self.app_nav_layout.count()
-                if count > 0 and self.app_nav_layout.itemAt(count-1).spacerItem():
-                    self.app_nav_layout.takeAt(count-1)
-                self.app_nav_layout.addWidget(app_btn)
-                self.app_nav_layout.addStretch()
-                self.app_nav_layout.update()
-                self.app_nav_layout.repaint()
-                print(f"Added app widget: {app_name}")
-                self.app_manager.add_app(
-                    app_name=app_name,
-                    app_type=data['type'],
-                    config={'connection_id': data['connection_id']}
-                )
-                QMessageBox.information(self, "Success", "Application added successfully!")
-            else:
-                print(f"App already exists: {app_name}")
-                QMessageBox.warning(self, "Error", "App already exists!")
+    def _on_read(self, apps):
+        self.app_manager.merge_loaded(apps)
+        self.loaded.emit()
 
-    def start_global_hotkey_listener(self):
-        def on_press(key):
-            try:
-                if (
-                    key == keyboard.Key.space and
-                    self._hotkey_mods['cmd'] and
-                    self._hotkey_mods['shift']
-                ):
-                    self.toggle_minimize()
-            except Exception:
-                pass
-        def on_release(key):
-            if key == keyboard.Key.cmd:
-                self._hotkey_mods['cmd'] = False
-            if key == keyboard.Key.shift:
-                self._hotkey_mods['shift'] = False
-        def on_mod(key, pressed):
-            if key == keyboard.Key.cmd:
-                self._hotkey_mods['cmd'] = pressed
-            if key == keyboard.Key.shift:
-                self._hotkey_mods['shift'] = pressed
-        self._hotkey_mods = {'cmd': False, 'shift': False}
-        def listener_thread():
-            with keyboard.Listener(
-                on_press=lambda key: (on_mod(key, True), on_press(key)),
-                on_release=lambda key: (on_mod(key, False), on_release(key))
-            ) as listener:
-                listener.join()
-        t = threading.Thread(target=listener_thread, daemon=True)
-        t.start()
-
-    def bring_to_front(self):
-        # Use pyobjc to bring the app to the front
-        app = NSRunningApplication.runningApplicationWithProcessIdentifier_(os.getpid())
-        app.activateWithOptions_(NSApplicationActivateIgnoringOtherApps)
-        self.showNormal()
-        self.raise_()
-        self.activateWindow()
-
-    def show_profile_dialog(self):
-        dlg = ProfileDialog(self)
-        dlg.exec()
-
-    def switch_menu(self, idx):
-        self.stacked.setCurrentIndex(idx)
-        self.menu1_btn.setChecked(idx == 0)
-        self.menu2_btn.setChecked(idx == 1)
+def toggle_minimize(window):
+    if window.isMinimized() or not window.isActiveWindow():
+        window.showNormal()
+        window.raise_()
+        window.activateWindow()
+    else:
+        window.showMinimized()
+
+def install_hotkeys(window, actions, hotkeys=None):
+    """Run ``actions[action]()`` whenever a bound hotkey fires; returns the HotkeyManager
+
+    In-window shortcuts cover every binding until (or unless) the global
+    hotkeys are registered, which happens once the event loop runs.
+    """
+    hotkeys = hotkeys or HotkeyManager(parent=window)
+
+    def on_hotkey(action):
+        handler = actions.get(action)
+        if handler:
+            handler()
+        else:
+            print(f"Unknown hotkey action: {action}")
+    hotkeys.activated.connect(on_hotkey)
+    shortcuts = []
+    for action, chord in hotkeys.bindings.items():
+        shortcut = QShortcut(QKeySequence(to_key_sequence(chord)), window)
+        shortcut.activated.connect(lambda action=action: on_hotkey(action))
+        shortcuts.append(shortcut)
+
+    def start():
+        if hotkeys.start():
+            # The global grab already covers the window; keeping both would
+            # toggle twice per press
+            for shortcut in shortcuts:
+                shortcut.setEnabled(False)
+    QTimer.singleShot(0, start)
+    return hotkeys
 
 class SignInDialog(QDialog):
-    def __init__(self, parent=None):
+    def __init__(self, authenticator, parent=None):
         super().__init__(parent)
+        self.authenticator = authenticator
         self.setWindowTitle("Sign In")
         self.setFixedSize(300, 180)
         layout = QVBoxLayout(self)
@@ -680,140 +412,151 @@ class SignInDialog(QDialog):
         self.pass_input.setEchoMode(QLineEdit.Password)
         layout.addWidget(self.pass_input)
         self.error_label = QLabel("")
-        self.error_label.setStyleSheet("color: red;")
+        self.error_label.setObjectName("errorLabel")
         layout.addWidget(self.error_label)
-        btn = QPushButton("Sign In")
-        btn.clicked.connect(self.try_login)
-        layout.addWidget(btn)
+        self.sign_in_btn = QPushButton("Sign In")
+        self.sign_in_btn.clicked.connect(self.try_login)
+        layout.addWidget(self.sign_in_btn)
         self.success = False
+        self.claims = None
     def try_login(self):
-        if self.user_input.text() == "admin" and self.pass_input.text() == "admin":
+        # The password hash runs on a worker; the dialog stays responsive
+        username = self.user_input.text()
+        self.sign_in_btn.setEnabled(False)
+        self.error_label.setText("Signing in...")
+        self.authenticator.authenticate(username, self.pass_input.text(),
+                                        lambda role, error: self.on_login_result(username, role, error))
+    def on_login_result(self, username, role, error):
+        self.sign_in_btn.setEnabled(True)
+        if role:
+            # The session token also authorises this overlay to its peers
+            self.claims = tokens.sign_in(username, role)
             self.success = True
             self.accept()
         else:
-            self.error_label.setText("Invalid username or password.")
+            self.pass_input.clear()
+            self.error_label.setText(error)
 
 def main():
+    imports_done = time.perf_counter()
     app = QApplication(sys.argv)
+    # --profile-startup prints time-to-first-frame per phase
+    profiler = StartupProfiler(_IMPORT_START, enabled='--profile-startup' in sys.argv)
+    profiler.mark('imports', at=imports_done)
+    theme = ThemeManager(app)
+    theme.apply('dark')
+    profiler.mark('QApplication and theme')
+    # Probe for launchable apps and load the user store while the user signs in
+    resolver.warm_up()
+    authenticator = Authenticator()
+    authenticator.warm_up()
     # Show sign-in dialog first
-    signin = SignInDialog()
+    signin = SignInDialog(authenticator)
+    profiler.pause('sign-in dialog')
     if not signin.exec():
         sys.exit(0)
+    authenticator.close()
+    profiler.resume()
     # If login successful, show main app
     main_window = QMainWindow()
     main_window.setWindowTitle("Overlay App")
-    # App navigation container for Sidebar
-    app_nav_container = QWidget()
-    app_nav_layout = QVBoxLayout(app_nav_container)
-    app_nav_layout.setContentsMargins(0, 0, 0, 0)
-    app_nav_layout.setSpacing(0)
-    sidebar = Sidebar(app_nav_container, app_nav_layout)
-
-    # App management state
-    apps = {}
+    # App management state, also served to remote overlays. Saved apps are
+    # read in the background and appear once loaded.
+    app_manager = AppManager(autoload=False)
+    app_manager.session = signin.claims
+    launcher = ProcessLauncher(app_manager, parent=main_window)
+    app_loader = AppLoader(app_manager, main_window)
+    app_loader.loaded.connect(launcher.reset_statuses)
+    obs_controllers = {}
+
+    def remote_launch(name):
+        # For the control service: errors go back to the caller, never to a dialog
+        return start_app(app_manager, launcher, obs_controllers, name, main_window, tiles)
+    def launch_app(name):
+        try:
+            started = remote_launch(name)
+        except Exception as e:
+            QMessageBox.warning(main_window, "Error", f"Failed to launch {name}: {str(e)}")
+            return
+        if started is not None:
+            warn_on_failure(main_window, started)
+    def delete_app(name):
+        try:
+            if app_manager.remove_app(name):
+                print(f"Deleted app: {name}")
+                controller = obs_controllers.pop(name, None)
+                if controller:
+                    controller.stop()
+        except PermissionDenied as e:
+            QMessageBox.warning(main_window, "Error", str(e))
+    def make_button(name):
+        # Placeholder icon
+        return AppNavButton(name, QIcon(), delete_app, select_app, launch_app)
+
+    # App navigation list for Sidebar
+    app_nav_list = AppNavList(make_button)
+    sidebar = Sidebar(app_nav_list, app_nav_list.layout)
+    sidebar.setFixedWidth(220)
+    # Cameras and image editors run in tiles beside the sidebar, shown once there are any
+    tiles = AppContainer(launch_app, delete_app)
+    tiles.hide()
+
+    def on_apps_changed(changed, removed):
+        # Local and remote edits alike arrive here
+        for name in removed:
+            app_nav_list.remove(name)
+            tiles.remove_app_window(name)
+        for name in changed:
+            app = app_manager.apps[name]
+            app_nav_list.add(name).set_status(app['status'])
+            if app['type'] in AppContainer.TYPES:
+                tiles.add_app_window(name, app['type'])
+        tiles.setVisible(bool(tiles.tiles))
+    app_manager.add_listener(on_apps_changed)
+    app_loader.start()
+
     def handle_add_app():
         dialog = AddAppDialog(main_window)
         if dialog.exec():
             app_data = dialog.get_app_data()
             app_name = f"{app_data['type']}_{app_data['connection_id']}"
             print(f"Attempting to add app: {app_name}")
-            if app_name not in apps:
-                # Placeholder icon
-                icon = QIcon()
-                def launch_app(name):
-                    data = apps.get(name)
-                    if not data:
-                        return
-                    try:
-                        if data['type'] == 'TeamViewer':
-                            teamviewer_path = find_teamviewer_path()
-                            if not teamviewer_path:
-                                QMessageBox.warning(main_window, "Error", "TeamViewer is not installed or not found.")
-                                return
-                            subprocess.Popen([teamviewer_path, '--id', data['connection_id']])
-                        elif data['type'] == 'OBS Studio':
-                            obs_path = find_obs_path()
-                            if not obs_path:
-                                QMessageBox.warning(main_window, "Error", "OBS Studio is not installed or not found.")
-                                return
-                            # Add OBS launch logic here
-                            QMessageBox.information(main_window, "OBS", "OBS Studio launch (mock)")
-                    except Exception as e:
-                        QMessageBox.warning(main_window, "Error", f"Failed to launch {data['type']}: {str(e)}")
-                def delete_app(name):
-                    if name in apps:
-                        app_btn.setParent(None)
-                        del apps[name]
-                        app_nav_container.adjustSize()
-                        app_nav_container.update()
-                        app_nav_container.repaint()
-                        print(f"Deleted app: {name}")
-                def select_app(name):
-                    print(f"Selected app: {name}")
-                app_btn = AppNavButton(app_name, icon, delete_app, select_app, launch_app)
-                # Remove any existing stretch at the end
-                count = app_nav_layout.count()
-                if count > 0 and app_nav_layout.itemAt(count-1).spacerItem():
-                    app_nav_layout.takeAt(count-1)
-                app_nav_layout.addWidget(app_btn)
-                app_nav_layout.addStretch()
-                app_nav_container.adjustSize()
-                app_nav_container.update()
-                app_nav_container.repaint()
+            try:
+                added = app_manager.add_app(app_name, app_data['type'], {'connection_id': app_data['connection_id']})
+            except PermissionDenied as e:
+                QMessageBox.warning(main_window, "Error", str(e))
+                return
+            if added:
                 print(f"Added app widget: {app_name}")
-                apps[app_name] = app_data
                 QMessageBox.information(main_window, "Success", "Application added successfully!")
             else:
                 print(f"App already exists: {app_name}")
                 QMessageBox.warning(main_window, "Error", "App already exists!")
     sidebar.add_app_requested.connect(handle_add_app)
 
-    def find_teamviewer_path():
-        if sys.platform == 'darwin':  # macOS
-            paths = [
-                '/Applications/TeamViewer.app/Contents/MacOS/TeamViewer',
-                os.path.expanduser('~/Applications/TeamViewer.app/Contents/MacOS/TeamViewer')
-            ]
-        elif sys.platform == 'win32':  # Windows
-            paths = [
-                'C:\\Program Files\\TeamViewer\\TeamViewer.exe',
-                'C:\\Program Files (x86)\\TeamViewer\\TeamViewer.exe'
-            ]
-        else:  # Linux
-            paths = [
-                '/usr/bin/teamviewer',
-                '/opt/teamviewer/teamviewer'
-            ]
-        for path in paths:
-            if os.path.exists(path):
-                return path
-        return None
-
-    def find_obs_path():
-        if sys.platform == 'darwin':  # macOS
-            paths = [
-                '/Applications/OBS.app/Contents/MacOS/obs',
-                os.path.expanduser('~/Applications/OBS.app/Contents/MacOS/obs')
-            ]
-        elif sys.platform == 'win32':  # Windows
-            paths = [
-                'C:\\Program Files\\obs-studio\\bin\\64bit\\obs64.exe',
-                'C:\\Program Files (x86)\\obs-studio\\bin\\32bit\\obs32.exe'
-            ]
-        else:  # Linux
-            paths = [
-                '/usr/bin/obs',
-                '/usr/local/bin/obs'
-            ]
-        for path in paths:
-            if os.path.exists(path):
-                return path
-        return None
-
-    main_window.setCentralWidget(sidebar)
+    central = QWidget()
+    layout = QHBoxLayout(central)
+    layout.setContentsMargins(0, 0, 0, 0)
+    layout.addWidget(sidebar)
+    layout.addWidget(tiles, 1)
+    main_window.setCentralWidget(central)
     main_window.setGeometry(100, 100, 220, 600)
+    hotkeys = install_hotkeys(main_window, {'toggle_overlay': lambda: toggle_minimize(main_window)})
+    profiler.mark('main window')
+    profiler.watch_first_frame(main_window)
     main_window.show()
-    sys.exit(app.exec())
+    # Served once the window is up, so msgpack and websockets load after the first frame
+    control = []
+    QTimer.singleShot(0, lambda: control.append(start_control_service(app_manager, remote_launch, main_window)))
+    status = app.exec()
+    for service in control:
+        if service:
+            service.stop()
+    for controller in obs_controllers.values():
+        controller.stop()
+    tiles.close_all()
+    hotkeys.stop()
+    sys.exit(status)
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
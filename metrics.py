@@ -0,0 +1,22 @@
+class MovingAverage:
+    """Exponentially weighted moving average of a series of samples, and its peak
+
+    The first sample seeds ``value``; each later one moves it ``alpha`` of
+    the way towards itself, so a larger ``alpha`` follows changes faster
+    and smooths less.
+    """
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.count = 0
+        self.value = 0.0
+        self.peak = 0.0
+
+    def add(self, sample: float) -> float:
+        self.count += 1
+        if self.count == 1:
+            self.value = sample
+        else:
+            self.value += self.alpha * (sample - self.value)
+        self.peak = max(self.peak, sample)
+        return self.value
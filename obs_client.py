@@ -0,0 +1,227 @@
+import asyncio
+import base64
+import concurrent.futures
+import hashlib
+import json
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+import websockets
+from PySide6.QtCore import QObject, Qt, Signal
+from persistent_client import LoopThread, PersistentClient
+
+# OBS WebSocket v5 opcodes
+OP_HELLO = 0
+OP_IDENTIFY = 1
+OP_IDENTIFIED = 2
+OP_EVENT = 5
+OP_REQUEST = 6
+OP_REQUEST_RESPONSE = 7
+OP_REQUEST_BATCH = 8
+OP_REQUEST_BATCH_RESPONSE = 9
+
+RPC_VERSION = 1
+# Every event category except the high-volume ones (input volume meters etc.)
+EVENT_ALL = 0x7FF
+STATUS_SUCCESS = 100
+# Returned by StartStream/StartRecord when the output already runs
+STATUS_OUTPUT_RUNNING = 500
+
+class OBSError(Exception):
+    """A request OBS answered with a failure status"""
+
+    def __init__(self, request_type: str, code: int, comment: Optional[str] = None):
+        super().__init__(f"{request_type} failed ({code}): {comment or 'no details'}")
+        self.request_type = request_type
+        self.code = code
+        self.comment = comment
+
+def auth_response(password: str, salt: str, challenge: str) -> str:
+    secret = base64.b64encode(hashlib.sha256((password + salt).encode()).digest())
+    return base64.b64encode(hashlib.sha256(secret + challenge.encode()).digest()).decode()
+
+async def is_listening(url: str, timeout: float = 0.2) -> bool:
+    """True if something accepts TCP connections at ``url``'s host and port"""
+    parsed = urlparse(url)
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(parsed.hostname or 'localhost', parsed.port or 4455), timeout
+        )
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    return True
+
+class RequestBatch:
+    """Requests sent to OBS as one RequestBatch message
+
+    OBS runs them in order (``SERIAL_REALTIME``), one per rendered frame
+    (``SERIAL_FRAME``, so scene changes land on consecutive frames) or
+    all at once (``PARALLEL``). With ``halt_on_failure`` the first failure
+    skips the rest.
+    """
+
+    SERIAL_REALTIME = 0
+    SERIAL_FRAME = 1
+    PARALLEL = 2
+
+    def __init__(self, halt_on_failure: bool = False, execution_type: int = SERIAL_REALTIME):
+        self.halt_on_failure = halt_on_failure
+        self.execution_type = execution_type
+        self.requests: List[Dict[str, object]] = []
+
+    def add(self, request_type: str, data: Optional[Dict[str, object]] = None) -> 'RequestBatch':
+        request = {'requestType': request_type}
+        if data:
+            request['requestData'] = data
+        self.requests.append(request)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.requests)
+
+class OBSClient(PersistentClient):
+    """OBS WebSocket v5 client
+
+    Every (re)connect answers Hello with Identify, authenticating with
+    ``password`` when OBS asks for it. ``request`` raises OBSError when
+    OBS reports a failure; ``batch`` returns failures in its results.
+    Handlers registered with ``on`` receive OBS events by ``eventType``.
+    """
+
+    KIND = 'OBS'
+    HANDSHAKE_ERRORS = (OBSError,)
+
+    def __init__(self, url: str = 'ws://localhost:4455', password: Optional[str] = None,
+                 event_subscriptions: int = EVENT_ALL, request_timeout: float = 10.0,
+                 reconnect_delay: float = 0.5, max_reconnect_delay: float = 10.0):
+        super().__init__(url, request_timeout, reconnect_delay, max_reconnect_delay)
+        self.password = password
+        self.event_subscriptions = event_subscriptions
+
+    @property
+    def label(self) -> str:
+        return f"OBS at {self.url}"
+
+    async def request(self, request_type: str, data: Optional[Dict[str, object]] = None,
+                      timeout: Optional[float] = None) -> Dict[str, object]:
+        """Send one request and return its ``responseData``; raises OBSError on failure"""
+        payload = {'requestType': request_type}
+        if data:
+            payload['requestData'] = data
+        response = await self._request(OP_REQUEST, payload, timeout)
+        status = response['requestStatus']
+        if not status['result']:
+            raise OBSError(request_type, status['code'], status.get('comment'))
+        return response.get('responseData') or {}
+
+    async def batch(self, batch: RequestBatch, timeout: Optional[float] = None) -> List[Dict[str, object]]:
+        """Send a RequestBatch; returns one result per executed request
+
+        Each result has ``requestType``, ``ok``, ``code``, ``comment`` and
+        ``data``. Failures are reported in the results, not raised.
+        """
+        payload = {
+            'haltOnFailure': batch.halt_on_failure,
+            'executionType': batch.execution_type,
+            'requests': batch.requests
+        }
+        response = await self._request(OP_REQUEST_BATCH, payload, timeout)
+        return [{
+            'requestType': result['requestType'],
+            'ok': result['requestStatus']['result'],
+            'code': result['requestStatus']['code'],
+            'comment': result['requestStatus'].get('comment'),
+            'data': result.get('responseData') or {}
+        } for result in response['results']]
+
+    async def _request(self, op: int, payload: Dict[str, object], timeout: Optional[float]) -> Dict[str, object]:
+        return await self._call(lambda request_id: json.dumps({'op': op, 'd': {**payload, 'requestId': request_id}}),
+                                timeout)
+
+    def _new_request_id(self) -> str:
+        # OBS echoes request ids back as strings
+        return str(next(self._ids))
+
+    def _connect(self):
+        return websockets.connect(self.url, subprotocols=['obswebsocket.json'], compression=None, max_size=None)
+
+    async def _handshake(self, websocket):
+        hello = json.loads(await asyncio.wait_for(websocket.recv(), self.request_timeout))
+        if hello.get('op') != OP_HELLO:
+            raise OBSError('Identify', 0, f"expected Hello, got op {hello.get('op')}")
+        identify = {'rpcVersion': RPC_VERSION, 'eventSubscriptions': self.event_subscriptions}
+        auth = hello['d'].get('authentication')
+        if auth:
+            if not self.password:
+                raise OBSError('Identify', 0, "OBS requires a password")
+            identify['authentication'] = auth_response(self.password, auth['salt'], auth['challenge'])
+        await websocket.send(json.dumps({'op': OP_IDENTIFY, 'd': identify}))
+        # A wrong password closes the connection instead of answering
+        identified = json.loads(await asyncio.wait_for(websocket.recv(), self.request_timeout))
+        if identified.get('op') != OP_IDENTIFIED:
+            raise OBSError('Identify', 0, f"expected Identified, got op {identified.get('op')}")
+
+    def _dispatch(self, text: str):
+        message = json.loads(text)
+        op, data = message.get('op'), message.get('d', {})
+        if op in (OP_REQUEST_RESPONSE, OP_REQUEST_BATCH_RESPONSE):
+            self._resolve(data.get('requestId'), data)
+        elif op == OP_EVENT:
+            self._emit(data.get('eventType'), data.get('eventData') or {})
+
+class OBSController(QObject):
+    """An OBSClient running on its own event loop thread, for the Qt UI
+
+    ``call`` and ``call_batch`` return concurrent futures and, if given a
+    callback, call it on the Qt thread with the future once it is done.
+    Connection changes and events arrive as queued signals.
+    """
+
+    connectionChanged = Signal(bool)
+    eventReceived = Signal(str, object)
+    _done = Signal(object, object)
+
+    def __init__(self, url: str = 'ws://localhost:4455', password: Optional[str] = None, parent=None, **options):
+        super().__init__(parent)
+        self.client = OBSClient(url, password, **options)
+        self.client.on_connection = self.connectionChanged.emit
+        self.client.on('*', self.eventReceived.emit)
+        self._done.connect(self._on_done, Qt.QueuedConnection)
+        self._loop = LoopThread()
+        self.loop = self._loop.loop
+        self._runner = self._loop.submit(self.client.run())
+
+    @property
+    def connected(self) -> bool:
+        return self.client.connected
+
+    def call(self, request_type: str, data: Optional[Dict[str, object]] = None, timeout: Optional[float] = None,
+             callback: Optional[Callable[[concurrent.futures.Future], None]] = None) -> concurrent.futures.Future:
+        return self._submit(self.client.request(request_type, data, timeout), callback)
+
+    def probe(self, callback: Optional[Callable[[concurrent.futures.Future], None]] = None) -> concurrent.futures.Future:
+        """Whether OBS accepts TCP connections, checked on the loop thread so the UI never waits"""
+        return self._submit(is_listening(self.client.url), callback)
+
+    def call_batch(self, batch: RequestBatch, timeout: Optional[float] = None,
+                   callback: Optional[Callable[[concurrent.futures.Future], None]] = None) -> concurrent.futures.Future:
+        return self._submit(self.client.batch(batch, timeout), callback)
+
+    def stop(self, timeout: float = 2.0):
+        if not self.loop.is_running():
+            return
+        try:
+            self._loop.submit(self.client.stop()).result(timeout)
+            self._runner.result(timeout)
+        except (concurrent.futures.TimeoutError, OSError, websockets.WebSocketException):
+            pass
+        self._loop.stop(timeout)
+
+    def _submit(self, coroutine, callback) -> concurrent.futures.Future:
+        future = self._loop.submit(coroutine)
+        if callback:
+            future.add_done_callback(lambda future: self._done.emit(callback, future))
+        return future
+
+    def _on_done(self, callback, future: concurrent.futures.Future):
+        callback(future)
@@ -0,0 +1,204 @@
+import asyncio
+import concurrent.futures
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import websockets
+
+EventHandler = Callable[[str, Any], None]
+
+class PersistentClient:
+    """One persistent WebSocket connection with calls matched to responses by id
+
+    ``run`` connects, performs the subclass's ``_handshake`` and reconnects
+    with exponential backoff until ``stop``. Calls are pipelined: each is
+    sent as soon as it is made, so concurrent callers never wait on each
+    other. Calls made while disconnected wait for the connection up to
+    their timeout; calls in flight when it drops fail with ConnectionError.
+    Handlers registered with ``on`` (``'*'`` for all) run on the event loop.
+
+    Subclasses encode requests in ``_call``'s ``encode``, and route each
+    incoming message in ``_dispatch`` to ``_resolve`` or ``_emit``.
+    """
+
+    # Used in log lines, e.g. "OBS connection to ... failed"
+    KIND = 'WebSocket'
+    # Raised by _handshake on a refusal worth retrying later
+    HANDSHAKE_ERRORS: Tuple[type, ...] = ()
+
+    def __init__(self, url: str, request_timeout: float = 10.0,
+                 reconnect_delay: float = 0.5, max_reconnect_delay: float = 10.0):
+        self.url = url
+        self.request_timeout = request_timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        # Called with True once connected and False when the connection drops
+        self.on_connection: Optional[Callable[[bool], None]] = None
+        self.handlers: Dict[str, List[EventHandler]] = {}
+        self.connected = False
+        # Successful connections after the first one
+        self.reconnects = 0
+        self._websocket = None
+        self._connected = asyncio.Event()
+        self._pending: Dict[Any, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._running = False
+        self._stopped: Optional[asyncio.Event] = None
+
+    @property
+    def label(self) -> str:
+        """How errors name the peer"""
+        return self.url
+
+    def on(self, event: str, handler: EventHandler):
+        """Call ``handler(event, data)`` for ``event``, or every event with '*'"""
+        self.handlers.setdefault(event, []).append(handler)
+
+    def off(self, event: str, handler: EventHandler):
+        handlers = self.handlers.get(event, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    async def run(self):
+        """Stay connected until ``stop`` is called"""
+        self._running = True
+        self._stopped = asyncio.Event()
+        delay = self.reconnect_delay
+        connections = 0
+        while self._running:
+            try:
+                async with self._connect() as websocket:
+                    await self._handshake(websocket)
+                    delay = self.reconnect_delay
+                    if connections:
+                        self.reconnects += 1
+                    connections += 1
+                    self._set_connected(websocket)
+                    async for message in websocket:
+                        self._dispatch(message)
+            except (OSError, asyncio.TimeoutError, websockets.WebSocketException, *self.HANDSHAKE_ERRORS) as e:
+                if self._running and not isinstance(e, (ConnectionRefusedError, websockets.ConnectionClosedOK)):
+                    print(f"{self.KIND} connection to {self.url} failed: {e}")
+            finally:
+                self._set_disconnected()
+            if self._running:
+                try:
+                    await asyncio.wait_for(self._stopped.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def stop(self):
+        self._running = False
+        if self._stopped:
+            self._stopped.set()
+        if self._websocket:
+            await self._websocket.close()
+
+    async def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def ping(self, timeout: float = 5.0) -> Optional[float]:
+        """Round trip of a WebSocket ping in ms; None if not connected
+
+        A ping left unanswered for ``timeout`` closes the connection, so a
+        dead peer is noticed and reconnected to.
+        """
+        websocket = self._websocket
+        if websocket is None:
+            return None
+        start = time.perf_counter()
+        try:
+            pong = await websocket.ping()
+            await asyncio.wait_for(pong, timeout)
+        except asyncio.TimeoutError:
+            print(f"No pong from {self.url} in {timeout:.0f} s, reconnecting")
+            await websocket.close()
+            return None
+        except websockets.ConnectionClosed:
+            return None
+        return (time.perf_counter() - start) * 1000
+
+    def _connect(self):
+        return websockets.connect(self.url, compression=None, max_size=None)
+
+    async def _handshake(self, websocket):
+        """Runs on every connect before calls may use ``websocket``"""
+
+    def _new_request_id(self):
+        return next(self._ids)
+
+    async def _call(self, encode: Callable[[Any], Any], timeout: Optional[float]) -> Any:
+        """Send ``encode(request_id)`` and wait for the result ``_resolve`` gets for that id"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.request_timeout)
+        if not await self.wait_connected(deadline - loop.time()):
+            raise ConnectionError(f"{self.label} is not connected")
+        request_id = self._new_request_id()
+        future = loop.create_future()
+        self._pending[request_id] = future
+        try:
+            await self._websocket.send(encode(request_id))
+            return await asyncio.wait_for(future, max(deadline - loop.time(), 0))
+        except websockets.ConnectionClosed:
+            raise ConnectionError(f"{self.label} disconnected")
+        finally:
+            self._pending.pop(request_id, None)
+
+    def _dispatch(self, message):
+        raise NotImplementedError
+
+    def _resolve(self, request_id, result):
+        future = self._pending.get(request_id)
+        if future and not future.done():
+            future.set_result(result)
+
+    def _emit(self, event: str, data: Any):
+        for handler in self.handlers.get(event, []) + self.handlers.get('*', []):
+            try:
+                handler(event, data)
+            except Exception as e:
+                print(f"Error in {self.KIND} event handler for {event}: {e}")
+
+    def _set_connected(self, websocket):
+        self._websocket = websocket
+        self.connected = True
+        self._connected.set()
+        if self.on_connection:
+            self.on_connection(True)
+
+    def _set_disconnected(self):
+        was_connected = self.connected
+        self._websocket = None
+        self.connected = False
+        self._connected.clear()
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError(f"{self.label} disconnected"))
+        self._pending.clear()
+        if was_connected and self.on_connection:
+            self.on_connection(False)
+
+class LoopThread:
+    """An asyncio event loop running on a daemon thread"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, coroutine) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def stop(self, timeout: float = 2.0):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
@@ -0,0 +1,290 @@
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+import cv2
+from metrics import MovingAverage
+from video_manager import Frame
+
+# Queue markers for the writer thread
+_END_SEGMENT = object()
+_STOP = object()
+
+class RecorderStats:
+    """Backpressure counters for one recorder
+
+    ``degraded`` frames were skipped on purpose while the queue ran above
+    its soft limit; ``dropped`` frames arrived with the queue full.
+    """
+
+    WRITE_ALPHA = 0.1
+
+    def __init__(self):
+        self.queued = 0
+        self.written = 0
+        self.degraded = 0
+        self.dropped = 0
+        self.failed = 0
+        self.max_depth = 0
+        # Time to encode and write one frame in ms
+        self.write_time = MovingAverage(self.WRITE_ALPHA)
+
+    def on_write(self, elapsed_ms: float):
+        self.written += 1
+        self.write_time.add(elapsed_ms)
+
+class StreamRecorder:
+    """Writes one stream's frames into time-segmented video files
+
+    ``feed`` is a VideoManager sink: it runs on the capture thread and only
+    ever does a non-blocking put into a bounded queue, which a writer thread
+    drains into ``cv2.VideoWriter``. When the disk falls behind, the queue
+    fills; past ``degrade_ratio`` of its size every other frame is skipped,
+    and once it is full new frames are dropped, so capture never waits.
+
+    With ``preroll_seconds`` the recorder keeps the last seconds of frames
+    in memory while idle (capped at ``max_preroll_bytes``) and writes them
+    at the head of the recording when ``start`` is called. Frames are
+    shared with the capture source, so holding them costs no copy.
+
+    A new file starts every ``segment_seconds`` of capture time and when
+    the frame size changes. Skipped frames are not replaced, so degraded
+    stretches play back faster than real time.
+    """
+
+    def __init__(self, name: str, directory: str = 'recordings', segment_seconds: float = 60.0,
+                 queue_size: int = 64, degrade_ratio: float = 0.5, preroll_seconds: float = 0.0,
+                 max_preroll_bytes: int = 256 << 20, fps: Optional[float] = None, codec: str = 'MJPG',
+                 ext: str = '.avi', writer_factory: Callable[..., object] = cv2.VideoWriter):
+        self.name = name
+        self.directory = directory
+        self.segment_ns = int(segment_seconds * 1e9)
+        self.preroll_ns = int(preroll_seconds * 1e9)
+        self.max_preroll_bytes = max_preroll_bytes
+        self.fps = fps
+        self.codec = codec
+        self.ext = ext
+        self.writer_factory = writer_factory
+        self.recording = False
+        self.segments: List[str] = []
+        self.stats = RecorderStats()
+        self._queue: queue.Queue = queue.Queue(queue_size)
+        self._degrade_depth = max(int(queue_size * degrade_ratio), 1)
+        self._skip = False
+        self._preroll: Deque[Frame] = deque()
+        self._preroll_bytes = 0
+        self._last_ns = 0
+        # Frame interval in ns, used as the file's frame rate
+        self._interval = MovingAverage(0.1)
+        self._lock = threading.Lock()
+        # Writer thread state
+        self._writer = None
+        self._size = None
+        self._segment_start = 0
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    def feed(self, frame: Frame):
+        """Called by the capture thread for every frame; never blocks on the disk"""
+        with self._lock:
+            if self._last_ns:
+                self._interval.add(frame.captured_ns - self._last_ns)
+            self._last_ns = frame.captured_ns
+            if self.recording:
+                self._enqueue(frame)
+            elif self.preroll_ns:
+                self._remember(frame)
+
+    def start(self) -> bool:
+        """Start recording, beginning with whatever the pre-roll holds"""
+        with self._lock:
+            if self.recording:
+                return False
+            self.recording = True
+            self._skip = False
+            if self._preroll:
+                # One queue item, so a long pre-roll is never dropped for want of slots
+                self._put(list(self._preroll))
+                self._preroll.clear()
+                self._preroll_bytes = 0
+        return True
+
+    def stop(self) -> bool:
+        """Stop recording and close the current file once the queue drains"""
+        with self._lock:
+            if not self.recording:
+                return False
+            self.recording = False
+        # Waits for at most one frame write when the queue is full
+        self._queue.put(_END_SEGMENT)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        self.stop()
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, object]:
+        stats = self.stats
+        return {
+            'recording': self.recording,
+            'queue_depth': self._queue.qsize(),
+            'queue_size': self._queue.maxsize,
+            'max_depth': stats.max_depth,
+            'queued': stats.queued,
+            'written': stats.written,
+            'degraded': stats.degraded,
+            'dropped': stats.dropped,
+            'failed': stats.failed,
+            'write_ms': round(stats.write_time.value, 2),
+            'max_write_ms': round(stats.write_time.peak, 2),
+            'preroll_frames': len(self._preroll),
+            'segments': len(self.segments)
+        }
+
+    def _remember(self, frame: Frame):
+        self._preroll.append(frame)
+        self._preroll_bytes += frame.image.nbytes
+        oldest = frame.captured_ns - self.preroll_ns
+        while self._preroll and (self._preroll[0].captured_ns < oldest or self._preroll_bytes > self.max_preroll_bytes):
+            self._preroll_bytes -= self._preroll.popleft().image.nbytes
+
+    def _enqueue(self, frame: Frame):
+        if self._queue.qsize() >= self._degrade_depth:
+            self._skip = not self._skip
+            if self._skip:
+                self.stats.degraded += 1
+                return
+        else:
+            self._skip = False
+        if self._put(frame):
+            self.stats.queued += 1
+        else:
+            self.stats.dropped += 1
+
+    def _put(self, item) -> bool:
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            return False
+        self.stats.max_depth = max(self.stats.max_depth, self._queue.qsize())
+        return True
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._close_segment()
+                return
+            if item is _END_SEGMENT:
+                self._close_segment()
+                continue
+            for frame in item if isinstance(item, list) else (item,):
+                try:
+                    self._write(frame)
+                except cv2.error as e:
+                    self.stats.failed += 1
+                    print(f"Error recording {self.name}: {e}")
+
+    def _write(self, frame: Frame):
+        image = frame.image
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        size = (image.shape[1], image.shape[0])
+        if self._writer is None or size != self._size or frame.captured_ns - self._segment_start >= self.segment_ns:
+            self._close_segment()
+            self._open_segment(frame, size)
+            if self._writer is None:
+                self.stats.failed += 1
+                return
+        start = time.perf_counter()
+        self._writer.write(image)
+        self.stats.on_write((time.perf_counter() - start) * 1000)
+
+    def _open_segment(self, frame: Frame, size):
+        os.makedirs(self.directory, exist_ok=True)
+        # Named after the wall-clock time of its first frame, which for a
+        # pre-roll lies before the moment recording was triggered
+        captured = time.time() - (time.monotonic_ns() - frame.captured_ns) / 1e9
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(captured))
+        safe_name = re.sub(r'[^\w.-]+', '_', self.name)
+        path = os.path.join(self.directory, f"{safe_name}_{stamp}_{len(self.segments):04d}{self.ext}")
+        fps = self.fps or (1e9 / self._interval.value if self._interval.value else 30.0)
+        writer = self.writer_factory(path, cv2.VideoWriter_fourcc(*self.codec), fps, size)
+        if not writer.isOpened():
+            print(f"Error opening recording file {path}")
+            return
+        self._writer = writer
+        self._size = size
+        self._segment_start = frame.captured_ns
+        self.segments.append(path)
+
+    def _close_segment(self):
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+
+class RecordingManager:
+    """StreamRecorders attached to a VideoManager's streams
+
+    ``arm`` attaches a recorder so its pre-roll starts filling; ``start``
+    and ``stop`` (or ``toggle``) control recording. Options given here are
+    defaults for every recorder and can be overridden per stream.
+    """
+
+    def __init__(self, video_manager, directory: str = 'recordings', **options):
+        self.video_manager = video_manager
+        self.directory = directory
+        self.options = options
+        self.recorders: Dict[str, StreamRecorder] = {}
+
+    def arm(self, name: str, **options) -> Optional[StreamRecorder]:
+        recorder = self.recorders.get(name)
+        if recorder:
+            return recorder
+        recorder = StreamRecorder(name, self.directory, **{**self.options, **options})
+        if not self.video_manager.add_sink(name, recorder.feed):
+            recorder.close()
+            return None
+        self.recorders[name] = recorder
+        return recorder
+
+    def disarm(self, name: str):
+        recorder = self.recorders.pop(name, None)
+        if recorder:
+            self.video_manager.remove_sink(name, recorder.feed)
+            recorder.close()
+
+    def start(self, name: str) -> bool:
+        recorder = self.arm(name)
+        return recorder.start() if recorder else False
+
+    def stop(self, name: str) -> bool:
+        recorder = self.recorders.get(name)
+        return recorder.stop() if recorder else False
+
+    def toggle(self, name: str) -> bool:
+        """Start or stop recording ``name``; returns whether it is now recording"""
+        recorder = self.recorders.get(name)
+        if recorder and recorder.recording:
+            recorder.stop()
+            return False
+        return self.start(name)
+
+    def is_recording(self, name: str) -> bool:
+        recorder = self.recorders.get(name)
+        return bool(recorder and recorder.recording)
+
+    def close_all(self):
+        for name in list(self.recorders):
+            self.disarm(name)
+
+    def get_stats(self, name: str) -> Optional[Dict[str, object]]:
+        recorder = self.recorders.get(name)
+        return recorder.get_stats() if recorder else None
+
+    def all_stats(self) -> Dict[str, Dict[str, object]]:
+        return {name: recorder.get_stats() for name, recorder in list(self.recorders.items())}
@@ -0,0 +1,63 @@
+import time
+from typing import List, Optional, Tuple
+from PySide6.QtCore import QEvent, QObject
+
+class StartupProfiler(QObject):
+    """Records how long each startup phase takes until the first frame is painted
+
+    Time spent waiting on the user (e.g. in the sign-in dialog) can be
+    excluded with ``pause``/``resume``.
+    """
+
+    def __init__(self, start: Optional[float] = None, enabled: bool = True, parent=None):
+        super().__init__(parent)
+        self.enabled = enabled
+        self.start = start if start is not None else time.perf_counter()
+        self.last = self.start
+        self.paused_total = 0.0
+        self.phases: List[Tuple[str, float]] = []
+        self._paused_at = None
+        self._watched = None
+
+    def mark(self, phase: str, at: Optional[float] = None):
+        """Close the current phase under ``phase``, ending now or at ``at``"""
+        if not self.enabled:
+            return
+        now = at if at is not None else time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def pause(self, phase: str):
+        self.mark(phase)
+        self._paused_at = time.perf_counter()
+
+    def resume(self):
+        if self._paused_at is not None:
+            paused = time.perf_counter() - self._paused_at
+            self.paused_total += paused
+            self.last += paused
+            self._paused_at = None
+
+    def watch_first_frame(self, widget):
+        """Finish and print the report when ``widget`` first paints"""
+        if not self.enabled:
+            return
+        self._watched = widget
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self._watched and event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            self._watched = None
+            self.mark('first paint')
+            self.report()
+        return False
+
+    def report(self):
+        total = sum(duration for _, duration in self.phases)
+        print("Startup profile (time to first frame):")
+        for phase, duration in self.phases:
+            print(f"  {phase:<24} {duration * 1000:8.1f} ms")
+        print(f"  {'total':<24} {total * 1000:8.1f} ms")
+        if self.paused_total:
+            print(f"  (excluding {self.paused_total * 1000:.1f} ms waiting for the user)")
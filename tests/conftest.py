@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Modules live at the repository root, as for the benchmarks
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Widgets need a display; run headless unless one is configured
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
@@ -0,0 +1,47 @@
+import pytest
+from PySide6.QtWidgets import QApplication
+
+import main
+from app_manager import AppManager
+from app_store import JSONAppStore
+from video_manager import SyntheticCapture, VideoManager
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def tiles(app, tmp_path, monkeypatch):
+    # Recordings go to the working directory
+    monkeypatch.chdir(tmp_path)
+    video_manager = VideoManager(lambda source: SyntheticCapture(64, 48, fps=100))
+    tiles = main.AppContainer(lambda name: None, lambda name: None, video_manager=video_manager)
+    yield tiles
+    tiles.close_all()
+
+def test_launching_a_camera_starts_capture_and_arms_the_recorder(app, tiles, tmp_path):
+    manager = AppManager(JSONAppStore(str(tmp_path / 'apps.json')))
+    manager.add_app('Camera_0', 'Camera', {'connection_id': '0'})
+    tiles.add_app_window('Camera_0', 'Camera')
+    assert main.start_app(manager, None, {}, 'Camera_0', tiles=tiles) is None
+    with pytest.raises(RuntimeError):
+        main.start_app(manager, None, {}, 'Camera_0', tiles=tiles)
+    assert tiles.video_manager.latest_frame('Camera_0', timeout=5) is not None
+    tiles.record_buttons['Camera_0'].setChecked(True)
+    assert tiles.recordings.is_recording('Camera_0')
+    tiles.record_buttons['Camera_0'].setChecked(False)
+    tiles.remove_app_window('Camera_0')
+    assert 'Camera_0' not in tiles.video_manager.streams
+    assert 'Camera_0' not in tiles.video_tiles
+
+def test_image_editor_opens_in_its_tile(app, tiles):
+    tiles.add_app_window('Image Editor_1', 'Image Editor')
+    tiles.open_app('Image Editor_1', 'Image Editor', {})
+    editor = tiles.editors['Image Editor_1']
+    assert editor.parent() is tiles.app_windows['Image Editor_1']
+    with pytest.raises(RuntimeError):
+        tiles.open_app('Image Editor_1', 'Image Editor', {})
+
+def test_apps_without_a_tile_are_refused(app, tiles):
+    with pytest.raises(ValueError):
+        tiles.open_app('TeamViewer_1', 'TeamViewer', {})
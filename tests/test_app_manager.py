@@ -0,0 +1,79 @@
+import threading
+import time
+
+from PySide6.QtWidgets import QApplication
+
+from app_manager import AppManager
+from app_store import JSONAppStore
+
+class SlowStore(JSONAppStore):
+    def __init__(self, path, release: threading.Event):
+        super().__init__(path)
+        self.release = release
+
+    def load(self):
+        self.release.wait(5)
+        return super().load()
+
+def saved_store(tmp_path, release=None):
+    path = str(tmp_path / 'apps.json')
+    JSONAppStore(path).commit({
+        'Saved': {'type': 'TeamViewer', 'config': {'connection_id': '1'}, 'status': 'inactive'}
+    }, ['Saved'], [])
+    return SlowStore(path, release) if release else JSONAppStore(path)
+
+def test_merge_loaded_keeps_apps_added_meanwhile(tmp_path):
+    manager = AppManager(saved_store(tmp_path), autoload=False)
+    changes = []
+    manager.add_listener(lambda changed, removed: changes.append((changed, removed)))
+    manager.add_app('New', 'OBS Studio', {'connection_id': '2'})
+    loaded = JSONAppStore(str(tmp_path / 'apps.json')).load()
+    assert manager.merge_loaded(loaded) == ['Saved']
+    assert list(manager.apps) == ['Saved', 'New']
+    assert manager.query(app_type='TeamViewer') == ['Saved']
+    assert changes[-1] == (['Saved'], [])
+    # The add was held back until the saved apps were read, then written with them
+    assert list(JSONAppStore(str(tmp_path / 'apps.json')).load()) == ['Saved', 'New']
+    assert manager.merge_loaded(loaded) == []
+
+def test_app_loader_merges_on_the_qt_thread(tmp_path):
+    import main
+    app = QApplication.instance() or QApplication([])
+    release = threading.Event()
+    manager = AppManager(saved_store(tmp_path, release), autoload=False)
+    threads = []
+    manager.add_listener(lambda changed, removed: threads.append(threading.current_thread()))
+    loader = main.AppLoader(manager)
+    loaded = []
+    loader.loaded.connect(lambda: loaded.append(True))
+    loader.start()
+    # The UI adds an app while the store is still being read
+    manager.add_app('New', 'OBS Studio', {'connection_id': '2'})
+    release.set()
+    end = time.perf_counter() + 5
+    while not loaded and time.perf_counter() < end:
+        app.processEvents()
+    assert loaded
+    assert set(manager.apps) == {'Saved', 'New'}
+    assert threads and all(thread is threading.main_thread() for thread in threads)
+
+def test_indexes_follow_status_changes_and_removal(tmp_path):
+    manager = AppManager(JSONAppStore(str(tmp_path / 'apps.json')))
+    manager.add_apps([
+        ('TV 1', 'TeamViewer', {'connection_id': '111'}),
+        ('TV 2', 'TeamViewer', {'connection_id': '222'}),
+        ('OBS', 'OBS Studio', {'stream_key': 'abc', 'scene': 'Main'}),
+    ])
+    assert manager.query(app_type='TeamViewer') == ['TV 1', 'TV 2']
+    assert manager.query(connection_id='222') == ['TV 2']
+    manager.set_app_status('TV 2', 'active')
+    assert manager.query('TeamViewer', 'active') == ['TV 2']
+    assert manager.query(status='inactive') == ['TV 1', 'OBS']
+    # Unindexed config keys are filtered
+    assert manager.query(scene='Main') == ['OBS']
+    assert manager.query(stream_key='abc', scene='Other') == []
+    manager.remove_app('TV 2')
+    assert manager.query(connection_id='222') == []
+    # Emptied buckets are dropped rather than left behind
+    assert 'active' not in manager.by_status
+    assert '222' not in manager.by_config['connection_id']
@@ -0,0 +1,48 @@
+import pytest
+
+from app_manager import AppManager
+from app_store import AppStore, JSONAppStore, SQLiteAppStore
+
+def test_app_store_is_abstract():
+    with pytest.raises(TypeError):
+        AppStore()
+
+    class LoadOnly(AppStore):
+        def load(self):
+            return {}
+    with pytest.raises(TypeError):
+        LoadOnly()
+
+@pytest.mark.parametrize('store_class, filename', [(JSONAppStore, 'apps.json'), (SQLiteAppStore, 'apps.db')])
+def test_commit_round_trip(tmp_path, store_class, filename):
+    store = store_class(str(tmp_path / filename))
+    apps = {'OBS': {'type': 'obs', 'status': 'inactive'}, 'Chat': {'type': 'web', 'status': 'active'}}
+    store.commit(apps, list(apps), [])
+    del apps['Chat']
+    store.commit(apps, [], ['Chat'])
+    store.close()
+    assert store_class(str(tmp_path / filename)).load() == {'OBS': {'type': 'obs', 'status': 'inactive'}}
+
+def test_sqlite_updates_keep_the_order(tmp_path):
+    store = SQLiteAppStore(str(tmp_path / 'apps.db'))
+    apps = {name: {'type': 'obs', 'status': 'inactive'} for name in ('A', 'B', 'C')}
+    store.commit(apps, list(apps), [])
+    apps['A']['status'] = 'active'
+    store.commit(apps, ['A'], [])
+    assert list(store.load()) == ['A', 'B', 'C']
+    assert store.load()['A']['status'] == 'active'
+
+def test_export_then_import_round_trip(tmp_path):
+    source = AppManager(SQLiteAppStore(str(tmp_path / 'source.db')))
+    source.add_app('TeamViewer_1', 'TeamViewer', {'connection_id': '1'})
+    source.add_app('OBS Studio_2', 'OBS Studio', {'connection_id': '2', 'stream_key': 'key'})
+    source.export_json(str(tmp_path / 'apps_config.json'))
+    target = AppManager(SQLiteAppStore(str(tmp_path / 'target.db')))
+    target.add_app('Camera_0', 'Camera', {'connection_id': '0'})
+    assert target.import_json(str(tmp_path / 'apps_config.json')) == ['TeamViewer_1', 'OBS Studio_2']
+    assert list(target.apps) == ['Camera_0', 'TeamViewer_1', 'OBS Studio_2']
+    for name in source.apps:
+        assert target.apps[name]['type'] == source.apps[name]['type']
+        assert target.apps[name]['config'] == source.apps[name]['config']
+    # Importing again adds nothing
+    assert target.import_json(str(tmp_path / 'apps_config.json')) == []
@@ -0,0 +1,40 @@
+import asyncio
+import os
+
+import pytest
+import websockets
+
+from auth import ROLE_USER, AuthError, TokenService
+from control_plane import REQUEST, RESPONSE, RPCServer, pack, unpack
+
+@pytest.mark.parametrize('token', [None, '', 42, ['a', 'b'], {'sub': 'x'}, b'abc'])
+def test_verify_rejects_non_string_tokens(token):
+    service = TokenService(os.urandom(32))
+    with pytest.raises(AuthError):
+        service.verify(token)
+    with pytest.raises(AuthError):
+        service.verify_signature(token)
+
+def test_server_answers_bad_tokens_and_keeps_the_connection():
+    service = TokenService(os.urandom(32))
+
+    async def status(name, claims=None):
+        return claims['sub']
+
+    async def run():
+        server = RPCServer({'status': status}, port=0, verify=service.verify)
+        await server.start()
+        try:
+            async with websockets.connect(f'ws://localhost:{server.port}') as websocket:
+                replies = []
+                for request_id, token in enumerate([42, ['a', 'b'], service.issue('alice', ROLE_USER)]):
+                    await websocket.send(pack([REQUEST, request_id, 'status', {'name': 'app'}, token]))
+                    replies.append(unpack(await asyncio.wait_for(websocket.recv(), 5)))
+                return replies
+        finally:
+            await server.stop()
+
+    replies = asyncio.run(run())
+    assert [reply[:2] for reply in replies] == [[RESPONSE, 0], [RESPONSE, 1], [RESPONSE, 2]]
+    assert replies[0][2] == replies[1][2] == "unauthorized: malformed token"
+    assert replies[2][2:] == [None, 'alice']
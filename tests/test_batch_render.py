@@ -0,0 +1,58 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+import batch_render
+
+RECIPE = [
+    {'op': 'brightness_contrast', 'brightness': 10, 'contrast': 1.2},
+    {'op': 'blur', 'radius': 3},
+    {'op': 'sharpen', 'amount': 0.8, 'radius': 2},
+    {'op': 'rotate', 'angle': 90},
+    {'op': 'blur', 'radius': 5},
+    {'op': 'convert', 'mode': 'gray'}
+]
+
+def noise(h, w):
+    return np.random.default_rng(1).integers(0, 256, (h, w, 3), dtype=np.uint8)
+
+def test_tiled_render_matches_the_whole_image():
+    # Tile sizes that do not divide the image leave ragged edge tiles
+    image = noise(203, 317)
+    whole = batch_render.render_image(image, RECIPE, tile=0)
+    with ThreadPoolExecutor(4) as pool:
+        for tile in (32, 50, 64):
+            assert np.array_equal(batch_render.render_image(image, RECIPE, tile=tile, pool=pool), whole)
+
+def test_halo_is_what_keeps_tile_seams_invisible():
+    image = noise(128, 128)
+    steps = [{'op': 'blur', 'radius': 4}]
+    whole = batch_render.run_steps(image, steps)
+    with ThreadPoolExecutor(2) as pool:
+        original = batch_render.TILE_HALO['blur']
+        batch_render.TILE_HALO['blur'] = lambda params: 0
+        try:
+            seamed = batch_render.render_tiled(image, steps, 32, pool)
+        finally:
+            batch_render.TILE_HALO['blur'] = original
+        assert not np.array_equal(seamed, whole)
+        assert np.array_equal(batch_render.render_tiled(image, steps, 32, pool), whole)
+
+def test_split_recipe_groups_tileable_runs():
+    runs = batch_render.split_recipe(RECIPE)
+    assert [(tileable, len(steps)) for tileable, steps in runs] == [(True, 3), (False, 1), (True, 2)]
+
+def test_batch_renders_files_and_reports_failures(tmp_path):
+    source = tmp_path / 'in'
+    (source / 'sub').mkdir(parents=True)
+    cv2.imwrite(str(source / 'a.png'), noise(40, 60))
+    cv2.imwrite(str(source / 'sub' / 'b.png'), noise(30, 20))
+    (source / 'broken.png').write_bytes(b'not an image')
+    recipe = tmp_path / 'recipe.json'
+    recipe.write_text(json.dumps(RECIPE))
+    output = tmp_path / 'out'
+    assert batch_render.main([str(recipe), str(source), '-o', str(output), '--workers', '1', '--tile', '16']) == 1
+    assert cv2.imread(str(output / 'a.png'), cv2.IMREAD_UNCHANGED).shape == (60, 40)
+    assert cv2.imread(str(output / 'sub' / 'b.png'), cv2.IMREAD_UNCHANGED).shape == (20, 30)
@@ -0,0 +1,67 @@
+import time
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from app_manager import AppManager
+from app_store import JSONAppStore
+from auth import ROLE_ADMIN, TokenService
+from control_plane import ControlService, RemoteControl
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+def wait_for(app, condition, timeout=5):
+    end = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.001)
+    assert condition()
+
+@pytest.fixture
+def peers(app, tmp_path):
+    """A served AppManager, as on "My PC", and its mirror, as on "Remote PC\""""
+    manager = AppManager(JSONAppStore(str(tmp_path / 'apps.json')))
+    manager.add_app('OBS Studio_1', 'OBS Studio', {'connection_id': '1', 'stream_key': 'secret'})
+    launched = []
+
+    def launch(name):
+        launched.append(name)
+        manager.set_app_status(name, 'active')
+
+    tokens = TokenService(b'test secret')
+    service = ControlService(manager, launch, port=0, tokens=tokens)
+    assert service.start()
+    remote = RemoteControl(f'ws://localhost:{service.server.port}', token=tokens.issue('alice', ROLE_ADMIN))
+    wait_for(app, lambda: remote.version is not None)
+    yield manager, remote, launched
+    remote.stop()
+    service.stop()
+
+def test_mirror_starts_from_a_snapshot_without_private_config(peers):
+    manager, remote, launched = peers
+    assert list(remote.apps) == ['OBS Studio_1']
+    assert remote.apps['OBS Studio_1']['config'] == {'connection_id': '1'}
+
+def test_local_and_remote_edits_reach_both_sides(app, peers):
+    manager, remote, launched = peers
+    snapshots = remote.snapshots
+    manager.add_app('TeamViewer_2', 'TeamViewer', {'connection_id': '2'})
+    wait_for(app, lambda: 'TeamViewer_2' in remote.apps)
+    # The service answers on the Qt thread, so keep its event loop running
+    removed = remote.call('remove', name='OBS Studio_1')
+    wait_for(app, removed.done)
+    assert removed.result() is True
+    wait_for(app, lambda: 'OBS Studio_1' not in remote.apps)
+    assert 'OBS Studio_1' not in manager.apps
+    # Events alone kept the mirror current
+    assert remote.snapshots == snapshots
+
+def test_remote_launch_runs_the_local_launcher(app, peers):
+    manager, remote, launched = peers
+    status = remote.call('launch', name='OBS Studio_1')
+    wait_for(app, status.done)
+    assert status.result() == 'active'
+    assert launched == ['OBS Studio_1']
+    wait_for(app, lambda: remote.apps['OBS Studio_1']['status'] == 'active')
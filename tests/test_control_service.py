@@ -0,0 +1,62 @@
+import os
+import socket
+import time
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+import main
+from app_manager import AppManager
+from app_store import JSONAppStore
+from auth import ROLE_USER, TokenService
+from control_plane import ControlService, RemoteError, RPCClient
+from persistent_client import LoopThread
+
+class FakeLauncher:
+    def __init__(self, running=False):
+        self.running = running
+
+    def is_running(self, app_name):
+        return self.running
+
+    def launch(self, app_name, args):
+        return not self.running
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+@pytest.mark.parametrize('app_type, config, installed, running, message', [
+    ('TeamViewer', {'connection_id': '1'}, False, False, "TeamViewer is not installed or not found."),
+    ('TeamViewer', {'connection_id': '1'}, True, True, "remote-app is already running"),
+    ('OBS Studio', {'connection_id': '1'}, False, False, "OBS Studio is not installed or not found."),
+])
+def test_launch_failures_come_back_as_errors(tmp_path, monkeypatch, app_type, config, installed, running, message):
+    app = QApplication.instance() or QApplication([])
+    monkeypatch.setattr(main.resolver, 'resolve', lambda name: '/bin/true' if installed else None)
+    manager = AppManager(JSONAppStore(str(tmp_path / 'apps.json')))
+    manager.add_app('remote-app', app_type, dict(config, obs_url=f'ws://localhost:{free_port()}'))
+    controllers = {}
+    launcher = FakeLauncher(running)
+    tokens = TokenService(os.urandom(32))
+    service = ControlService(manager, lambda name: main.start_app(manager, launcher, controllers, name),
+                             port=0, tokens=tokens)
+    assert service.start()
+    loop = LoopThread()
+    client = RPCClient(f'ws://localhost:{service.server.port}', token=tokens.issue('alice', ROLE_USER))
+    runner = loop.submit(client.run())
+    try:
+        call = loop.submit(client.call('launch', timeout=10, name='remote-app'))
+        end = time.perf_counter() + 10
+        while not call.done() and time.perf_counter() < end:
+            app.processEvents()
+        with pytest.raises(RemoteError, match=message):
+            call.result(0)
+    finally:
+        loop.submit(client.stop()).result(5)
+        runner.result(5)
+        loop.stop()
+        service.stop()
+        for controller in controllers.values():
+            controller.stop()
@@ -0,0 +1,80 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+import credentials
+from credentials import Authenticator, CredentialStore, RateLimiter, check_password, hash_password, needs_rehash
+
+# Cheap enough for tests; the real defaults take a few hundred ms per hash
+CHEAP = {'n': 2 ** 10, 'r': 8, 'p': 1}
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(credentials, 'time', SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+def wait_for(app, condition, timeout=5):
+    end = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < end:
+        app.processEvents()
+    return condition()
+
+def test_hashes_are_salted_and_flag_old_settings():
+    first = hash_password('secret', 'scrypt', **CHEAP)
+    assert first != hash_password('secret', 'scrypt', **CHEAP)
+    assert check_password('secret', first)
+    assert not check_password('Secret', first)
+    assert not needs_rehash(first, 'scrypt', **CHEAP)
+    assert needs_rehash(first, 'scrypt', n=2 ** 11, r=8, p=1)
+    assert check_password('secret', hash_password('secret', 'pbkdf2_sha256', iterations=1000))
+
+def test_rate_limiter_locks_out_after_free_attempts(clock):
+    limiter = RateLimiter(free_attempts=3, base_delay=1.0, max_delay=4.0, forget_after=60)
+    for _ in range(3):
+        assert limiter.retry_after('alice') == 0
+        limiter.failure('alice')
+    assert limiter.retry_after('alice') == 1.0
+    assert limiter.retry_after('bob') == 0
+    clock[0] += 1
+    limiter.failure('alice')
+    assert limiter.retry_after('alice') == 2.0
+    for _ in range(5):
+        limiter.failure('alice')
+    assert limiter.retry_after('alice') == 4.0
+    # A long quiet spell starts the count over
+    clock[0] += 61
+    limiter.failure('alice')
+    assert limiter.retry_after('alice') == 0
+    limiter.success('alice')
+    assert 'alice' not in limiter.failures
+
+def test_authenticator_refuses_locked_out_names_without_hashing(app, tmp_path, clock):
+    store = CredentialStore(str(tmp_path / 'credentials.json'), 'scrypt', **CHEAP)
+    store.set_user('alice', 'right', 'user')
+    verified = []
+    verify = store.verify
+    store.verify = lambda username, password: verified.append(username) or verify(username, password)
+    authenticator = Authenticator(store, RateLimiter(free_attempts=2, base_delay=30))
+    results = []
+    try:
+        for attempt, password in enumerate(('wrong', 'wrong', 'right'), 1):
+            authenticator.authenticate('Alice ', password, lambda role, error: results.append((role, error)))
+            assert wait_for(app, lambda: len(results) == attempt)
+        assert results[:2] == [(None, "Invalid username or password.")] * 2
+        # The right password is refused too, and never reaches the hash
+        assert results[2] == (None, "Too many attempts, try again in 30 s.")
+        assert len(verified) == 2
+        clock[0] += 30
+        authenticator.authenticate('alice', 'right', lambda role, error: results.append((role, error)))
+        assert wait_for(app, lambda: len(results) == 4)
+        assert results[3] == ('user', None)
+        assert authenticator.limiter.failures == {}
+    finally:
+        authenticator.close()
@@ -0,0 +1,16 @@
+import numpy as np
+
+from edit_graph import EditGraph
+
+def test_parameter_changes_keep_intern_table_bounded():
+    source = np.random.default_rng(0).integers(0, 256, (64, 64, 3), dtype=np.uint8)
+    graph = EditGraph(source, cache_bytes=64 * 64 * 3 * 8)
+    node = graph.add('brightness_contrast', brightness=0, contrast=1.0)
+    graph.add('invert')
+    for i in range(5000):
+        graph.set_params(node, brightness=i % 200 - 100)
+        graph.render()
+    assert len(graph._keys) <= 2 * EditGraph.MIN_PRUNE
+    graph.set_params(node, brightness=10)
+    expected = EditGraph.from_recipe(source, graph.recipe()).render()
+    assert np.array_equal(graph.render(), expected)
@@ -0,0 +1,35 @@
+import os
+
+import executables
+from executables import ExecutableResolver
+
+def install(monkeypatch, tmp_path):
+    path = tmp_path / 'teamviewer'
+    path.write_text('')
+    monkeypatch.setitem(executables.KNOWN_PATHS, 'TeamViewer', {'linux': [str(path)]})
+    monkeypatch.setitem(executables.PATH_NAMES, 'TeamViewer', [])
+    return path
+
+def test_cached_path_is_revalidated_with_one_stat(monkeypatch, tmp_path):
+    path = install(monkeypatch, tmp_path)
+    resolver = ExecutableResolver('linux')
+    assert resolver.resolve('TeamViewer') == str(path)
+    probes = []
+    monkeypatch.setattr(resolver, '_probe', lambda app_type: probes.append(app_type))
+    assert resolver.resolve('TeamViewer') == str(path)
+    assert probes == []
+    # An update changes the mtime, so the next launch probes again
+    os.utime(path, (0, 0))
+    resolver.resolve('TeamViewer')
+    assert probes == ['TeamViewer']
+
+def test_misses_are_not_cached(monkeypatch, tmp_path):
+    path = install(monkeypatch, tmp_path)
+    path.unlink()
+    resolver = ExecutableResolver('linux')
+    assert resolver.resolve('TeamViewer') is None
+    path.write_text('')
+    assert resolver.resolve('TeamViewer') == str(path)
+    path.unlink()
+    assert resolver.resolve('TeamViewer') is None
+    assert 'TeamViewer' not in resolver.cache
@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import frame_stream
+from frame_stream import CODEC_JPEG, CODEC_PNG, QualityController, decode_frame, encode_frame
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(frame_stream, 'time', SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+def test_congestion_cuts_quality_then_resolution_once_per_round_trip(clock):
+    controller = QualityController(quality=80, min_quality=30, target_rtt_ms=50)
+    controller.on_ack(200, window_full=False)
+    assert controller.quality == 64
+    # Acks for frames sent before the cut reached the receiver change nothing
+    controller.on_ack(200, window_full=False)
+    assert controller.quality == 64
+    for _ in range(10):
+        clock[0] += 1
+        controller.on_ack(200, window_full=False)
+    assert controller.quality == 30
+    assert controller.scale == 0.25
+
+def test_window_waits_count_as_congestion(clock):
+    controller = QualityController(quality=80, target_rtt_ms=50)
+    controller.on_ack(5, window_full=True)
+    assert controller.quality == 64
+
+def test_recovery_restores_resolution_before_quality(clock):
+    controller = QualityController(quality=80, min_quality=30, max_quality=90, target_rtt_ms=50, recover_acks=3)
+    controller.quality, controller.scale_index = 30, 2
+    for _ in range(3 * 4):
+        controller.on_ack(10, window_full=False)
+    assert controller.scale == 1.0
+    assert controller.quality == 40
+    for _ in range(3 * 20):
+        controller.on_ack(10, window_full=False)
+    assert controller.quality == 90
+
+def test_round_trip_is_smoothed(clock):
+    controller = QualityController(quality=80, target_rtt_ms=50)
+    for _ in range(5):
+        controller.on_ack(10, window_full=False)
+    # One late ack does not trip the target on its own
+    controller.on_ack(200, window_full=False)
+    assert controller.quality == 80
+    assert controller.rtt.value == pytest.approx(10 + 0.2 * 190)
+    assert controller.rtt.peak == 200
+
+def test_png_frames_are_lossless_and_scaled_frames_shrink():
+    image = np.random.default_rng(0).integers(0, 256, (24, 32, 3), dtype=np.uint8)
+    assert np.array_equal(decode_frame(encode_frame(image, CODEC_PNG, 0, 1.0)), image)
+    assert decode_frame(encode_frame(image, CODEC_JPEG, 80, 0.5)).shape == (12, 16, 3)
@@ -0,0 +1,59 @@
+from PySide6.QtGui import QShortcut
+from PySide6.QtWidgets import QApplication, QMainWindow
+
+import main
+from hotkeys import ALT, CTRL, HotkeyManager, parse_chord
+
+class FakeBackend:
+    def __init__(self, taken=()):
+        self.taken = set(taken)
+        self.grabbed = set()
+
+    def grab(self, chord):
+        if chord in self.taken:
+            return False
+        self.grabbed.add(chord)
+        return True
+
+    def ungrab(self, chord):
+        self.grabbed.discard(chord)
+
+def test_parse_chord():
+    assert parse_chord('Ctrl+Alt+O') == (CTRL | ALT, 'o')
+
+def test_rebind_keeps_old_chord_when_grab_fails():
+    manager = HotkeyManager({'toggle_overlay': 'ctrl+alt+o'})
+    manager.backend = FakeBackend(taken={parse_chord('ctrl+alt+p')})
+    manager.backend.grab(parse_chord('ctrl+alt+o'))
+    assert not manager.bind('toggle_overlay', 'ctrl+alt+p')
+    assert manager.bindings['toggle_overlay'] == parse_chord('ctrl+alt+o')
+    assert manager.backend.grabbed == {parse_chord('ctrl+alt+o')}
+
+def test_rebind_moves_the_grab():
+    manager = HotkeyManager({'toggle_overlay': 'ctrl+alt+o'})
+    manager.backend = FakeBackend()
+    manager.backend.grab(parse_chord('ctrl+alt+o'))
+    assert manager.bind('toggle_overlay', 'ctrl+alt+o')
+    assert manager.backend.grabbed == {parse_chord('ctrl+alt+o')}
+    assert manager.bind('toggle_overlay', 'ctrl+alt+k')
+    assert manager.backend.grabbed == {parse_chord('ctrl+alt+k')}
+    assert manager.actions == {parse_chord('ctrl+alt+k'): 'toggle_overlay'}
+
+class StartedBackend(FakeBackend):
+    name = 'fake'
+
+def test_main_window_actions_follow_hotkeys():
+    app = QApplication.instance() or QApplication([])
+    window = QMainWindow()
+    toggled = []
+    hotkeys = HotkeyManager({'toggle_overlay': 'ctrl+alt+o'})
+    main.install_hotkeys(window, {'toggle_overlay': lambda: toggled.append(True)}, hotkeys)
+    shortcuts = window.findChildren(QShortcut)
+    assert [shortcut.isEnabled() for shortcut in shortcuts] == [True]
+    # A registered global grab takes over from the in-window shortcut
+    hotkeys.backend = StartedBackend()
+    app.processEvents()
+    assert not shortcuts[0].isEnabled()
+    hotkeys._fired.emit(parse_chord('ctrl+alt+o'))
+    app.processEvents()
+    assert toggled == [True]
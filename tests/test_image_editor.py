@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+import image_editor
+from image_editor import ImageEditor, TileHistory, TilePatch
+
+def gradient(h=96, w=128):
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+
+def test_pixel_operations_match_their_formulas():
+    image = gradient()
+    assert np.array_equal(image_editor.invert(image), 255 - image)
+    expected = np.clip(np.rint((image.astype(np.float32) - 128) * 1.5 + 128 + 10), 0, 255).astype(np.uint8)
+    assert np.array_equal(image_editor.brightness_contrast(image, 10, 1.5), expected)
+    assert np.array_equal(image_editor.levels(image, 0, 255, 1.0), image)
+    with pytest.raises(ValueError):
+        image_editor.levels(image, 200, 100)
+    assert np.array_equal(image_editor.swap_rb(image), image[:, :, ::-1])
+    assert image_editor.rotate(image, 90).shape == (128, 96, 3)
+    assert image_editor.convert(image, 'gray').shape == (96, 128)
+
+def test_region_edit_keeps_only_changed_tiles_and_undoes():
+    original = gradient()
+    editor = ImageEditor(original.copy(), TileHistory(tile_size=32))
+    editor.invert(region=(40, 8, 10, 10))
+    assert np.array_equal(editor.image[8:18, 40:50], 255 - original[8:18, 40:50])
+    assert np.array_equal(editor.image[:, :40], original[:, :40])
+    patch = editor.history.undo_stack[-1]
+    assert isinstance(patch, TilePatch)
+    # A 10x10 region inside one 32px tile keeps a single tile
+    assert len(patch.tiles) == 1
+    assert editor.undo()
+    assert np.array_equal(editor.image, original)
+    assert editor.redo()
+    assert np.array_equal(editor.image[8:18, 40:50], 255 - original[8:18, 40:50])
+
+def test_geometry_edits_undo_to_the_previous_array():
+    original = gradient()
+    editor = ImageEditor(original.copy())
+    editor.crop(10, 10, 20, 30)
+    editor.convert('gray')
+    assert editor.size == (20, 30)
+    assert editor.image.ndim == 2
+    assert editor.undo() and editor.undo()
+    assert np.array_equal(editor.image, original)
+    assert not editor.undo()
+
+def test_history_drops_the_oldest_steps_over_budget():
+    editor = ImageEditor(gradient(), TileHistory(max_bytes=2 * 96 * 128 * 3))
+    for _ in range(4):
+        editor.invert()
+    assert len(editor.history.undo_stack) == 2
+    assert editor.history.nbytes <= editor.history.max_bytes
@@ -0,0 +1,46 @@
+import sys
+import time
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from app_manager import AppManager
+from app_store import JSONAppStore
+from launcher import ProcessLauncher
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+def wait_for(app, condition, timeout=5):
+    end = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.005)
+    assert condition()
+
+def test_statuses_of_a_previous_session_are_reset(app, tmp_path):
+    path = str(tmp_path / 'apps.json')
+    JSONAppStore(path).commit({
+        name: {'type': 'TeamViewer', 'config': {'connection_id': name}, 'status': status}
+        for name, status in [('a', 'active'), ('s', 'streaming'), ('c', 'crashed'), ('i', 'inactive')]
+    }, ['a', 's', 'c', 'i'], [])
+    manager = AppManager(JSONAppStore(path))
+    ProcessLauncher(manager)
+    assert {app['status'] for app in manager.apps.values()} == {'inactive'}
+    assert {app['status'] for app in JSONAppStore(path).load().values()} == {'inactive'}
+
+def test_exit_codes_decide_the_final_status(app, tmp_path):
+    manager = AppManager(JSONAppStore(str(tmp_path / 'apps.json')))
+    manager.add_app('ok', 'TeamViewer', {'connection_id': '1'})
+    manager.add_app('bad', 'TeamViewer', {'connection_id': '2'})
+    launcher = ProcessLauncher(manager)
+    changes = []
+    launcher.statusChanged.connect(lambda name, status: changes.append((name, status)))
+    assert launcher.launch('ok', [sys.executable, '-c', 'pass'])
+    assert launcher.launch('bad', [sys.executable, '-c', 'raise SystemExit(3)'])
+    assert manager.get_app_status('ok') == 'active'
+    wait_for(app, lambda: not launcher.processes)
+    assert manager.get_app_status('ok') == 'inactive'
+    assert manager.get_app_status('bad') == 'crashed'
+    assert sorted(changes) == [('bad', 'active'), ('bad', 'crashed'), ('ok', 'active'), ('ok', 'inactive')]
@@ -0,0 +1,9 @@
+from metrics import MovingAverage
+
+def test_first_sample_seeds_the_average():
+    average = MovingAverage(0.5)
+    assert average.add(10.0) == 10.0
+    assert average.add(20.0) == 15.0
+    assert average.add(5.0) == 10.0
+    assert average.peak == 20.0
+    assert average.count == 3
@@ -0,0 +1,46 @@
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QIcon
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication
+
+import main
+from components.app_nav_button import AppNavButton
+from components.app_nav_list import AppNavList
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def nav(app):
+    """An AppNavList wired the way main() wires it"""
+    calls = []
+    nav = AppNavList(lambda name: AppNavButton(name, QIcon(), lambda name: calls.append(('delete', name)),
+                                               main.select_app,
+                                               lambda name: calls.append(('launch', name))))
+    for name in ('TeamViewer_1', 'OBS Studio_2'):
+        nav.add(name)
+    nav.show()
+    yield nav, calls
+    nav.close()
+
+def test_clicking_a_row_selects_its_app(nav, capsys):
+    nav, calls = nav
+    QTest.mouseClick(nav.buttons['OBS Studio_2'].label, Qt.LeftButton)
+    assert capsys.readouterr().out == "Selected app: OBS Studio_2\n"
+
+def test_double_click_launches_and_delete_button_deletes(nav):
+    nav, calls = nav
+    QTest.mouseDClick(nav.buttons['TeamViewer_1'].label, Qt.LeftButton)
+    QTest.mouseClick(nav.buttons['TeamViewer_1'].delete_btn, Qt.LeftButton)
+    assert ('launch', 'TeamViewer_1') in calls
+    assert calls[-1] == ('delete', 'TeamViewer_1')
+
+def test_rows_are_added_and_removed_in_place(nav):
+    nav, calls = nav
+    kept = nav.buttons['TeamViewer_1']
+    assert nav.add('TeamViewer_1') is kept
+    assert nav.remove('OBS Studio_2')
+    assert list(nav.buttons) == ['TeamViewer_1']
+    assert nav.buttons['TeamViewer_1'] is kept
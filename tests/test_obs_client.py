@@ -0,0 +1,77 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from mock_obs import MockOBSServer
+from obs_client import OBSClient, OBSError, RequestBatch
+
+def run_against(coroutine, **server_options):
+    """Run ``coroutine(server, client)`` with a connected client"""
+    async def run():
+        server = MockOBSServer(**server_options)
+        await server.start()
+        client = OBSClient(f'ws://localhost:{server.port}', server_options.get('password'),
+                           reconnect_delay=0.05, max_reconnect_delay=0.05)
+        task = asyncio.create_task(client.run())
+        try:
+            assert await client.wait_connected(5)
+            return await coroutine(server, client)
+        finally:
+            await client.stop()
+            await task
+            await server.stop()
+    return asyncio.run(run())
+
+def test_requests_with_password_and_events():
+    async def scenario(server, client):
+        events = []
+        client.on('CurrentProgramSceneChanged', lambda event, data: events.append(data['sceneName']))
+        scenes = await client.request('GetSceneList')
+        await client.request('SetCurrentProgramScene', {'sceneName': 'Camera'})
+        with pytest.raises(OBSError) as error:
+            await client.request('SetCurrentProgramScene', {'sceneName': 'Missing'})
+        await asyncio.sleep(0.05)
+        return scenes, events, error.value
+
+    scenes, events, error = run_against(scenario, password='secret')
+    assert [scene['sceneName'] for scene in scenes['scenes']] == ['Scene', 'Camera', 'Screen']
+    assert events == ['Camera']
+    assert error.request_type == 'SetCurrentProgramScene'
+
+def test_requests_are_pipelined():
+    async def scenario(server, client):
+        start = time.perf_counter()
+        results = await asyncio.gather(*(client.request('GetVersion') for _ in range(20)))
+        return results, time.perf_counter() - start
+
+    results, elapsed = run_against(scenario, latency_ms=50)
+    assert len(results) == 20
+    # Sequential round trips would take a second
+    assert elapsed < 0.5
+
+def test_batch_reports_each_result():
+    async def scenario(server, client):
+        batch = RequestBatch().add('StartStream').add('NoSuchRequest').add('GetStreamStatus')
+        return await client.batch(batch)
+
+    results = run_against(scenario)
+    assert [result['ok'] for result in results] == [True, False, True]
+    assert results[2]['data'] == {'outputActive': True}
+
+def test_reconnects_after_obs_restarts():
+    async def scenario(server, client):
+        await server.stop()
+        await asyncio.sleep(0.2)
+        assert not client.connected
+        await server.start()
+        version = await client.request('GetVersion', timeout=5)
+        return version, client.reconnects
+
+    version, reconnects = run_against(scenario)
+    assert version['rpcVersion'] == 1
+    assert reconnects == 1
@@ -0,0 +1,69 @@
+import os
+import socket
+import sys
+import time
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import main
+from mock_obs import MockOBSServer
+from persistent_client import LoopThread
+
+class FakeLauncher:
+    def __init__(self):
+        self.launched = []
+
+    def is_running(self, app_name):
+        return False
+
+    def launch(self, app_name, args):
+        self.launched.append(args)
+        return True
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+def wait(app, future, timeout=10):
+    end = time.perf_counter() + timeout
+    while not future.done() and time.perf_counter() < end:
+        app.processEvents()
+    assert future.done()
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+def test_streams_through_a_running_obs_without_launching(app):
+    loop = LoopThread()
+    server = MockOBSServer()
+    loop.submit(server.start()).result(5)
+    controllers, launcher = {}, FakeLauncher()
+    try:
+        future = main.start_obs_stream(controllers, launcher, 'OBS', {'obs_url': f'ws://localhost:{server.port}'})
+        wait(app, future)
+        assert future.result() is True
+        assert server.streaming
+        assert launcher.launched == []
+    finally:
+        for controller in controllers.values():
+            controller.stop()
+        loop.submit(server.stop()).result(5)
+        loop.stop()
+
+def test_missing_obs_fails_the_future(app, monkeypatch):
+    monkeypatch.setattr(main.resolver, 'resolve', lambda name: None)
+    controllers, launcher = {}, FakeLauncher()
+    try:
+        future = main.start_obs_stream(controllers, launcher, 'OBS', {'obs_url': f'ws://localhost:{free_port()}'})
+        assert not future.done()
+        wait(app, future)
+        assert isinstance(future.exception(), LookupError)
+        assert launcher.launched == []
+    finally:
+        for controller in controllers.values():
+            controller.stop()
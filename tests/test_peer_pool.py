@@ -0,0 +1,77 @@
+import asyncio
+
+from control_plane import PeerPool, RPCServer
+
+async def whoami(claims):
+    return claims['sub']
+
+def serve(port=0):
+    # Every token is valid and names its own caller
+    return RPCServer({'whoami': whoami}, port=port, verify=lambda token: {'sub': token})
+
+def test_each_token_gets_its_own_connections():
+    async def run():
+        server = serve()
+        await server.start()
+        url = f'ws://localhost:{server.port}'
+        pool = PeerPool()
+        try:
+            assert await pool.call(url, 'whoami', 5, token='alice') == 'alice'
+            alice = list(pool.peers[url, 'alice'].clients)
+            # A second token neither reuses nor replaces alice's connection
+            assert await pool.call(url, 'whoami', 5, token='bob') == 'bob'
+            assert pool.peers[url, 'alice'].clients == alice
+            assert await pool.call(url, 'whoami', 5, token='alice') == 'alice'
+            return pool.stats(url, 'alice'), pool.stats(url, 'bob'), len(server.clients)
+        finally:
+            await pool.close()
+            await server.stop()
+
+    alice, bob, connections = asyncio.run(run())
+    assert (alice['calls'], alice['opened'], alice['evicted']) == (2, 1, 0)
+    assert (bob['calls'], bob['opened']) == (1, 1)
+    assert connections == 2
+
+def test_calls_reconnect_after_the_peer_restarts():
+    async def run():
+        server = serve()
+        await server.start()
+        port = server.port
+        url = f'ws://localhost:{port}'
+        pool = PeerPool(reconnect_delay=0.05, max_reconnect_delay=0.05)
+        try:
+            assert await pool.call(url, 'whoami', 5, token='alice') == 'alice'
+            await server.stop()
+            await asyncio.sleep(0.2)
+            assert not pool.connected(url, 'alice')
+            server = serve(port)
+            await server.start()
+            assert await pool.call(url, 'whoami', 5, token='alice') == 'alice'
+            return pool.stats(url, 'alice')
+        finally:
+            await pool.close()
+            await server.stop()
+
+    stats = asyncio.run(run())
+    # The same connection came back instead of a new one being opened
+    assert (stats['opened'], stats['reconnects'], stats['failures']) == (1, 1, 0)
+
+def test_idle_connections_are_evicted_unless_subscribed():
+    async def run():
+        server = serve()
+        await server.start()
+        url = f'ws://localhost:{server.port}'
+        pool = PeerPool(idle_timeout=0.1, keepalive_interval=0.05)
+        try:
+            await pool.call(url, 'whoami', 5, token='alice')
+            pool.subscribe(url, lambda event, data: None, token='bob')
+            await asyncio.sleep(0.5)
+            return pool.stats(url, 'alice'), pool.stats(url, 'bob'), len(server.clients)
+        finally:
+            await pool.close()
+            await server.stop()
+
+    alice, bob, connections = asyncio.run(run())
+    assert alice is None
+    assert bob['connections'] == 1 and bob['evicted'] == 0
+    assert connections == 1
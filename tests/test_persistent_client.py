@@ -0,0 +1,35 @@
+import asyncio
+
+from control_plane import RPCClient, RPCServer
+
+def test_reconnects_counts_successful_reconnections():
+    async def status(name):
+        return 'active'
+
+    async def run():
+        server = RPCServer({'status': status}, port=0)
+        await server.start()
+        port = server.port
+        client = RPCClient(f'ws://localhost:{port}', reconnect_delay=0.05, max_reconnect_delay=0.05)
+        changes = []
+        client.on_connection = changes.append
+        task = asyncio.create_task(client.run())
+        assert await client.wait_connected(5)
+        assert client.reconnects == 0
+        await server.stop()
+        # Refused attempts while the server is down are not reconnections
+        await asyncio.sleep(0.3)
+        assert client.reconnects == 0
+        server = RPCServer({'status': status}, port=port)
+        await server.start()
+        result = await client.call('status', timeout=5, name='app')
+        reconnects = client.reconnects
+        await client.stop()
+        await task
+        await server.stop()
+        return result, reconnects, changes
+
+    result, reconnects, changes = asyncio.run(run())
+    assert result == 'active'
+    assert reconnects == 1
+    assert changes == [True, False, True, False]
@@ -0,0 +1,69 @@
+import threading
+import time
+
+import numpy as np
+
+from recorder import StreamRecorder
+from video_manager import Frame
+
+class StalledWriter:
+    """VideoWriter stand-in whose writes wait until ``disk`` is set"""
+
+    def __init__(self, disk: threading.Event, files: list):
+        self.disk = disk
+        self.frames = []
+        files.append(self)
+
+    def isOpened(self):
+        return True
+
+    def write(self, image):
+        self.disk.wait(5)
+        self.frames.append(image)
+
+    def release(self):
+        pass
+
+def frames(count, start_ns=0, interval_ns=33_000_000):
+    image = np.zeros((8, 8, 3), dtype=np.uint8)
+    return [Frame(seq, image, start_ns + seq * interval_ns) for seq in range(1, count + 1)]
+
+def recorder_for(tmp_path, disk, files, **options):
+    return StreamRecorder('Camera 1', str(tmp_path), writer_factory=lambda *args: StalledWriter(disk, files), **options)
+
+def test_full_queue_drops_frames_without_blocking_capture(tmp_path):
+    disk, files = threading.Event(), []
+    recorder = recorder_for(tmp_path, disk, files, queue_size=8, degrade_ratio=0.5)
+    recorder.start()
+    start = time.perf_counter()
+    for frame in frames(100):
+        recorder.feed(frame)
+    # The disk is stuck, yet feeding never waited on it
+    assert time.perf_counter() - start < 0.5
+    stats = recorder.get_stats()
+    assert stats['queue_depth'] == stats['queue_size'] == 8
+    assert stats['degraded'] > 0 and stats['dropped'] > 0
+    assert stats['queued'] + stats['degraded'] + stats['dropped'] == 100
+    disk.set()
+    recorder.close()
+    assert recorder.get_stats()['written'] == stats['queued']
+    assert sum(len(writer.frames) for writer in files) == stats['queued']
+
+def test_preroll_is_written_ahead_of_the_trigger(tmp_path):
+    disk, files = threading.Event(), []
+    disk.set()
+    recorder = recorder_for(tmp_path, disk, files, preroll_seconds=1.0, segment_seconds=2.0,
+                            queue_size=256)
+    stream = frames(120)
+    for frame in stream[:60]:
+        recorder.feed(frame)
+    # Only the last second (about 30 frames at 30 fps) is kept
+    assert 29 <= recorder.get_stats()['preroll_frames'] <= 31
+    recorder.start()
+    for frame in stream[60:]:
+        recorder.feed(frame)
+    recorder.close()
+    written = recorder.get_stats()['written']
+    assert 89 <= written <= 91
+    # 3 s of capture in 2 s segments
+    assert len(recorder.segments) == 2
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+import websockets
+
+from auth import ROLE_USER, TokenService
+from frame_stream import FrameReceiver, FrameSender
+from usb_bridge import USBBridgeClient, USBBridgeServer
+from usb_manager import USBManager
+from video_manager import SyntheticCapture, VideoManager
+
+TOKENS = TokenService(b'test secret')
+
+def test_usb_bridge_refuses_clients_without_a_valid_token():
+    async def run():
+        server = USBBridgeServer(USBManager(), port=0, tokens=TOKENS)
+        await server.start()
+        uri = f'ws://localhost:{server.port}'
+        try:
+            for token in (None, TokenService(b'other secret').issue('mallory', ROLE_USER)):
+                with pytest.raises(websockets.InvalidStatusCode) as refused:
+                    await USBBridgeClient(uri, print, token).run()
+                assert refused.value.status_code == 401
+            client = USBBridgeClient(uri, print, TOKENS.issue('alice', ROLE_USER))
+            task = asyncio.create_task(client.run())
+            while not server.clients:
+                await asyncio.sleep(0.01)
+            await client.close()
+            await task
+        finally:
+            await server.stop()
+    asyncio.run(run())
+
+def test_frame_sender_refuses_receivers_without_a_valid_token():
+    async def run():
+        manager = VideoManager()
+        manager.open_stream('camera', SyntheticCapture(64, 48, fps=100))
+        sender = FrameSender(manager, 'camera', port=0, tokens=TOKENS)
+        assert await sender.start()
+        uri = f'ws://localhost:{sender.port}'
+        frames = []
+        try:
+            with pytest.raises(websockets.InvalidStatusCode) as refused:
+                await FrameReceiver(uri, print).run()
+            assert refused.value.status_code == 401
+            receiver = FrameReceiver(uri, lambda *frame: frames.append(frame), TOKENS.issue('alice', ROLE_USER))
+            task = asyncio.create_task(receiver.run())
+            while not frames:
+                await asyncio.sleep(0.01)
+            await receiver.close()
+            await task
+        finally:
+            await sender.stop()
+            manager.close_all()
+        return frames
+    assert asyncio.run(run())
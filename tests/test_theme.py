@@ -0,0 +1,33 @@
+from PySide6.QtWidgets import QApplication, QDialog, QLabel, QVBoxLayout
+
+from components.theme import THEMES, ThemeManager
+
+def error_colour(dialog):
+    return dialog.findChild(QLabel, 'errorLabel').palette().windowText().color().name()
+
+def make_dialog():
+    dialog = QDialog()
+    label = QLabel('Wrong password')
+    label.setObjectName('errorLabel')
+    QVBoxLayout(dialog).addWidget(label)
+    dialog.show()
+    return dialog
+
+def test_switch_recolours_open_and_new_windows():
+    app = QApplication.instance() or QApplication([])
+    theme = ThemeManager(app)
+    try:
+        theme.apply('dark')
+        dialog = make_dialog()
+        app.processEvents()
+        assert error_colour(dialog) == '#ff0000'
+        theme.apply('light')
+        app.processEvents()
+        assert error_colour(dialog) == THEMES['light']['error']
+        later = make_dialog()
+        app.processEvents()
+        assert error_colour(later) == THEMES['light']['error']
+        dialog.close()
+        later.close()
+    finally:
+        app.setStyleSheet('')
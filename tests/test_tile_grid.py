@@ -0,0 +1,48 @@
+import pytest
+from PySide6.QtWidgets import QApplication, QLabel, QScrollArea
+
+from components.tile_grid import TileGrid
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+def cells(grid):
+    cells = {}
+    for key, tile in grid.tiles.items():
+        row, column, _, _ = grid.layout.getItemPosition(grid.layout.indexOf(tile))
+        cells[key] = (row, column)
+    return cells
+
+def test_remove_shifts_only_the_later_tiles(app):
+    grid = TileGrid(columns=2)
+    for key in 'abcde':
+        assert grid.add_tile(key, QLabel(key))
+    assert not grid.add_tile('a', QLabel('again'))
+    tile = grid.remove_tile('b')
+    assert tile.text() == 'b'
+    assert grid.order == ['a', 'c', 'd', 'e']
+    assert grid.positions == {'a': 0, 'c': 1, 'd': 2, 'e': 3}
+    assert cells(grid) == {'a': (0, 0), 'c': (0, 1), 'd': (1, 0), 'e': (1, 1)}
+    assert grid.remove_tile('b') is None
+    grid.set_columns(3)
+    assert cells(grid) == {'a': (0, 0), 'c': (0, 1), 'd': (0, 2), 'e': (1, 0)}
+
+def test_tiles_scrolled_out_of_view_are_hidden(app):
+    grid = TileGrid(columns=1)
+    for index in range(20):
+        tile = QLabel(str(index))
+        tile.setFixedHeight(200)
+        grid.add_tile(str(index), tile)
+    area = QScrollArea()
+    area.setWidget(grid)
+    area.resize(300, 400)
+    area.show()
+    app.processEvents()
+    assert grid.tiles['0'].isVisible()
+    assert not grid.tiles['19'].isVisible()
+    area.verticalScrollBar().setValue(area.verticalScrollBar().maximum())
+    app.processEvents()
+    assert grid.tiles['19'].isVisible()
+    assert not grid.tiles['0'].isVisible()
+    area.close()
@@ -0,0 +1,180 @@
+import asyncio
+import errno
+import threading
+import time
+from types import SimpleNamespace
+
+import usb.core
+import usb.util
+
+from usb_manager import DeviceRegistry, RingBuffer, USBManager
+
+def fake_device(address, manufacturer_index=0):
+    return SimpleNamespace(bus=1, address=address, idVendor=0x1234, idProduct=address,
+                           iManufacturer=manufacturer_index, iProduct=0)
+
+def test_concurrent_refreshes_assign_one_id_per_device(monkeypatch):
+    # A slow string descriptor read widens the window between listing and registering
+    monkeypatch.setattr(usb.util, 'get_string', lambda device, index: time.sleep(0.02) or 'Vendor')
+    devices = [fake_device(address, 1) for address in range(1, 5)]
+    registry = DeviceRegistry(lambda: list(devices))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.refresh())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    added = [info['device_id'] for added, _ in results for info in added]
+    assert sorted(added) == list(range(len(devices)))
+    assert sorted(registry.ids.values()) == list(range(len(devices)))
+
+def test_monitor_survives_errors_and_stops_without_backend():
+    errors = [RuntimeError("transient"), usb.core.NoBackendError("No backend available")]
+    calls = []
+
+    def find_all():
+        calls.append(1)
+        if len(calls) == 2:
+            raise errors[0]
+        if len(calls) == 4:
+            raise errors[1]
+        return [fake_device(1)] if len(calls) == 3 else []
+
+    registry = DeviceRegistry(find_all)
+    changes = []
+    registry.start_monitoring(lambda added, removed: changes.append((len(added), len(removed))), interval=0.01)
+    registry._monitor.join(2)
+    assert not registry._monitor.is_alive()
+    assert len(calls) == 4
+    assert changes == [(1, 0)]
+    registry.stop_monitoring()
+
+class StreamingDevice:
+    """Always has a packet ready, so only a full ring stops the reader"""
+
+    bus, address, idVendor, idProduct, iManufacturer, iProduct = 1, 1, 0x1234, 1, 0, 0
+
+    def __init__(self):
+        self.reads = 0
+        self.endpoint = SimpleNamespace(bEndpointAddress=0x81, wMaxPacketSize=64)
+
+    def set_configuration(self):
+        pass
+
+    def __getitem__(self, index):
+        return {(0, 0): [self.endpoint]}
+
+    def read(self, address, buffer, timeout):
+        self.reads += 1
+        return len(buffer)
+
+def test_full_ring_does_not_spin_the_worker():
+    device = StreamingDevice()
+    manager = USBManager(registry=DeviceRegistry(lambda: [device]))
+    device_id = manager.find_devices()[0]['device_id']
+    delivered = []
+
+    async def run():
+        assert await manager.start_buffered_streaming(device_id, lambda batch, timestamps: delivered.extend(timestamps),
+                                                      slots=8)
+        # Blocking the event loop stalls the consumer: the ring fills and stays full
+        cpu, start = time.process_time(), time.perf_counter()
+        time.sleep(0.5)
+        busy = (time.process_time() - cpu) / (time.perf_counter() - start)
+        reads, stalled_until = device.reads, time.time_ns()
+        await manager.stop_streaming(device_id)
+        return busy, reads, stalled_until
+
+    busy, reads, stalled_until = asyncio.run(run())
+    assert reads == 8
+    assert busy < 0.25
+    assert len(delivered) == 8
+    # Stamped when read, not when the stalled loop finally delivered them
+    assert all(stalled_until - timestamp > 0.3e9 for timestamp in delivered)
+
+class IdleDevice(StreamingDevice):
+    """Never has data: every read blocks for the whole timeout"""
+
+    def __init__(self, address):
+        super().__init__()
+        self.address = self.idProduct = address
+
+    def read(self, address, buffer, timeout):
+        self.reads += 1
+        time.sleep(timeout / 1000)
+        raise usb.core.USBTimeoutError('Operation timed out', errno=errno.ETIMEDOUT)
+
+class PacedDevice(StreamingDevice):
+    """Has a packet every ``interval`` seconds and records when each was due"""
+
+    def __init__(self, address, interval):
+        super().__init__()
+        self.address = self.idProduct = address
+        self.interval = interval
+        self.due = None
+
+    def set_configuration(self):
+        self.due = time.perf_counter() + self.interval
+
+    def read(self, address, size, timeout):
+        delay = self.due - time.perf_counter()
+        if delay > timeout / 1000:
+            time.sleep(timeout / 1000)
+            raise usb.core.USBTimeoutError('Operation timed out', errno=errno.ETIMEDOUT)
+        time.sleep(max(0.0, delay))
+        due, self.due = self.due, max(self.due + self.interval, time.perf_counter())
+        return due
+
+def test_idle_devices_do_not_delay_an_active_one():
+    idle = [IdleDevice(address) for address in range(2, 32)]
+    active = PacedDevice(1, interval=0.002)
+    manager = USBManager(poll_timeout=1, registry=DeviceRegistry(lambda: [active] + idle))
+    latencies = []
+
+    async def run():
+        for info in manager.find_devices():
+            device = info['device']
+            callback = (lambda due: latencies.append(time.perf_counter() - due)) if device is active else print
+            assert await manager.start_streaming(info['device_id'], callback)
+        await asyncio.sleep(1.0)
+        for device_id in list(manager.streams):
+            await manager.stop_streaming(device_id)
+
+    asyncio.run(run())
+    # Visiting 30 idle endpoints per pass would block for 30 ms each time
+    assert len(latencies) > 300
+    assert sorted(latencies)[int(len(latencies) * 0.95)] < 0.01
+    # Each idle endpoint is still probed, at least once per backoff period
+    assert all(5 < device.reads < 100 for device in idle)
+
+def test_ring_buffer_hands_out_views_in_order_and_wraps():
+    ring = RingBuffer(3, 4)
+    for value in range(3):
+        slot = ring.acquire_write(0)
+        slot[0] = value
+        ring.commit(1 + value, timestamp=value)
+    # Full until the consumer releases a slot
+    assert ring.acquire_write(0) is None
+    assert ring.stalls == 1
+    batch, timestamps = ring.read_batch(2, 0)
+    assert [bytes(view) for view in batch] == [b'\x00', b'\x01\x00']
+    assert timestamps == [0, 1]
+    for view in batch:
+        view.release()
+    ring.release(len(batch))
+    slot = ring.acquire_write(0)
+    assert slot is ring.slots[0]
+    slot[0] = 9
+    ring.commit(1, timestamp=3)
+    batch, timestamps = ring.read_batch(8, 0)
+    assert [view[0] for view in batch] == [2, 9]
+    assert timestamps == [2, 3]
+
+def test_ring_buffer_close_wakes_a_waiting_writer():
+    ring = RingBuffer(1, 4)
+    ring.acquire_write(0)
+    ring.commit(4)
+    threading.Timer(0.05, ring.close).start()
+    start = time.perf_counter()
+    assert ring.acquire_write(5) is None
+    assert time.perf_counter() - start < 1
@@ -0,0 +1,59 @@
+import time
+
+import numpy as np
+
+from video_manager import Frame, FrameSlot, SyntheticCapture, VideoManager
+
+def test_frame_slot_keeps_only_the_latest_frame():
+    slot = FrameSlot()
+    image = np.zeros((2, 2, 3), dtype=np.uint8)
+    for seq in range(1, 4):
+        slot.put(Frame(seq, image, 0))
+    assert slot.get().seq == 3
+    # Frames 1 and 2 were replaced before anyone read them
+    assert slot.dropped == 2
+    assert slot.get(after_seq=3) is None
+    slot.put(Frame(4, image, 0))
+    assert slot.dropped == 2
+
+def test_slow_consumer_skips_frames_instead_of_queueing():
+    manager = VideoManager()
+    manager.open_stream('camera', SyntheticCapture(64, 48, fps=200))
+    sunk = []
+    assert manager.add_sink('camera', lambda frame: sunk.append(frame.seq))
+    try:
+        seen = []
+        frame = manager.latest_frame('camera', timeout=5)
+        end = time.monotonic() + 0.5
+        while time.monotonic() < end:
+            frame = manager.latest_frame('camera', after_seq=frame.seq, timeout=1)
+            manager.mark_displayed('camera', frame)
+            seen.append(frame.seq)
+            time.sleep(0.02)
+        stats = manager.get_stats('camera')
+    finally:
+        manager.close_all()
+    # Each read returns the newest frame, never a backlog
+    assert all(later - earlier > 1 for earlier, later in zip(seen, seen[1:]))
+    assert stats['dropped'] > stats['displayed']
+    assert stats['displayed'] == len(seen)
+    assert stats['latency_ms'] < 50
+    # Sinks still see every frame from the one they were added at
+    assert sunk == list(range(sunk[0], sunk[0] + len(sunk)))
+
+def test_exhausted_source_is_lost_and_unopenable_source_errors():
+    def factory(source):
+        capture = SyntheticCapture(16, 16)
+        capture.release()
+        return capture
+
+    manager = VideoManager(factory)
+    manager.open_stream('short', SyntheticCapture(16, 16, fps=1000, frames=5))
+    manager.open_stream('unplugged', 1)
+    for stream in list(manager.streams.values()):
+        stream.thread.join(5)
+    assert manager.get_stats('short')['status'] == 'lost'
+    assert manager.get_stats('short')['captured'] == 5
+    assert manager.latest_frame('short').seq == 5
+    assert manager.get_stats('unplugged')['status'] == 'error'
+    manager.close_all()
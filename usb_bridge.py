@@ -0,0 +1,172 @@
+import asyncio
+import struct
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple
+
+import websockets
+
+from auth import TokenService, bearer_check, bearer_headers, tokens as default_tokens
+from usb_manager import USBManager
+
+# device id, endpoint address, sequence, timestamp (ns since epoch, when the USB
+# worker read the packet), payload length
+FRAME_HEADER = struct.Struct('!HBIQH')
+
+def pack_frame(buffer: bytearray, device_id: int, endpoint: int, sequence: int,
+               timestamp: int, payload) -> None:
+    """Append one framed packet to ``buffer``"""
+    buffer += FRAME_HEADER.pack(device_id, endpoint, sequence & 0xFFFFFFFF, timestamp, len(payload))
+    buffer += payload
+
+def iter_frames(message: bytes) -> Iterator[Tuple[int, int, int, int, memoryview]]:
+    """Yield ``(device_id, endpoint, sequence, timestamp, payload)`` for each frame in a message"""
+    view = memoryview(message)
+    offset = 0
+    while offset < len(view):
+        device_id, endpoint, sequence, timestamp, length = FRAME_HEADER.unpack_from(view, offset)
+        offset += FRAME_HEADER.size
+        yield device_id, endpoint, sequence, timestamp, view[offset:offset + length]
+        offset += length
+
+class FrameCoalescer:
+    """Collects frames and flushes them as one message every N bytes or T microseconds
+
+    ``max_bytes=0`` sends every frame on its own for the lowest latency.
+    """
+
+    def __init__(self, send: Callable[[bytes], None], max_bytes: int = 16384, max_delay_us: int = 1000):
+        self.send = send
+        self.max_bytes = max_bytes
+        self.max_delay_us = max_delay_us
+        self.buffer = bytearray()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def add(self, device_id: int, endpoint: int, sequence: int, timestamp: int, payload) -> None:
+        pack_frame(self.buffer, device_id, endpoint, sequence, timestamp, payload)
+        if len(self.buffer) >= self.max_bytes:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay_us / 1e6, self.flush)
+
+    def flush(self) -> None:
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if self.buffer:
+            message = bytes(self.buffer)
+            self.buffer.clear()
+            self.send(message)
+
+class USBBridgeServer:
+    """Serves USBManager streams to WebSocket clients using binary frames
+
+    Every client must present a token from ``tokens`` (by default this
+    machine's auth.tokens) allowing 'watch' when it connects, as
+    ``Authorization: Bearer <token>``.
+    """
+
+    def __init__(self, usb_manager: USBManager, host: str = 'localhost', port: int = 8765,
+                 max_bytes: int = 16384, max_delay_us: int = 1000, tokens: Optional[TokenService] = None):
+        self.usb_manager = usb_manager
+        self.host = host
+        self.port = port
+        self.tokens = tokens or default_tokens
+        self.clients: Set = set()
+        self.coalescer = FrameCoalescer(self._broadcast, max_bytes, max_delay_us)
+        self.sequences: Dict[int, int] = {}
+        self._server = None
+
+    async def start(self):
+        """Start accepting client connections"""
+        self._server = await websockets.serve(self._handle_client, self.host, self.port, compression=None,
+                                              process_request=bearer_check(self.tokens, 'watch'))
+        if self.port == 0:
+            self.port = next(iter(self._server.sockets)).getsockname()[1]
+
+    async def stop(self):
+        """Stop every bridged stream and close the server"""
+        for device_id in list(self.sequences):
+            await self.unbridge_device(device_id)
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def bridge_device(self, device_id: int, slots: int = 256) -> bool:
+        """Start streaming a device and forward its packets to all clients"""
+        device = self.usb_manager.devices.get(device_id)
+        if not device or device_id in self.sequences:
+            return False
+        endpoint = device[0][(0,0)][0].bEndpointAddress
+        self.sequences[device_id] = 0
+
+        def on_batch(batch, timestamps):
+            sequence = self.sequences[device_id]
+            for view, timestamp in zip(batch, timestamps):
+                self.coalescer.add(device_id, endpoint, sequence, timestamp, view)
+                sequence += 1
+            self.sequences[device_id] = sequence
+
+        if not await self.usb_manager.start_buffered_streaming(device_id, on_batch, slots=slots):
+            del self.sequences[device_id]
+            return False
+        return True
+
+    async def unbridge_device(self, device_id: int) -> bool:
+        """Stop forwarding a device"""
+        if device_id not in self.sequences:
+            return False
+        await self.usb_manager.stop_streaming(device_id)
+        self.coalescer.flush()
+        del self.sequences[device_id]
+        return True
+
+    def _broadcast(self, message: bytes):
+        websockets.broadcast(self.clients, message)
+
+    async def _handle_client(self, websocket):
+        self.clients.add(websocket)
+        try:
+            await websocket.wait_closed()
+        finally:
+            self.clients.discard(websocket)
+
+class USBBridgeClient:
+    """Receives bridged USB packets and replays them through ``on_packet``
+
+    ``on_packet(device_id, endpoint, sequence, timestamp, payload)`` is called
+    for every frame; ``payload`` is a memoryview that is only valid during the
+    call. Gaps in a device's sequence numbers are counted in ``lost``.
+    ``token`` is presented to the server; by default it is the token of
+    this overlay's own session.
+    """
+
+    def __init__(self, uri: str, on_packet: Callable, token: Optional[str] = None):
+        self.uri = uri
+        self.on_packet = on_packet
+        self.token = token or default_tokens.session
+        self.expected: Dict[int, int] = {}
+        self.lost = 0
+        self.received = 0
+        self._websocket = None
+
+    async def run(self):
+        """Connect and replay packets until the connection closes"""
+        async with websockets.connect(self.uri, compression=None, max_size=None,
+                                      extra_headers=bearer_headers(self.token)) as websocket:
+            self._websocket = websocket
+            async for message in websocket:
+                self._replay(message)
+        self._websocket = None
+
+    async def close(self):
+        if self._websocket:
+            await self._websocket.close()
+
+    def _replay(self, message: bytes):
+        for device_id, endpoint, sequence, timestamp, payload in iter_frames(message):
+            expected = self.expected.get(device_id)
+            if expected is not None and sequence != expected:
+                self.lost += (sequence - expected) & 0xFFFFFFFF
+            self.expected[device_id] = (sequence + 1) & 0xFFFFFFFF
+            self.received += 1
+            self.on_packet(device_id, endpoint, sequence, timestamp, payload)
@@ -1,90 +1,468 @@
 import usb.core
 import usb.util
+import array
+import asyncio
 import threading
 import time
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
-class USBManager:
-    def __init__(self):
+class RingBuffer:
+    """Preallocated ring of packet slots shared by a USB reader and a consumer
+
+    Each slot is an ``array('B')`` that is passed straight to
+    ``device.read(endpoint, buffer)`` so reads never allocate. Consumers get
+    batches of ``memoryview`` slices over the filled slots, with the time
+    each was read, and must call ``release`` once they are done with them.
+    """
+
+    def __init__(self, slots: int, slot_size: int):
+        self.slot_size = slot_size
+        self.slots = [array.array('B', bytes(slot_size)) for _ in range(slots)]
+        self.views = [memoryview(slot) for slot in self.slots]
+        self.lengths = [0] * slots
+        self.timestamps = [0] * slots  # ns since epoch, taken by the reader
+        self.head = 0  # total slots committed by the reader
+        self.read = 0  # total slots handed out to the consumer
+        self.tail = 0  # total slots released by the consumer
+        self.closed = False
+        self.stalls = 0
+        self._cond = threading.Condition()
+
+    def acquire_write(self, timeout: Optional[float] = None) -> Optional[array.array]:
+        """Return the next free slot, waiting for the consumer if the ring is full"""
+        with self._cond:
+            if self.head - self.tail >= len(self.slots):
+                self.stalls += 1
+                self._cond.wait_for(
+                    lambda: self.closed or self.head - self.tail < len(self.slots),
+                    timeout
+                )
+            if self.closed or self.head - self.tail >= len(self.slots):
+                return None
+            return self.slots[self.head % len(self.slots)]
+
+    def wait_writable(self, timeout: Optional[float] = None) -> bool:
+        """Wait until a slot is free (or the ring is closed) without taking it"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.closed or self.head - self.tail < len(self.slots), timeout)
+
+    def commit(self, length: int, timestamp: int = 0):
+        """Publish the slot returned by ``acquire_write`` holding ``length`` bytes read at ``timestamp``"""
+        with self._cond:
+            index = self.head % len(self.slots)
+            self.lengths[index] = length
+            self.timestamps[index] = timestamp
+            self.head += 1
+            self._cond.notify_all()
+
+    def read_batch(self, max_slots: int, timeout: Optional[float] = None) -> Tuple[List[memoryview], List[int]]:
+        """Return up to ``max_slots`` filled slots as memoryviews without copying, and their timestamps"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.closed or self.head > self.read, timeout)
+            count = min(self.head - self.read, max_slots)
+            batch = []
+            timestamps = []
+            for i in range(self.read, self.read + count):
+                index = i % len(self.slots)
+                batch.append(self.views[index][:self.lengths[index]])
+                timestamps.append(self.timestamps[index])
+            self.read += count
+            return batch, timestamps
+
+    def release(self, count: int):
+        """Hand ``count`` consumed slots back to the reader"""
+        with self._cond:
+            self.tail += count
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+class _Stream:
+    """Per-device streaming state serviced by the USBManager worker"""
+
+    def __init__(self, device: usb.core.Device, callback, loop: asyncio.AbstractEventLoop,
+                 ring: Optional[RingBuffer], max_batch: int):
+        self.device = device
+        self.callback = callback
+        self.loop = loop
+        self.ring = ring
+        self.max_batch = max_batch
+        self.endpoint = None
+        self.cancelled = False
+        self.stopped = loop.create_future()
+        # Seconds to leave the endpoint alone after reads that found nothing;
+        # 0 while it has data, so it is read on every pass
+        self.backoff = 0.0
+        self.idle_until = 0.0
+
+DeviceKey = Tuple[int, int, int, int]  # (bus, address, vendor id, product id)
+
+class DeviceRegistry:
+    """Cached view of the USB bus that only queries hardware for new devices
+
+    Descriptor strings cost a control transfer each, so they are read once
+    per device key and kept until the device disappears. ``refresh`` walks
+    the bus and returns only what was added and removed since the last call.
+    """
+
+    def __init__(self, find_all: Optional[Callable[[], Iterable[usb.core.Device]]] = None):
+        self.find_all = find_all or (lambda: usb.core.find(find_all=True))
         self.devices: Dict[int, usb.core.Device] = {}
-        self.streaming_threads: Dict[int, threading.Thread] = {}
-        self.running = False
-    
-    def find_devices(self) -> List[Dict]:
-        """Find all available USB devices"""
-        devices = []
-        for device in usb.core.find(find_all=True):
+        self.info: Dict[int, Dict] = {}
+        self.ids: Dict[DeviceKey, int] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        # One refresh at a time (monitor thread vs. explicit calls), so a new
+        # device gets one id and shows up in exactly one ``added`` list
+        self._refresh_lock = threading.Lock()
+        self._monitor: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @staticmethod
+    def device_key(device: usb.core.Device) -> DeviceKey:
+        return (device.bus, device.address, device.idVendor, device.idProduct)
+
+    def refresh(self) -> Tuple[List[Dict], List[Dict]]:
+        """Walk the bus once and return ``(added, removed)`` device info lists"""
+        with self._refresh_lock:
+            return self._refresh()
+
+    def _refresh(self) -> Tuple[List[Dict], List[Dict]]:
+        present = {}
+        for device in self.find_all():
+            present[self.device_key(device)] = device
+
+        with self._lock:
+            removed = []
+            for key in [key for key in self.ids if key not in present]:
+                device_id = self.ids.pop(key)
+                del self.devices[device_id]
+                removed.append(self.info.pop(device_id))
+            new_keys = [key for key in present if key not in self.ids]
+
+        # String descriptors are read outside the lock so lookups never wait on USB
+        added = []
+        for key in new_keys:
+            device = present[key]
+            info = {
+                'id': device.idVendor,
+                'product_id': device.idProduct,
+                'bus': device.bus,
+                'address': device.address,
+                'manufacturer': self._read_string(device, device.iManufacturer),
+                'product': self._read_string(device, device.iProduct),
+                'device': device
+            }
+            with self._lock:
+                info['device_id'] = self._next_id
+                self._next_id += 1
+                self.ids[key] = info['device_id']
+                self.devices[info['device_id']] = device
+                self.info[info['device_id']] = info
+            added.append(info)
+        return added, removed
+
+    @staticmethod
+    def _read_string(device: usb.core.Device, index: int) -> Optional[str]:
+        if not index:
+            return None
+        try:
+            return usb.util.get_string(device, index)
+        except (usb.core.USBError, ValueError, NotImplementedError) as e:
+            # Typically missing permissions or no language id; keep the device listed
+            print(f"Error reading USB string descriptor: {e}")
+            return None
+
+    def snapshot(self) -> List[Dict]:
+        """Return the cached device info without touching the bus"""
+        with self._lock:
+            return list(self.info.values())
+
+    def get(self, device_id: int) -> Optional[Dict]:
+        with self._lock:
+            return self.info.get(device_id)
+
+    def start_monitoring(self, on_change: Callable[[List[Dict], List[Dict]], None],
+                         interval: float = 1.0) -> bool:
+        """Refresh in a background thread and report only non-empty diffs
+
+        pyusb does not expose libusb hotplug callbacks, so the bus is polled;
+        each poll is a cheap descriptor walk once the strings are cached.
+        """
+        if self._monitor:
+            return False
+        self._stop.clear()
+        self._monitor = threading.Thread(target=self._monitor_loop, args=(on_change, interval), daemon=True)
+        self._monitor.start()
+        return True
+
+    def stop_monitoring(self) -> bool:
+        if not self._monitor:
+            return False
+        self._stop.set()
+        self._monitor.join()
+        self._monitor = None
+        return True
+
+    def _monitor_loop(self, on_change, interval: float):
+        while not self._stop.is_set():
             try:
-                device_info = {
-                    'id': device.idVendor,
-                    'manufacturer': usb.util.get_string(device, device.iManufacturer),
-                    'product': usb.util.get_string(device, device.iProduct),
-                    'device': device
-                }
-                devices.append(device_info)
-            except:
-                continue
-        return devices
+                added, removed = self.refresh()
+            except usb.core.NoBackendError as e:
+                # No libusb: every later poll would fail the same way
+                print(f"USB monitoring stopped, no backend available: {e}")
+                return
+            except Exception as e:
+                print(f"Error refreshing USB devices: {e}")
+            else:
+                if added or removed:
+                    on_change(added, removed)
+            self._stop.wait(interval)
+
+class USBManager:
+    # Longest an idle endpoint is left unread, in seconds
+    MAX_IDLE_BACKOFF = 0.05
+
+    def __init__(self, poll_timeout: int = 1, registry: Optional[DeviceRegistry] = None):
+        self.registry = registry or DeviceRegistry()
+        self.devices: Dict[int, usb.core.Device] = self.registry.devices
+        self.streams: Dict[int, _Stream] = {}
+        # Per-endpoint read timeout in ms; bounds how long one read of an
+        # idle device delays the others on the shared worker
+        self.poll_timeout = poll_timeout
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Wakes a worker waiting for an idle endpoint's backoff to run out
+        self._wake = threading.Event()
     
-    def start_streaming(self, device_id: int, callback) -> bool:
-        """Start streaming data from a USB device"""
-        if device_id in self.streaming_threads:
-            return False
+    def find_devices(self, refresh: bool = False) -> List[Dict]:
+        """Find all available USB devices
+        
+        Served from the registry cache; the bus is only walked on the first
+        call or when ``refresh`` is set.
+        """
+        if refresh or not self.registry.info:
+            self.registry.refresh()
+        return self.registry.snapshot()
+    
+    def start_monitoring(self, on_change: Callable[[List[Dict], List[Dict]], None],
+                         interval: float = 1.0) -> bool:
+        """Watch for devices being plugged in or removed"""
+        return self.registry.start_monitoring(on_change, interval)
+    
+    def stop_monitoring(self) -> bool:
+        """Stop watching for device changes"""
+        return self.registry.stop_monitoring()
+    
+    async def start_streaming(self, device_id: int, callback, max_batch: int = 64) -> bool:
+        """Start streaming data from a USB device
         
+        ``callback(data)`` is called once per packet on the running event loop.
+        """
+        return self._add_stream(device_id, callback, None, max_batch)
+    
+    async def start_buffered_streaming(self, device_id: int,
+                                       batch_callback: Callable[[List[memoryview], List[int]], None],
+                                       slots: int = 256, max_batch: int = 64) -> bool:
+        """Start streaming into a preallocated ring buffer, delivering packets in batches
+        
+        ``batch_callback(batch, timestamps)`` receives a list of memoryviews
+        over the ring on the running event loop, with the time (ns since
+        epoch) the worker read each one; the views are only valid until the
+        callback returns, so copy anything you keep.
+        """
         device = self.devices.get(device_id)
-        if not device:
+        if not device or device_id in self.streams:
             return False
-        
-        self.running = True
-        thread = threading.Thread(
-            target=self._stream_data,
-            args=(device, callback)
-        )
-        self.streaming_threads[device_id] = thread
-        thread.start()
+        endpoint = device[0][(0,0)][0]
+        ring = RingBuffer(slots, endpoint.wMaxPacketSize)
+        return self._add_stream(device_id, batch_callback, ring, max_batch)
+    
+    async def stop_streaming(self, device_id: int) -> bool:
+        """Stop streaming from a USB device, leaving other devices untouched"""
+        with self._lock:
+            stream = self.streams.get(device_id)
+            if not stream:
+                return False
+            stream.cancelled = True
+        self._wake.set()
+        await asyncio.shield(stream.stopped)
         return True
     
-    def stop_streaming(self, device_id: int) -> bool:
-        """Stop streaming from a USB device"""
-        if device_id not in self.streaming_threads:
+    def _add_stream(self, device_id: int, callback, ring: Optional[RingBuffer], max_batch: int) -> bool:
+        device = self.devices.get(device_id)
+        if not device:
             return False
         
-        self.running = False
-        self.streaming_threads[device_id].join()
-        del self.streaming_threads[device_id]
+        with self._lock:
+            if device_id in self.streams:
+                return False
+            self.streams[device_id] = _Stream(device, callback, asyncio.get_running_loop(), ring, max_batch)
+            self._wake.set()
+            if not self._worker:
+                self._worker = threading.Thread(target=self._run_worker, daemon=True)
+                self._worker.start()
         return True
     
-    def _stream_data(self, device: usb.core.Device, callback):
-        """Internal method to stream data from USB device"""
-        try:
-            # Configure device
-            device.set_configuration()
-            endpoint = device[0][(0,0)][0]
-            
-            while self.running:
-                try:
-                    data = device.read(endpoint.bEndpointAddress, endpoint.wMaxPacketSize)
-                    callback(data)
-                except usb.core.USBError as e:
-                    if e.args == ('Operation timed out',):
-                        continue
+    def _run_worker(self):
+        """Internal loop that services every active stream from one thread
+        
+        pyusb exposes no pollable file descriptors, so endpoints are visited
+        round-robin with a short blocking read. The read timeout paces the
+        loop; an idle bus blocks in libusb instead of sleeping. An endpoint
+        whose reads time out backs off, doubling up to ``MAX_IDLE_BACKOFF``.
+        Backed-off endpoints that are due are probed longest-waiting first
+        until one times out, so each pass blocks on at most one idle
+        endpoint and streams with data never wait behind a row of them. When nothing was
+        read because every ring is full the worker waits up to
+        ``poll_timeout`` for the consumer to free a slot, and when every
+        endpoint is backing off it sleeps until the first is due. The worker
+        exits once the last stream stops and is restarted on demand.
+        """
+        while True:
+            with self._lock:
+                streams = list(self.streams.items())
+                if not streams:
+                    self._worker = None
+                    return
+            self._wake.clear()
+            now = time.monotonic()
+            paced = False
+            full = None
+            due = []
+            for device_id, stream in streams:
+                if stream.cancelled:
+                    self._finish_stream(device_id, stream)
+                    paced = True
+                elif stream.backoff:
+                    if stream.idle_until <= now:
+                        due.append((device_id, stream))
+                elif self._visit(device_id, stream) is not None:
+                    paced = True
+                elif full is None:
+                    full = stream.ring
+            due.sort(key=lambda item: item[1].idle_until)
+            for device_id, stream in due:
+                read = self._visit(device_id, stream)
+                if read is not None:
+                    paced = True
+                if read == 0:
                     break
-                time.sleep(0.001)  # Small delay to prevent CPU overuse
-                
+            if paced:
+                continue
+            # Without a wait the pass would repeat at once and spin a core
+            if full:
+                full.wait_writable(self.poll_timeout / 1000)
+            else:
+                wake_at = min(stream.idle_until for _, stream in streams)
+                self._wake.wait(max(0.0, wake_at - time.monotonic()))
+    
+    def _visit(self, device_id: int, stream: _Stream) -> Optional[int]:
+        """Internal method that services one stream and updates its backoff
+        
+        Returns the number of packets read, or None if the stream's ring was
+        full so nothing was read.
+        """
+        try:
+            if stream.endpoint is None:
+                # Configure device
+                stream.device.set_configuration()
+                stream.endpoint = stream.device[0][(0,0)][0]
+            if stream.ring:
+                read = self._service_buffered(stream)
+            else:
+                read = self._service_stream(stream)
         except Exception as e:
             print(f"Error streaming USB data: {e}")
+            self._finish_stream(device_id, stream)
+            return 0
+        if read == 0:
+            stream.backoff = min(max(stream.backoff * 2, self.poll_timeout / 1000), self.MAX_IDLE_BACKOFF)
+            stream.idle_until = time.monotonic() + stream.backoff
+        elif read:
+            stream.backoff = 0.0
+        return read
+    
+    def _service_stream(self, stream: _Stream) -> int:
+        """Internal method that reads pending packets and posts them one by one"""
+        endpoint = stream.endpoint
+        for read in range(stream.max_batch):
+            try:
+                data = stream.device.read(endpoint.bEndpointAddress, endpoint.wMaxPacketSize, self.poll_timeout)
+            except usb.core.USBTimeoutError:
+                return read
+            self._post(stream, stream.callback, data)
+        return stream.max_batch
+    
+    def _service_buffered(self, stream: _Stream) -> Optional[int]:
+        """Internal method that reads pending packets straight into ring slots
+
+        Returns the number of packets read, or None if the ring was full, so
+        nothing was read and no read waited on the device.
+        """
+        endpoint = stream.endpoint
+        ring = stream.ring
+        read = None
+        for _ in range(stream.max_batch):
+            slot = ring.acquire_write(0)
+            if slot is None:
+                break  # consumer is behind, let the device FIFO absorb it
+            read = read or 0
+            try:
+                length = stream.device.read(endpoint.bEndpointAddress, slot, self.poll_timeout)
+            except usb.core.USBTimeoutError:
+                break
+            # Stamped here, not when the event loop gets to the batch
+            ring.commit(length, time.time_ns())
+            read += 1
+        batch, timestamps = ring.read_batch(stream.max_batch, 0)
+        if batch:
+            self._post(stream, self._deliver_batch, stream, batch, timestamps)
+        return read
+    
+    def _deliver_batch(self, stream: _Stream, batch: List[memoryview], timestamps: List[int]):
+        """Internal method that runs the batch callback on the event loop"""
+        try:
+            stream.callback(batch, timestamps)
         finally:
-            self.running = False
+            for view in batch:
+                view.release()
+            stream.ring.release(len(batch))
+    
+    def _finish_stream(self, device_id: int, stream: _Stream):
+        with self._lock:
+            if self.streams.get(device_id) is stream:
+                del self.streams[device_id]
+        if stream.ring:
+            stream.ring.close()
+        # Queued after any pending deliveries, so stop_streaming returns last
+        self._post(stream, self._resolve_stopped, stream)
+    
+    @staticmethod
+    def _post(stream: _Stream, fn, *args):
+        try:
+            stream.loop.call_soon_threadsafe(fn, *args)
+        except RuntimeError:
+            # The owning event loop is gone, nobody is left to consume
+            stream.cancelled = True
+    
+    @staticmethod
+    def _resolve_stopped(stream: _Stream):
+        if not stream.stopped.done():
+            stream.stopped.set_result(True)
     
     def get_device_info(self, device_id: int) -> Optional[Dict]:
         """Get information about a specific USB device"""
-        device = self.devices.get(device_id)
-        if not device:
+        info = self.registry.get(device_id)
+        if not info:
             return None
         
         return {
-            'id': device.idVendor,
-            'manufacturer': usb.util.get_string(device, device.iManufacturer),
-            'product': usb.util.get_string(device, device.iProduct),
-            'is_streaming': device_id in self.streaming_threads
+            'id': info['id'],
+            'manufacturer': info['manufacturer'],
+            'product': info['product'],
+            'is_streaming': device_id in self.streams
         } 
\ No newline at end of file
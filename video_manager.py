@@ -0,0 +1,314 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple, Union
+import cv2
+import numpy as np
+from metrics import MovingAverage
+
+class Frame:
+    """One captured image with its sequence number and capture time (``time.monotonic_ns``)
+
+    ``image`` may be shared with the source or other consumers; treat it as read-only.
+    """
+
+    __slots__ = ('seq', 'image', 'captured_ns')
+
+    def __init__(self, seq: int, image: np.ndarray, captured_ns: int):
+        self.seq = seq
+        self.image = image
+        self.captured_ns = captured_ns
+
+class FrameSlot:
+    """Single-slot buffer holding only the latest frame
+
+    The capture thread overwrites the slot on every frame, so a slow
+    consumer skips frames instead of building a backlog. A frame replaced
+    before anyone read it counts as dropped.
+    """
+
+    def __init__(self):
+        self.frame: Optional[Frame] = None
+        self.read_seq = 0
+        self.dropped = 0
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def put(self, frame: Frame):
+        with self._cond:
+            if self.frame is not None and self.frame.seq > self.read_seq:
+                self.dropped += 1
+            self.frame = frame
+            self._cond.notify_all()
+
+    def get(self, after_seq: int = 0, timeout: Optional[float] = None) -> Optional[Frame]:
+        """The latest frame newer than ``after_seq``, waiting up to ``timeout`` (None: don't wait)"""
+        with self._cond:
+            if timeout is not None:
+                self._cond.wait_for(
+                    lambda: self.closed or (self.frame is not None and self.frame.seq > after_seq),
+                    timeout
+                )
+            frame = self.frame
+            if frame is None or frame.seq <= after_seq:
+                return None
+            self.read_seq = max(self.read_seq, frame.seq)
+            return frame
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+class StreamStats:
+    """Counters for one stream; fps is measured over the last full second"""
+
+    LATENCY_ALPHA = 0.1
+
+    def __init__(self):
+        self.captured = 0
+        self.displayed = 0
+        self.fps = 0.0
+        # Capture-to-display time in ms
+        self.latency = MovingAverage(self.LATENCY_ALPHA)
+        self._window_start = time.monotonic()
+        self._window_frames = 0
+
+    def on_capture(self, now: float):
+        self.captured += 1
+        self._window_frames += 1
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self.fps = self._window_frames / elapsed
+            self._window_start = now
+            self._window_frames = 0
+
+    def on_display(self, latency_ms: float):
+        self.displayed += 1
+        self.latency.add(latency_ms)
+
+class SyntheticCapture:
+    """``cv2.VideoCapture`` stand-in producing a scrolling test pattern at ``fps``
+
+    Useful without cameras and for benchmarks; ``read()`` blocks until the
+    next frame is due, like a real camera. Frames are read-only views into
+    one pattern buffer, so generating them costs nothing.
+    """
+
+    def __init__(self, width: int = 1280, height: int = 720, fps: float = 30, frames: Optional[int] = None):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frames = frames
+        self.count = 0
+        self.opened = True
+        self._next = time.monotonic()
+        # Two periods stacked; each frame is a window sliding down them, which
+        # keeps frames C-contiguous like a real capture buffer
+        y = np.arange(2 * height)
+        ramp = (np.abs((y % height) - height / 2) * (510 / height)).astype(np.uint8)[:, None]
+        self._pattern = np.empty((2 * height, width, 3), dtype=np.uint8)
+        self._pattern[:, :, 0] = ramp
+        self._pattern[:, :, 1] = np.linspace(0, 255, width, dtype=np.uint8)[None, :]
+        self._pattern[:, :, 2] = 255 - ramp
+        self._pattern.flags.writeable = False
+
+    def isOpened(self) -> bool:
+        return self.opened
+
+    def read(self):
+        if not self.opened or (self.frames is not None and self.count >= self.frames):
+            return False, None
+        delay = self._next - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self._next = max(self._next + 1 / self.fps, time.monotonic() - 1 / self.fps)
+        offset = self.count * 8 % self.height
+        image = self._pattern[offset:offset + self.height]
+        self.count += 1
+        return True, image
+
+    def get(self, prop: int) -> float:
+        return {
+            cv2.CAP_PROP_FRAME_WIDTH: self.width,
+            cv2.CAP_PROP_FRAME_HEIGHT: self.height,
+            cv2.CAP_PROP_FPS: self.fps
+        }.get(prop, 0.0)
+
+    def set(self, prop: int, value: float) -> bool:
+        return False
+
+    def release(self):
+        self.opened = False
+
+Source = Union[int, str, object]
+
+class _VideoStream:
+    """Per-source state; its capture thread is the only reader of ``capture``"""
+
+    def __init__(self, name: str, source: Source, options: Dict[str, float]):
+        self.name = name
+        self.source = source
+        self.options = options
+        self.capture = None
+        self.slot = FrameSlot()
+        self.stats = StreamStats()
+        self.status = 'opening'
+        self.running = True
+        self.thread: Optional[threading.Thread] = None
+        # Replaced, never mutated, so the capture thread can iterate it unlocked
+        self.sinks: Tuple[Callable[[Frame], None], ...] = ()
+
+class VideoManager:
+    """Captures N video sources, one thread each, into latest-frame slots
+
+    A source is a camera index, a file path or URL (opened with
+    ``cv2.VideoCapture``), or any object with the VideoCapture ``read()`` /
+    ``release()`` interface such as SyntheticCapture. Files are played back
+    at their own frame rate. Consumers poll ``latest_frame`` at their own
+    pace and call ``mark_displayed`` to record capture-to-display latency.
+    Consumers that need every frame, such as recorders, register a sink,
+    which the capture thread calls with each frame; sinks must not block.
+    """
+
+    # Consecutive failed reads before a live source is reported as lost
+    MAX_READ_FAILURES = 30
+
+    def __init__(self, capture_factory: Callable[[Union[int, str]], object] = cv2.VideoCapture):
+        self.capture_factory = capture_factory
+        self.streams: Dict[str, _VideoStream] = {}
+        self._lock = threading.Lock()
+
+    def open_stream(self, name: str, source: Source, width: Optional[int] = None,
+                    height: Optional[int] = None, fps: Optional[float] = None) -> bool:
+        """Start capturing ``source`` as ``name``; opening happens on the capture thread"""
+        with self._lock:
+            if name in self.streams:
+                return False
+            options = {}
+            if width:
+                options[cv2.CAP_PROP_FRAME_WIDTH] = width
+            if height:
+                options[cv2.CAP_PROP_FRAME_HEIGHT] = height
+            if fps:
+                options[cv2.CAP_PROP_FPS] = fps
+            stream = _VideoStream(name, source, options)
+            self.streams[name] = stream
+        stream.thread = threading.Thread(target=self._capture_loop, args=(stream,), daemon=True)
+        stream.thread.start()
+        return True
+
+    def close_stream(self, name: str, timeout: float = 2.0) -> bool:
+        with self._lock:
+            stream = self.streams.pop(name, None)
+        if not stream:
+            return False
+        stream.running = False
+        stream.slot.close()
+        if stream.thread is not threading.current_thread():
+            stream.thread.join(timeout)
+        return True
+
+    def close_all(self):
+        for name in list(self.streams):
+            self.close_stream(name)
+
+    def add_sink(self, name: str, sink: Callable[[Frame], None]) -> bool:
+        stream = self.streams.get(name)
+        if not stream:
+            return False
+        stream.sinks = stream.sinks + (sink,)
+        return True
+
+    def remove_sink(self, name: str, sink: Callable[[Frame], None]):
+        stream = self.streams.get(name)
+        if stream:
+            stream.sinks = tuple(s for s in stream.sinks if s is not sink)
+
+    def latest_frame(self, name: str, after_seq: int = 0, timeout: Optional[float] = None) -> Optional[Frame]:
+        """The newest frame of ``name`` with ``seq > after_seq``, or None"""
+        stream = self.streams.get(name)
+        return stream.slot.get(after_seq, timeout) if stream else None
+
+    def mark_displayed(self, name: str, frame: Frame):
+        stream = self.streams.get(name)
+        if stream:
+            stream.stats.on_display((time.monotonic_ns() - frame.captured_ns) / 1e6)
+
+    def get_stats(self, name: str) -> Optional[Dict[str, object]]:
+        stream = self.streams.get(name)
+        if not stream:
+            return None
+        stats = stream.stats
+        return {
+            'status': stream.status,
+            'fps': round(stats.fps, 1),
+            'captured': stats.captured,
+            'dropped': stream.slot.dropped,
+            'displayed': stats.displayed,
+            'latency_ms': round(stats.latency.value, 2),
+            'max_latency_ms': round(stats.latency.peak, 2)
+        }
+
+    def all_stats(self) -> Dict[str, Dict[str, object]]:
+        return {name: self.get_stats(name) for name in list(self.streams)}
+
+    def _open(self, stream: _VideoStream):
+        source = stream.source
+        capture = self.capture_factory(source) if isinstance(source, (int, str)) else source
+        if not capture.isOpened():
+            return None
+        for prop, value in stream.options.items():
+            capture.set(prop, value)
+        return capture
+
+    def _capture_loop(self, stream: _VideoStream):
+        try:
+            capture = self._open(stream)
+        except cv2.error as e:
+            print(f"Error opening video source {stream.source}: {e}")
+            capture = None
+        if capture is None:
+            stream.status = 'error'
+            stream.slot.close()
+            return
+        stream.capture = capture
+        stream.status = 'open'
+        # Files would otherwise be decoded as fast as possible
+        is_file = isinstance(stream.source, str) and os.path.exists(stream.source)
+        interval = 1 / capture.get(cv2.CAP_PROP_FPS) if is_file and capture.get(cv2.CAP_PROP_FPS) > 0 else 0
+        next_due = time.monotonic()
+        failures = 0
+        seq = 0
+        try:
+            while stream.running:
+                ok, image = capture.read()
+                if not ok:
+                    failures += 1
+                    if is_file or failures >= self.MAX_READ_FAILURES or not capture.isOpened():
+                        stream.status = 'ended' if is_file else 'lost'
+                        break
+                    time.sleep(0.01)
+                    continue
+                failures = 0
+                seq += 1
+                frame = Frame(seq, image, time.monotonic_ns())
+                stream.slot.put(frame)
+                for sink in stream.sinks:
+                    try:
+                        sink(frame)
+                    except Exception as e:
+                        print(f"Error in frame sink for {stream.name}: {e}")
+                now = time.monotonic()
+                stream.stats.on_capture(now)
+                if interval:
+                    next_due = max(next_due + interval, now - interval)
+                    if next_due > now:
+                        time.sleep(next_due - now)
+        finally:
+            capture.release()
+            stream.slot.close()
+            if stream.running:
+                stream.running = False
+            else:
+                stream.status = 'closed'